@@ -1,39 +1,63 @@
 import { renderHook, waitFor } from '@testing-library/react'
-import { describe, expect, it, vi } from 'vitest'
+import { beforeEach, describe, expect, it, vi } from 'vitest'
 import { useCurriculum } from './useCurriculum'
+import { clearCurriculumCache } from '../utils/curriculumCache'
 import type { OptionChoiceState, OptionalItemInclusionState, OptionGroupHoursOverrideState } from '../types'
 
 const tableData: Record<string, unknown[]> = {
-  unit_subcategory_hours: [
-    { unit: 'Algebra', category: 'Math', subcategory: 'Core', hours: 100, curriculum_id: 'gatherround' },
-  ],
-  unit_option_groups: [
-    { id: 'group-1', unit: 'Algebra', category: 'Math', label: 'Track', note: null, curriculum_id: 'gatherround' },
-  ],
-  unit_option_choices: [
-    { id: 'choice-1', option_group_id: 'group-1', subcategory: 'Track A', hours: 10, recommended_books: [], curriculum_id: 'gatherround' },
-    { id: 'choice-2', option_group_id: 'group-1', subcategory: 'Track B', hours: 12, recommended_books: [], curriculum_id: 'gatherround' },
-  ],
-  unit_optional_items: [
-    { id: 'opt-1', unit: 'Algebra', category: 'Math', subcategory: 'Lab', hours: 4, description: 'Optional lab', curriculum_id: 'gatherround' },
+  unit_hours_summary: [
+    {
+      unit: 'Algebra',
+      curriculum_id: 'gatherround',
+      base_rows: [{ category: 'Math', subcategory: 'Core', hours: 100 }],
+      option_groups: [
+        {
+          id: 'group-1',
+          category: 'Math',
+          label: 'Track',
+          note: null,
+          default_subcategory: 'Track B',
+          choices: [
+            { id: 'choice-1', subcategory: 'Track A', hours: 10, recommended_books: [] },
+            { id: 'choice-2', subcategory: 'Track B', hours: 12, recommended_books: [] },
+          ],
+        },
+      ],
+      optional_items: [
+        { id: 'opt-1', category: 'Math', subcategory: 'Lab', hours: 4, description: 'Optional lab', type: null },
+      ],
+    },
   ],
 }
 
+const queriedTables: string[] = []
+
 vi.mock('../supabase', () => ({
   supabase: {
     from: (table: string) => ({
       select: () => ({
-        in: () =>
-          Promise.resolve({
+        in: () => {
+          queriedTables.push(table)
+          return Promise.resolve({
             data: tableData[table] ?? [],
             error: null,
-          }),
+          })
+        },
       }),
     }),
   },
 }))
 
+const notFound = () => Promise.resolve(new Response('', { status: 404 }))
+
 describe('useCurriculum', () => {
+  beforeEach(async () => {
+    vi.stubGlobal('fetch', vi.fn(notFound))
+    queriedTables.length = 0
+    delete tableData.curriculum_sets
+    await clearCurriculumCache()
+  })
+
   it('computes unit hours with selected options and optional items', async () => {
     const optionChoices: OptionChoiceState = { Algebra: { 'group-1': 'Track B' } }
     const includedOptionalItems: OptionalItemInclusionState = { Algebra: { 'opt-1': true } }
@@ -67,4 +91,113 @@ describe('useCurriculum', () => {
 
     expect(result.current.unitsWithUnselectedOptionGroups).toEqual(['Algebra'])
   })
+
+  it('defaults option groups to the max-hours choice', async () => {
+    const curriculumUnits = [{ curriculumId: 'gatherround', unit: 'Algebra' }]
+    const { result } = renderHook(() =>
+      useCurriculum({}, {}, {}, {}, curriculumUnits)
+    )
+
+    await waitFor(() => expect(result.current.loading).toBe(false))
+
+    expect(result.current.optionChoicesByGroupId['group-1']).toHaveLength(2)
+    expect(result.current.unitCurriculumMap).toEqual({ Algebra: 'gatherround' })
+    const algebra = result.current.unitsWithHours.find((u) => u.unit === 'Algebra')
+    expect(algebra?.totalHours).toBe(100 + 12)
+  })
+
+  it('loads from the static bundle when one is published', async () => {
+    tableData.curriculum_sets = [{ id: 'gatherround', catalog_version: 'v1' }]
+    const bundle = {
+      format: 'curriculum-bundle',
+      version: 1,
+      curriculum_id: 'gatherround',
+      catalog_version: 'v1',
+      strings: ['Biology', 'Science', 'Life Science'],
+      units: { unit: [0], default_hours: [30], base_offsets: [0, 1], group_offsets: [0, 0], item_offsets: [0, 0] },
+      base: { category: [1], subcategory: [2], hours: [30] },
+      groups: { id: [], category: [], label: [], note: [], default_choice: [], choice_offsets: [0] },
+      choices: { id: [], subcategory: [], hours: [], recommended_books: [] },
+      items: { id: [], category: [], subcategory: [], hours: [], description: [], type: [] },
+    }
+    const fetchMock = vi.fn(() =>
+      Promise.resolve(
+        new Response(JSON.stringify(bundle), { status: 200, headers: { 'Content-Type': 'application/json' } })
+      )
+    )
+    vi.stubGlobal('fetch', fetchMock)
+    const curriculumUnits = [{ curriculumId: 'gatherround', unit: 'Biology' }]
+    const { result } = renderHook(() =>
+      useCurriculum({}, {}, {}, {}, curriculumUnits)
+    )
+
+    await waitFor(() => expect(result.current.loading).toBe(false))
+
+    expect(fetchMock).toHaveBeenCalledWith('/curriculum/gatherround.json')
+    expect(result.current.unitsWithHours).toEqual([{ unit: 'Biology', totalHours: 30 }])
+  })
+
+  it('queries unit_hours_summary instead of the bundle when the set has no version', async () => {
+    const fetchMock = vi.fn(notFound)
+    vi.stubGlobal('fetch', fetchMock)
+    const curriculumUnits = [{ curriculumId: 'gatherround', unit: 'Algebra' }]
+    const { result } = renderHook(() => useCurriculum({}, {}, {}, {}, curriculumUnits))
+
+    await waitFor(() => expect(result.current.loading).toBe(false))
+
+    expect(fetchMock).not.toHaveBeenCalled()
+    expect(queriedTables).toEqual(['curriculum_sets', 'unit_hours_summary'])
+    expect(result.current.unitsWithHours).toEqual([{ unit: 'Algebra', totalHours: 100 + 12 }])
+  })
+
+  it('reuses cached curriculum while the catalog version is unchanged', async () => {
+    tableData.curriculum_sets = [{ id: 'gatherround', catalog_version: 'v1' }]
+    const curriculumUnits = [{ curriculumId: 'gatherround', unit: 'Algebra' }]
+
+    const first = renderHook(() => useCurriculum({}, {}, {}, {}, curriculumUnits))
+    await waitFor(() => expect(first.result.current.loading).toBe(false))
+    expect(queriedTables).toEqual(['curriculum_sets', 'unit_hours_summary'])
+
+    queriedTables.length = 0
+    const second = renderHook(() => useCurriculum({}, {}, {}, {}, curriculumUnits))
+    await waitFor(() => expect(second.result.current.loading).toBe(false))
+
+    expect(queriedTables).toEqual(['curriculum_sets'])
+    expect(second.result.current.unitsWithHours).toEqual(first.result.current.unitsWithHours)
+
+    queriedTables.length = 0
+    tableData.curriculum_sets = [{ id: 'gatherround', catalog_version: 'v2' }]
+    const third = renderHook(() => useCurriculum({}, {}, {}, {}, curriculumUnits))
+    await waitFor(() => expect(third.result.current.loading).toBe(false))
+
+    expect(queriedTables).toEqual(['curriculum_sets', 'unit_hours_summary'])
+  })
+
+  it('skips a bundle built for another catalog version', async () => {
+    tableData.curriculum_sets = [{ id: 'gatherround', catalog_version: 'v2' }]
+    const bundle = {
+      format: 'curriculum-bundle',
+      version: 1,
+      curriculum_id: 'gatherround',
+      catalog_version: 'v1',
+      strings: [],
+      units: { unit: [], default_hours: [], base_offsets: [0], group_offsets: [0], item_offsets: [0] },
+      base: { category: [], subcategory: [], hours: [] },
+      groups: { id: [], category: [], label: [], note: [], default_choice: [], choice_offsets: [0] },
+      choices: { id: [], subcategory: [], hours: [], recommended_books: [] },
+      items: { id: [], category: [], subcategory: [], hours: [], description: [], type: [] },
+    }
+    vi.stubGlobal('fetch', vi.fn(() =>
+      Promise.resolve(
+        new Response(JSON.stringify(bundle), { status: 200, headers: { 'Content-Type': 'application/json' } })
+      )
+    ))
+    const curriculumUnits = [{ curriculumId: 'gatherround', unit: 'Algebra' }]
+    const { result } = renderHook(() => useCurriculum({}, {}, {}, {}, curriculumUnits))
+
+    await waitFor(() => expect(result.current.loading).toBe(false))
+
+    expect(queriedTables).toContain('unit_hours_summary')
+    expect(result.current.unitsWithHours).toEqual([{ unit: 'Algebra', totalHours: 100 + 12 }])
+  })
 })
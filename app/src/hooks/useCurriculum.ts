@@ -11,42 +11,64 @@ import type {
   UnitWithHours,
 } from '../types'
 import type { UnitOptionChoice, UnitOptionGroup, UnitOptionalItem } from '../types'
+import { fetchCurriculumBundle } from '../utils/curriculumBundle'
+import type { UnitSummaryRow } from '../utils/curriculumBundle'
+import { readCachedCurriculum, writeCachedCurriculum } from '../utils/curriculumCache'
 
-interface SubcategoryRow {
-  unit: string
-  category: string
-  subcategory: string
-  hours: number
-  curriculum_id?: string
-}
-
-interface OptionGroupRow {
-  id: string
-  unit: string
-  category: string
-  label: string
-  note?: string | null
-  curriculum_id?: string
-}
-
-interface OptionChoiceRow {
-  id: string
-  option_group_id: string
-  subcategory: string
-  hours: number | null
-  recommended_books: unknown
-  curriculum_id?: string
+/**
+ * curriculum_sets.catalog_version for each set, in one query. Sets missing
+ * from the result, or every set when the query fails, map to null (uncached).
+ */
+async function fetchCatalogVersions(curriculumIds: string[]): Promise<Record<string, string | null>> {
+  const versions: Record<string, string | null> = Object.fromEntries(curriculumIds.map((id) => [id, null]))
+  try {
+    const { data, error } = await supabase
+      .from('curriculum_sets')
+      .select('id, catalog_version')
+      .in('id', curriculumIds)
+    if (error) return versions
+    for (const row of (data ?? []) as { id: string; catalog_version?: string | null }[]) {
+      versions[row.id] = row.catalog_version ?? null
+    }
+  } catch {
+    // Unversioned: load everything as before
+  }
+  return versions
 }
-
-interface OptionalItemRow {
-  id: string
-  unit: string
-  category: string
-  subcategory: string
-  hours: number
-  description: string
-  type?: string | null
-  curriculum_id?: string
+
+/**
+ * Summary rows for the given curriculum sets. After one version check, sets
+ * whose cached copy matches their catalog_version come from the cache; the
+ * rest load from the static bundle when one is published for their current
+ * version, otherwise from one query against the unit_hours_summary view, and
+ * are cached. Sets without a version (or when the check fails) always query
+ * the view.
+ */
+async function loadSummaryRows(curriculumIds: string[]): Promise<UnitSummaryRow[]> {
+  const versions = await fetchCatalogVersions(curriculumIds)
+  const cached = await Promise.all(curriculumIds.map((id) => readCachedCurriculum(id, versions[id])))
+  const rows = cached.flatMap((setRows) => setRows ?? [])
+  const stale = curriculumIds.filter((_, i) => cached[i] == null)
+  if (stale.length === 0) return rows
+
+  const bundles = await Promise.all(stale.map((id) => fetchCurriculumBundle(id, versions[id])))
+  const missing = stale.filter((_, i) => bundles[i] == null)
+  let queried: UnitSummaryRow[] = []
+  if (missing.length > 0) {
+    const { data, error } = await supabase
+      .from('unit_hours_summary')
+      .select('unit, curriculum_id, base_rows, option_groups, optional_items')
+      .in('curriculum_id', missing)
+    if (error) throw error
+    queried = (data ?? []) as UnitSummaryRow[]
+  }
+
+  stale.forEach((id, i) => {
+    const setRows = bundles[i] ?? queried.filter((row) => row.curriculum_id === id)
+    rows.push(...setRows)
+    void writeCachedCurriculum(id, versions[id], setRows)
+  })
+  return rows
 }
 
 function parseRecommendedBooks(raw: unknown): string[] {
@@ -91,100 +113,67 @@ export function useCurriculum(
 
     async function fetchData() {
       try {
-        const baseQuery = supabase
-          .from('unit_subcategory_hours')
-          .select('unit, category, subcategory, hours, curriculum_id')
-          .in('curriculum_id', curriculumIds)
-        const groupsQuery = supabase
-          .from('unit_option_groups')
-          .select('id, unit, category, label, note, curriculum_id')
-          .in('curriculum_id', curriculumIds)
-        const choicesQuery = supabase
-          .from('unit_option_choices')
-          .select('id, option_group_id, subcategory, hours, recommended_books, curriculum_id')
-          .in('curriculum_id', curriculumIds)
-        const itemsQuery = supabase
-          .from('unit_optional_items')
-          .select('id, unit, category, subcategory, hours, description, type, curriculum_id')
-          .in('curriculum_id', curriculumIds)
+        const rows = await loadSummaryRows(curriculumIds)
+        if (cancelled) return
 
-        const [baseRes, groupsRes, choicesRes, itemsRes] = await Promise.all([
-          baseQuery,
-          groupsQuery,
-          choicesQuery,
-          itemsQuery,
-        ])
-
-        if (baseRes.error) throw baseRes.error
-        if (groupsRes.error) throw groupsRes.error
-        if (choicesRes.error) throw choicesRes.error
-        if (itemsRes.error) throw itemsRes.error
-        if (cancelled) return
-
         const breakdown: UnitBreakdown = {}
+        const groups: UnitOptionGroup[] = []
+        const choices: UnitOptionChoice[] = []
+        const items: UnitOptionalItem[] = []
         const curriculumByUnit: Record<string, string> = Object.fromEntries(
           curriculumUnits.map((entry) => [entry.unit, entry.curriculumId])
         )
-        for (const row of (baseRes.data ?? []) as SubcategoryRow[]) {
+        for (const row of rows) {
           if (!allowedUnits.has(row.unit)) continue
           const unit = row.unit
-          const hours = Number(row.hours)
-          if (!breakdown[unit]) breakdown[unit] = []
-          breakdown[unit].push({
-            category: row.category,
-            subcategory: row.subcategory,
-            hours,
-          })
           if (row.curriculum_id) curriculumByUnit[unit] = row.curriculum_id
-        }
-        setBaseBreakdown(breakdown)
 
-        const filteredGroups = ((groupsRes.data ?? []) as OptionGroupRow[]).filter((g) => allowedUnits.has(g.unit))
-        setOptionGroups(
-          filteredGroups.map((g) => {
-            if (g.curriculum_id) curriculumByUnit[g.unit] = g.curriculum_id
-            return {
+          if (row.base_rows.length > 0) {
+            breakdown[unit] = row.base_rows.map((r) => ({
+              category: r.category,
+              subcategory: r.subcategory,
+              hours: Number(r.hours),
+            }))
+          }
+
+          for (const g of row.option_groups) {
+            groups.push({
               id: g.id,
-              unit: g.unit,
+              unit,
               category: g.category,
               label: g.label,
               note: g.note ?? undefined,
-              curriculumId: g.curriculum_id,
+              curriculumId: row.curriculum_id,
+            })
+            for (const c of g.choices) {
+              choices.push({
+                id: c.id,
+                option_group_id: g.id,
+                subcategory: c.subcategory,
+                hours: c.hours != null ? Number(c.hours) : null,
+                recommended_books: parseRecommendedBooks(c.recommended_books),
+              })
             }
-          })
-        )
+          }
 
-        const allowedGroupIds = new Set(filteredGroups.map((g) => g.id))
-        setChoicesRaw(
-          ((choicesRes.data ?? []) as OptionChoiceRow[])
-            .filter((r) => allowedGroupIds.has(r.option_group_id))
-            .map((r) => ({
+          for (const r of row.optional_items) {
+            items.push({
               id: r.id,
-              option_group_id: r.option_group_id,
+              unit,
+              category: r.category,
               subcategory: r.subcategory,
-              hours: r.hours != null ? Number(r.hours) : null,
-              recommended_books: parseRecommendedBooks(r.recommended_books),
-            }))
-        )
-
-        setOptionalItemsRaw(
-          ((itemsRes.data ?? []) as OptionalItemRow[])
-            .filter((r) => allowedUnits.has(r.unit))
-            .map((r) => {
-              if (r.curriculum_id) curriculumByUnit[r.unit] = r.curriculum_id
-              return {
-                id: r.id,
-                unit: r.unit,
-                category: r.category,
-                subcategory: r.subcategory,
-                hours: Number(r.hours),
-                description: r.description,
-                type: r.type ?? undefined,
-                curriculumId: r.curriculum_id,
-              }
+              hours: Number(r.hours),
+              description: r.description,
+              type: r.type ?? undefined,
+              curriculumId: row.curriculum_id,
             })
-        )
+          }
+        }
 
+        setBaseBreakdown(breakdown)
+        setOptionGroups(groups)
+        setChoicesRaw(choices)
+        setOptionalItemsRaw(items)
         setUnitCurriculumMap(curriculumByUnit)
 
         setError(null)
@@ -232,6 +221,11 @@ export function useCurriculum(
     return map
   }, [optionGroups])
 
+  const optionGroupsById = useMemo(
+    () => new Map(optionGroups.map((g) => [g.id, g])),
+    [optionGroups]
+  )
+
   const { unitBreakdown, unitsWithHours, unitsWithUnselectedOptionGroups } = useMemo(() => {
     const effective: UnitBreakdown = {}
     const allUnits = new Set<string>([
@@ -247,7 +241,7 @@ export function useCurriculum(
 
       for (const gid of groupIds) {
         const choices = optionChoicesByGroupId[gid] ?? []
-        const group = optionGroups.find((g) => g.id === gid)
+        const group = optionGroupsById.get(gid)
         if (!group) continue
         for (const c of choices) {
           excludedSubcategories.add(`${group.category}\t${c.subcategory}`)
@@ -260,7 +254,7 @@ export function useCurriculum(
 
       for (const gid of groupIds) {
         const choices = optionChoicesByGroupId[gid] ?? []
-        const group = optionGroups.find((g) => g.id === gid)
+        const group = optionGroupsById.get(gid)
         if (!group || choices.length === 0) continue
         const chosenSubcategory = optionChoices[unit]?.[gid]
         const chosenChoice = chosenSubcategory
@@ -342,6 +336,7 @@ export function useCurriculum(
     unitToGroupIds,
     optionChoicesByGroupId,
     optionGroups,
+    optionGroupsById,
     optionalItemsByUnit,
     optionChoices,
     includedOptionalItems,
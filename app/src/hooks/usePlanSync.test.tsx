@@ -1,22 +1,55 @@
 import { renderHook, waitFor } from '@testing-library/react'
 import type { User } from '@supabase/supabase-js'
-import { describe, expect, it, vi } from 'vitest'
+import { beforeEach, describe, expect, it, vi } from 'vitest'
 import type { PlanMeta } from '../types'
+import {
+  loadSyncCursor,
+  loadSyncedPlan,
+  readPlanDataFromStorage,
+  saveAssignments,
+  saveSyncCursor,
+  saveSyncedPlan,
+  writePlanDataToStorage,
+} from '../planStorage'
 import { usePlanSync } from './usePlanSync'
 
-const mockSelect = vi.fn().mockResolvedValue({ data: [], error: null })
-const mockUpsert = vi.fn().mockResolvedValue({ error: null })
+const mockRemote = vi.hoisted(() => ({ rows: [] as unknown[] }))
+const mockGte = vi.hoisted(() => vi.fn())
+const mockRpc = vi.hoisted(() => vi.fn())
+const mockUpsert = vi.hoisted(() => vi.fn())
 
-vi.mock('../supabase', () => ({
-  supabase: {
-    from: vi.fn(() => ({
-      select: mockSelect,
-      upsert: mockUpsert,
-    })),
-  },
-}))
+vi.mock('../supabase', () => {
+  const query = {
+    gte: (...args: unknown[]) => {
+      mockGte(...args)
+      return query
+    },
+    in: () => query,
+    then: (resolve: (value: { data: unknown[]; error: null }) => void) =>
+      resolve({ data: mockRemote.rows, error: null }),
+  }
+  return {
+    supabase: {
+      from: vi.fn(() => ({
+        select: vi.fn(() => query),
+        upsert: (...args: unknown[]) => {
+          mockUpsert(...args)
+          return { select: vi.fn().mockResolvedValue({ data: [], error: null }) }
+        },
+      })),
+      rpc: mockRpc,
+    },
+  }
+})
 
 describe('usePlanSync', () => {
+  beforeEach(() => {
+    mockRemote.rows = []
+    mockGte.mockReset()
+    mockRpc.mockReset()
+    mockUpsert.mockReset()
+  })
+
   it('reports offline when no user is logged in', () => {
     const { result } = renderHook(() =>
       usePlanSync({
@@ -59,4 +92,122 @@ describe('usePlanSync', () => {
       expect(result.current).toBe('pending')
     })
   })
+
+  it('sends only what changed since the synced version', async () => {
+    const user = { id: 'user-1' } as User
+    writePlanDataToStorage('plan-1', {
+      assignments: { Algebra: 1 },
+      optionChoices: {},
+      includedOptionalItems: {},
+      optionGroupHoursOverride: {},
+      optionalItemHoursOverride: {},
+      curriculumUnits: [{ curriculumId: 'gatherround', unit: 'Algebra' }],
+      lockedYears: [],
+      config: { hoursPerCredit: 120, minCreditsForGraduation: 25 },
+    })
+    saveSyncedPlan('plan-1', { version: 3, name: 'Plan', data: readPlanDataFromStorage('plan-1') })
+    saveAssignments('plan-1', { Algebra: 1, Biology: 2 })
+    mockRpc.mockResolvedValue({
+      data: [{ applied: true, plan_version: 4, plan_updated_at: '2026-02-01T00:00:00.000Z' }],
+      error: null,
+    })
+    const markPlansSynced = vi.fn()
+    const plans: PlanMeta[] = [
+      {
+        id: 'plan-1',
+        name: 'Plan',
+        updatedAt: new Date().toISOString(),
+        lastSyncedAt: '2000-01-01T00:00:00.000Z',
+      },
+    ]
+
+    renderHook(() =>
+      usePlanSync({
+        user,
+        plans,
+        mergeRemotePlans: () => {},
+        markPlansSynced,
+        purgeDeletedPlans: () => {},
+        applyCurrentPlanData: () => {},
+        syncIntervalMs: 60_000,
+      })
+    )
+
+    await waitFor(() => {
+      expect(markPlansSynced).toHaveBeenCalledWith(['plan-1'], expect.any(String))
+    })
+    expect(mockRpc).toHaveBeenCalledWith('apply_plan_patch', {
+      plan_id: 'plan-1',
+      base_version: 3,
+      patch: { assignments: { Biology: 2 } },
+      plan_name: null,
+    })
+    expect(mockUpsert).not.toHaveBeenCalled()
+    expect(loadSyncedPlan('plan-1')?.version).toBe(4)
+  })
+
+  it('pulls plans updated since shortly before the stored cursor', async () => {
+    const user = { id: 'user-1' } as User
+    saveSyncCursor('user-1', '2026-01-01T00:00:00.000Z')
+    const remote = {
+      id: 'plan-2',
+      name: 'Remote',
+      data: { assignments: { Algebra: 2 } },
+      updated_at: '2026-02-01T00:00:00.000Z',
+      version: 5,
+    }
+    mockRemote.rows = [remote]
+    const mergeRemotePlans = vi.fn()
+
+    renderHook(() =>
+      usePlanSync({
+        user,
+        plans: [],
+        mergeRemotePlans,
+        markPlansSynced: () => {},
+        purgeDeletedPlans: () => {},
+        applyCurrentPlanData: () => {},
+        syncIntervalMs: 60_000,
+      })
+    )
+
+    await waitFor(() => {
+      expect(mergeRemotePlans).toHaveBeenCalledWith([remote], expect.anything())
+    })
+    expect(mockGte).toHaveBeenCalledWith('updated_at', '2025-12-31T23:59:00.000Z')
+    expect(loadSyncCursor('user-1')).toBe('2026-02-01T00:00:00.000Z')
+    expect(loadSyncedPlan('plan-2')?.version).toBe(5)
+  })
+
+  it('keeps the cursor when the overlap only re-reads older plans', async () => {
+    const user = { id: 'user-1' } as User
+    saveSyncCursor('user-1', '2026-01-01T00:00:00.000Z')
+    mockRemote.rows = [
+      {
+        id: 'plan-3',
+        name: 'Seen',
+        data: { assignments: {} },
+        updated_at: '2025-12-31T23:59:30.000Z',
+        version: 2,
+      },
+    ]
+    const mergeRemotePlans = vi.fn()
+
+    renderHook(() =>
+      usePlanSync({
+        user,
+        plans: [],
+        mergeRemotePlans,
+        markPlansSynced: () => {},
+        purgeDeletedPlans: () => {},
+        applyCurrentPlanData: () => {},
+        syncIntervalMs: 60_000,
+      })
+    )
+
+    await waitFor(() => {
+      expect(mergeRemotePlans).toHaveBeenCalled()
+    })
+    expect(loadSyncCursor('user-1')).toBe('2026-01-01T00:00:00.000Z')
+  })
 })
@@ -3,10 +3,30 @@ import type { User } from '@supabase/supabase-js'
 import type { PlanData, PlanMeta } from '../types'
 import type { RemotePlan } from './usePlans'
 import { supabase } from '../supabase'
-import { readPlanDataFromStorage } from '../planStorage'
+import {
+  loadSyncCursor,
+  loadSyncedPlan,
+  readPlanDataFromStorage,
+  saveSyncCursor,
+  saveSyncedPlan,
+} from '../planStorage'
+import { createMergePatch } from '../utils/planPatch'
 
 export type SyncStatus = 'offline' | 'pending' | 'synced'
 
+const REMOTE_PLAN_COLUMNS = 'id, name, data, updated_at, version'
+
+// updated_at is stamped before commit, so a write can become visible after a pull
+// that already saw later timestamps; each pull re-reads this much before the cursor
+export const SYNC_CURSOR_OVERLAP_MS = 60_000
+
+// Row returned by public.apply_plan_patch
+type PlanPatchResult = {
+  applied: boolean
+  plan_version: number
+  plan_updated_at: string
+}
+
 type UsePlanSyncOptions = {
   user: User | null
   plans: PlanMeta[]
@@ -26,6 +46,40 @@ function isPlanDirty(plan: PlanMeta) {
   return updated > synced
 }
 
+/**
+ * Plans changed since the user's last pull, less SYNC_CURSOR_OVERLAP_MS (all
+ * plans on the first pull), or the given plans. Returns null when the request fails.
+ */
+async function fetchRemotePlans(userId: string, planIds?: string[]) {
+  let query = supabase.from('planner_plans').select(REMOTE_PLAN_COLUMNS)
+  if (planIds) {
+    query = query.in('id', planIds)
+  } else {
+    const cursor = Date.parse(loadSyncCursor(userId) ?? '')
+    if (!Number.isNaN(cursor)) {
+      query = query.gte('updated_at', new Date(cursor - SYNC_CURSOR_OVERLAP_MS).toISOString())
+    }
+  }
+  const { data, error } = await query
+  if (error) return null
+  return (data ?? []) as RemotePlan[]
+}
+
+/** Newest updated_at among the pulled plans, or null when none is past the current cursor. */
+function latestUpdatedAt(remotePlans: RemotePlan[], cursor: string | null) {
+  let latest: string | null = null
+  let latestTime = cursor ? Date.parse(cursor) : -Infinity
+  if (Number.isNaN(latestTime)) latestTime = -Infinity
+  for (const remote of remotePlans) {
+    const time = Date.parse(remote.updated_at)
+    if (!Number.isNaN(time) && time > latestTime) {
+      latest = remote.updated_at
+      latestTime = time
+    }
+  }
+  return latest
+}
+
 export function usePlanSync({
   user,
   plans,
@@ -65,6 +119,21 @@ export function usePlanSync({
     }
   }, [])
 
+  // Server copies are the base for the next patch, whichever copy mergeRemotePlans keeps
+  const applyRemotePlans = useCallback(
+    (remotePlans: RemotePlan[]) => {
+      const deletedIds = new Set(plansRef.current.filter((plan) => plan.deletedAt).map((plan) => plan.id))
+      for (const remote of remotePlans) {
+        if (deletedIds.has(remote.id) || typeof remote.version !== 'number') continue
+        saveSyncedPlan(remote.id, { version: remote.version, name: remote.name, data: remote.data })
+      }
+      mergeRemotePlans(remotePlans, {
+        onApplyCurrentPlanData: applyCurrentPlanData,
+      })
+    },
+    [applyCurrentPlanData, mergeRemotePlans]
+  )
+
   const syncDirtyPlans = useCallback(async () => {
     const activeUser = userRef.current
     if (!activeUser || !isOnline) return
@@ -79,22 +148,88 @@ export function usePlanSync({
       const upsertPlans = dirtyPlans.filter((plan) => !plan.deletedAt)
 
       if (upsertPlans.length > 0) {
-        const payload = upsertPlans.map((plan) => ({
-          id: plan.id,
-          user_id: activeUser.id,
-          name: plan.name,
-          data: readPlanDataFromStorage(plan.id),
-        }))
-        const { error } = await supabase.from('planner_plans').upsert(payload, { onConflict: 'id' })
-        if (error) {
-          setSyncStatus('offline')
-          return
-        }
+        // Taken before reading plan data, so edits made while the requests are in flight stay dirty
         const syncedAt = new Date().toISOString()
-        markPlansSynced(
-          upsertPlans.map((plan) => plan.id),
-          syncedAt
-        )
+        const syncedIds: string[] = []
+        const conflictIds: string[] = []
+        const fullWrites: { plan: PlanMeta; data: PlanData }[] = []
+
+        for (const plan of upsertPlans) {
+          const data = readPlanDataFromStorage(plan.id)
+          const base = loadSyncedPlan(plan.id)
+          if (!base) {
+            fullWrites.push({ plan, data })
+            continue
+          }
+          const patch = createMergePatch(base.data, data)
+          const planName = plan.name !== base.name ? plan.name : null
+          if (patch === undefined && planName === null) {
+            syncedIds.push(plan.id)
+            continue
+          }
+          const { data: rows, error } = await supabase.rpc('apply_plan_patch', {
+            plan_id: plan.id,
+            base_version: base.version,
+            patch: patch ?? {},
+            plan_name: planName,
+          })
+          if (error) {
+            markPlansSynced(syncedIds, syncedAt)
+            setSyncStatus('offline')
+            return
+          }
+          const result = ((rows ?? []) as PlanPatchResult[])[0]
+          if (!result) {
+            // Not on the server yet (or removed there): send the whole plan
+            fullWrites.push({ plan, data })
+          } else if (!result.applied) {
+            conflictIds.push(plan.id)
+          } else {
+            saveSyncedPlan(plan.id, { version: result.plan_version, name: plan.name, data })
+            syncedIds.push(plan.id)
+          }
+        }
+
+        if (fullWrites.length > 0) {
+          const payload = fullWrites.map(({ plan, data }) => ({
+            id: plan.id,
+            user_id: activeUser.id,
+            name: plan.name,
+            data,
+          }))
+          const { data: rows, error } = await supabase
+            .from('planner_plans')
+            .upsert(payload, { onConflict: 'id' })
+            .select('id, version')
+          if (error) {
+            markPlansSynced(syncedIds, syncedAt)
+            setSyncStatus('offline')
+            return
+          }
+          const versions = new Map(
+            ((rows ?? []) as { id: string; version: number }[]).map((row) => [row.id, row.version])
+          )
+          for (const { plan, data } of fullWrites) {
+            const version = versions.get(plan.id)
+            if (typeof version === 'number') {
+              saveSyncedPlan(plan.id, { version, name: plan.name, data })
+            }
+            syncedIds.push(plan.id)
+          }
+        }
+
+        markPlansSynced(syncedIds, syncedAt)
+
+        // Someone else wrote these plans since our base version: re-read them and let
+        // mergeRemotePlans pick the newer copy; a newer local copy is patched next round
+        if (conflictIds.length > 0) {
+          const remotePlans = await fetchRemotePlans(activeUser.id, conflictIds)
+          if (!remotePlans) {
+            setSyncStatus('offline')
+            return
+          }
+          applyRemotePlans(remotePlans)
+        }
       }
 
       if (deletedPlans.length > 0) {
@@ -114,7 +249,7 @@ export function usePlanSync({
     } finally {
       syncingRef.current = false
     }
-  }, [isOnline, markPlansSynced, purgeDeletedPlans])
+  }, [applyRemotePlans, isOnline, markPlansSynced, purgeDeletedPlans])
 
   useEffect(() => {
     if (!user || !isOnline) {
@@ -140,25 +275,24 @@ export function usePlanSync({
   useEffect(() => {
     if (!user || !isOnline) return
     let canceled = false
+    const userId = user.id
     const fetchRemote = async () => {
-      const { data, error } = await supabase
-        .from('planner_plans')
-        .select('id, name, data, updated_at')
+      const remotePlans = await fetchRemotePlans(userId)
       if (canceled) return
-      if (error) {
+      if (!remotePlans) {
         setSyncStatus('offline')
         return
       }
-      mergeRemotePlans((data ?? []) as RemotePlan[], {
-        onApplyCurrentPlanData: applyCurrentPlanData,
-      })
+      applyRemotePlans(remotePlans)
+      const latest = latestUpdatedAt(remotePlans, loadSyncCursor(userId))
+      if (latest) saveSyncCursor(userId, latest)
       await syncDirtyPlans()
     }
     fetchRemote()
     return () => {
       canceled = true
     }
-  }, [applyCurrentPlanData, isOnline, mergeRemotePlans, syncDirtyPlans, user])
+  }, [applyRemotePlans, isOnline, syncDirtyPlans, user])
 
   return syncStatus
 }
@@ -19,6 +19,7 @@ export type RemotePlan = {
   name: string
   data: PlanData
   updated_at: string
+  version?: number
 }
 
 function safeDate(value: string | null | undefined, fallback: string) {
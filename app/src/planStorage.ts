@@ -16,6 +16,7 @@ export const PLAN_LIST_KEY = 'curric-planner-plans'
 export const DEFAULT_PLAN_NAME = 'My Plan'
 
 const PLAN_PREFIX = 'curric-planner-plan'
+const SYNC_CURSOR_PREFIX = 'curric-planner-sync-cursor'
 
 const LEGACY_KEYS = {
   assignments: 'curric-planner-assignments',
@@ -264,6 +265,42 @@ export function saveConfig(planId: string, config: PlannerConfig) {
   saveConfigToKey(getPlanStorageKey(planId, 'config'), config)
 }
 
+/** The plan as the server last had it: the base that sync patches are computed against. */
+export type SyncedPlan = {
+  version: number
+  name: string
+  data: PlanData
+}
+
+export function loadSyncedPlan(planId: string): SyncedPlan | null {
+  try {
+    const raw = localStorage.getItem(getPlanStorageKey(planId, 'synced'))
+    if (!raw) return null
+    const parsed = JSON.parse(raw) as Partial<SyncedPlan>
+    if (typeof parsed.version !== 'number' || !parsed.data || typeof parsed.data !== 'object') return null
+    return { version: parsed.version, name: String(parsed.name ?? ''), data: parsed.data }
+  } catch {
+    return null
+  }
+}
+
+export function saveSyncedPlan(planId: string, plan: SyncedPlan) {
+  localStorage.setItem(getPlanStorageKey(planId, 'synced'), JSON.stringify(plan))
+}
+
+function getSyncCursorKey(userId: string) {
+  return `${SYNC_CURSOR_PREFIX}-${userId}`
+}
+
+/** Latest planner_plans.updated_at this browser has pulled for the user. */
+export function loadSyncCursor(userId: string): string | null {
+  return localStorage.getItem(getSyncCursorKey(userId))
+}
+
+export function saveSyncCursor(userId: string, cursor: string) {
+  localStorage.setItem(getSyncCursorKey(userId), cursor)
+}
+
 function normalizeAssignments(raw: AssignmentState | null | undefined): AssignmentState {
   const out: AssignmentState = {}
   if (!raw) return out
@@ -403,6 +440,7 @@ export function clearPlanDataFromStorage(planId: string) {
     getPlanStorageKey(planId, 'locked-years'),
     getPlanStorageKey(planId, 'unit-order'),
     getPlanStorageKey(planId, 'config'),
+    getPlanStorageKey(planId, 'synced'),
   ]
   keys.forEach((key) => localStorage.removeItem(key))
 }
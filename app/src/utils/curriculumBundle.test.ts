@@ -0,0 +1,156 @@
+import { afterEach, describe, expect, it, vi } from 'vitest'
+import { decodeCurriculumBundle, fetchCurriculumBundle } from './curriculumBundle'
+import type { CurriculumBundle, UnitSummaryRow } from './curriculumBundle'
+
+const algebraBundle: CurriculumBundle = {
+  format: 'curriculum-bundle',
+  version: 1,
+  curriculum_id: 'gatherround',
+  strings: ['Algebra', 'Math', 'Core', 'Track', 'Track A', '[]', 'Track B', 'Lab', 'Optional lab'],
+  units: { unit: [0], default_hours: [112], base_offsets: [0, 1], group_offsets: [0, 1], item_offsets: [0, 1] },
+  base: { category: [1], subcategory: [2], hours: [100] },
+  groups: { id: ['group-1'], category: [1], label: [3], note: [-1], default_choice: [1], choice_offsets: [0, 2] },
+  choices: { id: ['choice-1', 'choice-2'], subcategory: [4, 6], hours: [10, 12], recommended_books: [5, 5] },
+  items: { id: ['opt-1'], category: [1], subcategory: [7], hours: [4], description: [8], type: [-1] },
+}
+
+// unit_hours_summary as the database returns it: gen_random_uuid() ids, books
+// as string arrays, PE/LA optional items
+const dbSnapshot: UnitSummaryRow[] = [
+  {
+    unit: 'Ancient History',
+    curriculum_id: 'gatherround',
+    base_rows: [{ category: 'History', subcategory: 'Core', hours: 90 }],
+    option_groups: [
+      {
+        id: '3f1c2a9e-5b7d-4e0a-9c61-0d2b8f4e7a15',
+        category: 'Language Arts',
+        label: 'Required Reading',
+        note: null,
+        default_subcategory: 'Literature',
+        choices: [
+          {
+            id: 'b7e4d0c2-8a19-4f3e-a5d6-61c9e2f0b384',
+            subcategory: 'Literature',
+            hours: 30,
+            recommended_books: ['- The Odyssey by Homer', '- Beowulf'],
+          },
+        ],
+      },
+    ],
+    optional_items: [
+      {
+        id: 'e2a9c5f1-0d47-4b8e-b3a2-7c6f19d05e8b',
+        category: 'PE',
+        subcategory: 'PE',
+        hours: 10,
+        description: 'Olympic games',
+        type: 'PE',
+      },
+    ],
+    default_hours: 120,
+  },
+]
+
+// What bundle.py --database-url writes for dbSnapshot
+const dbBundle: CurriculumBundle = {
+  format: 'curriculum-bundle',
+  version: 1,
+  curriculum_id: 'gatherround',
+  catalog_version: 'db-4242',
+  strings: [
+    'Ancient History', 'History', 'Core', 'Language Arts', 'Required Reading', 'Literature',
+    '["- The Odyssey by Homer","- Beowulf"]', 'PE', 'Olympic games',
+  ],
+  units: { unit: [0], default_hours: [120], base_offsets: [0, 1], group_offsets: [0, 1], item_offsets: [0, 1] },
+  base: { category: [1], subcategory: [2], hours: [90] },
+  groups: {
+    id: ['3f1c2a9e-5b7d-4e0a-9c61-0d2b8f4e7a15'],
+    category: [3],
+    label: [4],
+    note: [-1],
+    default_choice: [0],
+    choice_offsets: [0, 1],
+  },
+  choices: { id: ['b7e4d0c2-8a19-4f3e-a5d6-61c9e2f0b384'], subcategory: [5], hours: [30], recommended_books: [6] },
+  items: {
+    id: ['e2a9c5f1-0d47-4b8e-b3a2-7c6f19d05e8b'],
+    category: [7],
+    subcategory: [7],
+    hours: [10],
+    description: [8],
+    type: [7],
+  },
+}
+
+function serveBundle(bundle: CurriculumBundle) {
+  vi.stubGlobal('fetch', vi.fn(() =>
+    Promise.resolve(
+      new Response(JSON.stringify(bundle), { status: 200, headers: { 'Content-Type': 'application/json' } })
+    )
+  ))
+}
+
+describe('decodeCurriculumBundle', () => {
+  it('expands columns into unit summary rows', () => {
+    expect(decodeCurriculumBundle(algebraBundle)).toEqual([
+      {
+        unit: 'Algebra',
+        curriculum_id: 'gatherround',
+        base_rows: [{ category: 'Math', subcategory: 'Core', hours: 100 }],
+        option_groups: [
+          {
+            id: 'group-1',
+            category: 'Math',
+            label: 'Track',
+            note: null,
+            default_subcategory: 'Track B',
+            choices: [
+              { id: 'choice-1', subcategory: 'Track A', hours: 10, recommended_books: [] },
+              { id: 'choice-2', subcategory: 'Track B', hours: 12, recommended_books: [] },
+            ],
+          },
+        ],
+        optional_items: [
+          { id: 'opt-1', category: 'Math', subcategory: 'Lab', hours: 4, description: 'Optional lab', type: null },
+        ],
+        default_hours: 112,
+      },
+    ])
+  })
+
+  it('rejects unknown bundle versions', () => {
+    expect(() => decodeCurriculumBundle({ ...algebraBundle, version: 99 })).toThrow(/Unsupported/)
+  })
+
+  it('decodes a database export back to the database rows', () => {
+    expect(decodeCurriculumBundle(dbBundle)).toEqual(dbSnapshot)
+  })
+})
+
+describe('fetchCurriculumBundle', () => {
+  afterEach(() => {
+    vi.unstubAllGlobals()
+  })
+
+  it('returns the rows when the bundle carries the expected catalog version', async () => {
+    serveBundle(dbBundle)
+
+    expect(await fetchCurriculumBundle('gatherround', 'db-4242')).toEqual(dbSnapshot)
+  })
+
+  it('skips bundles built for another version or without one', async () => {
+    serveBundle(dbBundle)
+    expect(await fetchCurriculumBundle('gatherround', 'db-4243')).toBeNull()
+
+    serveBundle({ ...dbBundle, catalog_version: undefined })
+    expect(await fetchCurriculumBundle('gatherround', 'db-4242')).toBeNull()
+  })
+
+  it('does not fetch a bundle when the set has no known version', async () => {
+    serveBundle(dbBundle)
+
+    expect(await fetchCurriculumBundle('gatherround', null)).toBeNull()
+    expect(fetch).not.toHaveBeenCalled()
+  })
+})
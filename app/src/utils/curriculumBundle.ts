@@ -0,0 +1,181 @@
+/**
+ * Columnar curriculum bundle (app/public/curriculum/<curriculumId>.json),
+ * written by scripts/curriculum_pipeline/bundle.py. Decodes to the same rows
+ * as the unit_hours_summary view so useCurriculum can use either source.
+ */
+
+export const BUNDLE_FORMAT = 'curriculum-bundle'
+export const BUNDLE_VERSION = 1
+
+export interface SummaryBaseRow {
+  category: string
+  subcategory: string
+  hours: number
+}
+
+export interface SummaryChoiceRow {
+  id: string
+  subcategory: string
+  hours: number | null
+  recommended_books: unknown
+}
+
+export interface SummaryOptionGroupRow {
+  id: string
+  category: string
+  label: string
+  note?: string | null
+  default_subcategory?: string | null
+  choices: SummaryChoiceRow[]
+}
+
+export interface SummaryOptionalItemRow {
+  id: string
+  category: string
+  subcategory: string
+  hours: number
+  description: string
+  type?: string | null
+}
+
+/** Row of the unit_hours_summary materialized view. */
+export interface UnitSummaryRow {
+  unit: string
+  curriculum_id: string
+  base_rows: SummaryBaseRow[]
+  option_groups: SummaryOptionGroupRow[]
+  optional_items: SummaryOptionalItemRow[]
+  default_hours?: number
+}
+
+export interface CurriculumBundle {
+  format: string
+  version: number
+  curriculum_id: string
+  /** curriculum_sets.catalog_version at export; the bundle is stale once the set's version moves on */
+  catalog_version?: string
+  /** String dictionary; string columns hold indexes into it (-1 = null) */
+  strings: string[]
+  units: {
+    unit: number[]
+    default_hours: number[]
+    base_offsets: number[]
+    group_offsets: number[]
+    item_offsets: number[]
+  }
+  base: { category: number[]; subcategory: number[]; hours: number[] }
+  groups: {
+    id: string[]
+    category: number[]
+    label: number[]
+    note: number[]
+    default_choice: number[]
+    choice_offsets: number[]
+  }
+  choices: {
+    id: string[]
+    subcategory: number[]
+    hours: (number | null)[]
+    recommended_books: number[]
+  }
+  items: {
+    id: string[]
+    category: number[]
+    subcategory: number[]
+    hours: number[]
+    description: number[]
+    type: number[]
+  }
+}
+
+export function decodeCurriculumBundle(bundle: CurriculumBundle): UnitSummaryRow[] {
+  if (bundle.format !== BUNDLE_FORMAT || bundle.version !== BUNDLE_VERSION) {
+    throw new Error(`Unsupported curriculum bundle: ${bundle.format} v${bundle.version}`)
+  }
+  const { strings, units, base, groups, choices, items } = bundle
+  const text = (idx: number) => (idx >= 0 ? strings[idx] : null)
+
+  const out: UnitSummaryRow[] = []
+  for (let u = 0; u < units.unit.length; u++) {
+    const baseRows: SummaryBaseRow[] = []
+    for (let b = units.base_offsets[u]; b < units.base_offsets[u + 1]; b++) {
+      baseRows.push({
+        category: strings[base.category[b]],
+        subcategory: strings[base.subcategory[b]],
+        hours: base.hours[b],
+      })
+    }
+
+    const optionGroups: SummaryOptionGroupRow[] = []
+    for (let g = units.group_offsets[u]; g < units.group_offsets[u + 1]; g++) {
+      const groupChoices: SummaryChoiceRow[] = []
+      for (let c = groups.choice_offsets[g]; c < groups.choice_offsets[g + 1]; c++) {
+        const books = text(choices.recommended_books[c])
+        groupChoices.push({
+          id: choices.id[c],
+          subcategory: strings[choices.subcategory[c]],
+          hours: choices.hours[c],
+          recommended_books: books != null ? JSON.parse(books) : null,
+        })
+      }
+      const defaultChoice = groups.default_choice[g]
+      optionGroups.push({
+        id: groups.id[g],
+        category: strings[groups.category[g]],
+        label: strings[groups.label[g]],
+        note: text(groups.note[g]),
+        default_subcategory: defaultChoice >= 0 ? groupChoices[defaultChoice].subcategory : null,
+        choices: groupChoices,
+      })
+    }
+
+    const optionalItems: SummaryOptionalItemRow[] = []
+    for (let i = units.item_offsets[u]; i < units.item_offsets[u + 1]; i++) {
+      optionalItems.push({
+        id: items.id[i],
+        category: strings[items.category[i]],
+        subcategory: strings[items.subcategory[i]],
+        hours: items.hours[i],
+        description: strings[items.description[i]],
+        type: text(items.type[i]),
+      })
+    }
+
+    out.push({
+      unit: strings[units.unit[u]],
+      curriculum_id: bundle.curriculum_id,
+      base_rows: baseRows,
+      option_groups: optionGroups,
+      optional_items: optionalItems,
+      default_hours: units.default_hours[u],
+    })
+  }
+  return out
+}
+
+/**
+ * Fetch and decode the static bundle for one curriculum set. Resolves to null
+ * when no bundle is published for it (e.g. sets created in the admin page), or
+ * when it was exported at another catalog version than expectedVersion. A set
+ * without a known version never uses the bundle: nothing shows the deployed
+ * file is still current, so it is not even fetched.
+ */
+export async function fetchCurriculumBundle(
+  curriculumId: string,
+  expectedVersion: string | null
+): Promise<UnitSummaryRow[] | null> {
+  if (expectedVersion == null) return null
+  let res: Response
+  try {
+    res = await fetch(`/curriculum/${encodeURIComponent(curriculumId)}.json`)
+  } catch {
+    return null
+  }
+  if (!res.ok) return null
+  const contentType = res.headers.get('content-type') ?? ''
+  // Dev servers answer unknown paths with index.html
+  if (!contentType.includes('json')) return null
+  const bundle = (await res.json()) as CurriculumBundle
+  if (bundle.catalog_version !== expectedVersion) return null
+  return decodeCurriculumBundle(bundle)
+}
@@ -0,0 +1,33 @@
+import { beforeEach, describe, expect, it } from 'vitest'
+import { clearCurriculumCache, readCachedCurriculum, writeCachedCurriculum } from './curriculumCache'
+import type { UnitSummaryRow } from './curriculumBundle'
+
+const rows: UnitSummaryRow[] = [
+  {
+    unit: 'Algebra',
+    curriculum_id: 'gatherround',
+    base_rows: [{ category: 'Math', subcategory: 'Core', hours: 100 }],
+    option_groups: [],
+    optional_items: [],
+  },
+]
+
+describe('curriculumCache', () => {
+  beforeEach(async () => {
+    await clearCurriculumCache()
+  })
+
+  it('returns rows only for the version they were cached under', async () => {
+    await writeCachedCurriculum('gatherround', 'v1', rows)
+
+    expect(await readCachedCurriculum('gatherround', 'v1')).toEqual(rows)
+    expect(await readCachedCurriculum('gatherround', 'v2')).toBeNull()
+    expect(await readCachedCurriculum('other', 'v1')).toBeNull()
+  })
+
+  it('never caches unversioned sets', async () => {
+    await writeCachedCurriculum('gatherround', null, rows)
+
+    expect(await readCachedCurriculum('gatherround', null)).toBeNull()
+  })
+})
@@ -0,0 +1,106 @@
+/**
+ * Curriculum summary rows cached per curriculum set in IndexedDB, keyed by
+ * curriculum_sets.catalog_version (see
+ * supabase/migrations/20261018120000_curriculum_set_catalog_version.sql).
+ * A set without a version is never cached. Rows read or written in this page
+ * load are also kept in memory, so switching plans does not touch IndexedDB.
+ * Every failure (no IndexedDB, quota, blocked upgrade) degrades to a miss.
+ */
+import type { UnitSummaryRow } from './curriculumBundle'
+
+const DB_NAME = 'curric-planner-curriculum'
+const DB_VERSION = 1
+const STORE = 'summaries'
+
+interface CachedCurriculum {
+  curriculumId: string
+  version: string
+  rows: UnitSummaryRow[]
+}
+
+const memory = new Map<string, CachedCurriculum>()
+let dbPromise: Promise<IDBDatabase | null> | null = null
+
+function openDb(): Promise<IDBDatabase | null> {
+  if (dbPromise) return dbPromise
+  dbPromise = new Promise((resolve) => {
+    if (typeof indexedDB === 'undefined') {
+      resolve(null)
+      return
+    }
+    try {
+      const req = indexedDB.open(DB_NAME, DB_VERSION)
+      req.onupgradeneeded = () => {
+        if (!req.result.objectStoreNames.contains(STORE)) {
+          req.result.createObjectStore(STORE, { keyPath: 'curriculumId' })
+        }
+      }
+      req.onsuccess = () => resolve(req.result)
+      req.onerror = () => resolve(null)
+      req.onblocked = () => resolve(null)
+    } catch {
+      resolve(null)
+    }
+  })
+  return dbPromise
+}
+
+function request<T>(req: IDBRequest<T>): Promise<T> {
+  return new Promise((resolve, reject) => {
+    req.onsuccess = () => resolve(req.result)
+    req.onerror = () => reject(req.error)
+  })
+}
+
+export async function readCachedCurriculum(
+  curriculumId: string,
+  version: string | null
+): Promise<UnitSummaryRow[] | null> {
+  if (version == null) return null
+  const hit = memory.get(curriculumId)
+  if (hit?.version === version) return hit.rows
+
+  const db = await openDb()
+  if (!db) return null
+  try {
+    const stored = await request<CachedCurriculum | undefined>(
+      db.transaction(STORE, 'readonly').objectStore(STORE).get(curriculumId)
+    )
+    if (stored?.version !== version) return null
+    memory.set(curriculumId, stored)
+    return stored.rows
+  } catch {
+    return null
+  }
+}
+
+/** Replace the cached rows for a set; the previous version is dropped. */
+export async function writeCachedCurriculum(
+  curriculumId: string,
+  version: string | null,
+  rows: UnitSummaryRow[]
+): Promise<void> {
+  if (version == null) return
+  const entry: CachedCurriculum = { curriculumId, version, rows }
+  memory.set(curriculumId, entry)
+
+  const db = await openDb()
+  if (!db) return
+  try {
+    await request(db.transaction(STORE, 'readwrite').objectStore(STORE).put(entry))
+  } catch {
+    // Quota or private mode: the in-memory copy still serves this page load
+  }
+}
+
+/** Drop every cached set (memory and IndexedDB). */
+export async function clearCurriculumCache(): Promise<void> {
+  memory.clear()
+  const db = await openDb()
+  if (!db) return
+  try {
+    await request(db.transaction(STORE, 'readwrite').objectStore(STORE).clear())
+  } catch {
+    // Nothing to clear
+  }
+}
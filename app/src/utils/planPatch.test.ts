@@ -0,0 +1,53 @@
+import { describe, expect, it } from 'vitest'
+import { applyMergePatch, createMergePatch } from './planPatch'
+
+describe('createMergePatch', () => {
+  it('returns undefined when nothing changed', () => {
+    const data = { assignments: { Algebra: 1 }, lockedYears: [2], config: { hoursPerCredit: 120 } }
+    expect(createMergePatch(data, JSON.parse(JSON.stringify(data)))).toBeUndefined()
+  })
+
+  it('includes only changed keys, with null for removed ones', () => {
+    const base = {
+      assignments: { Algebra: 1, Biology: 2, Chemistry: 3 },
+      lockedYears: [2],
+      config: { hoursPerCredit: 120, minCreditsForGraduation: 25 },
+    }
+    const next = {
+      assignments: { Algebra: 1, Biology: 4, Drama: 2 },
+      lockedYears: [2, 3],
+      config: { hoursPerCredit: 120, minCreditsForGraduation: 25 },
+    }
+
+    expect(createMergePatch(base, next)).toEqual({
+      assignments: { Biology: 4, Chemistry: null, Drama: 2 },
+      lockedYears: [2, 3],
+    })
+  })
+
+  it('round-trips through applyMergePatch', () => {
+    const base = {
+      assignments: { Algebra: 1, Biology: 2 },
+      unitOrderByYear: { 1: ['Algebra'], 2: ['Biology'] },
+      optionChoices: { Algebra: { group: 'Track A' } },
+    }
+    const next = {
+      assignments: { Biology: 1 },
+      unitOrderByYear: { 1: ['Biology'] },
+      optionChoices: {},
+      curriculumUnits: [{ curriculumId: 'gatherround', unit: 'Biology' }],
+    }
+
+    const patch = createMergePatch(base, next)
+    expect(patch).toBeDefined()
+    expect(applyMergePatch(base, patch!)).toEqual(next)
+  })
+})
+
+describe('applyMergePatch', () => {
+  it('replaces non-object targets and values', () => {
+    expect(applyMergePatch(null, { a: { b: 1 } })).toEqual({ a: { b: 1 } })
+    expect(applyMergePatch({ a: [1, 2] }, { a: [3] })).toEqual({ a: [3] })
+    expect(applyMergePatch({ a: 1 }, 'x')).toBe('x')
+  })
+})
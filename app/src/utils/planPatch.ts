@@ -0,0 +1,55 @@
+/**
+ * JSON merge patches (RFC 7396) between plan data snapshots.
+ * Matches public.jsonb_merge_patch, which applies them server-side in apply_plan_patch.
+ */
+export type JsonValue = string | number | boolean | null | JsonValue[] | { [key: string]: JsonValue }
+
+type JsonObject = { [key: string]: JsonValue }
+
+function isObject(value: unknown): value is JsonObject {
+  return typeof value === 'object' && value !== null && !Array.isArray(value)
+}
+
+function isEqual(a: unknown, b: unknown): boolean {
+  if (a === b) return true
+  if (Array.isArray(a) && Array.isArray(b)) {
+    return a.length === b.length && a.every((item, i) => isEqual(item, b[i]))
+  }
+  if (isObject(a) && isObject(b)) {
+    const keys = Object.keys(a)
+    return keys.length === Object.keys(b).length && keys.every((key) => key in b && isEqual(a[key], b[key]))
+  }
+  return false
+}
+
+/**
+ * Patch that turns `base` into `next`, or undefined when they are equal.
+ * Objects are diffed key by key (removed keys become null); arrays and other values are replaced whole.
+ */
+export function createMergePatch(base: unknown, next: unknown): JsonValue | undefined {
+  if (isEqual(base, next)) return undefined
+  if (!isObject(base) || !isObject(next)) return (next ?? null) as JsonValue
+  const patch: JsonObject = {}
+  for (const key of Object.keys(base)) {
+    if (!(key in next) || next[key] === undefined) patch[key] = null
+  }
+  for (const [key, value] of Object.entries(next)) {
+    if (value === undefined) continue
+    const change = createMergePatch(base[key], value)
+    if (change !== undefined) patch[key] = change
+  }
+  return patch
+}
+
+export function applyMergePatch(target: unknown, patch: JsonValue): JsonValue {
+  if (!isObject(patch)) return patch
+  const result: JsonObject = isObject(target) ? { ...target } : {}
+  for (const [key, value] of Object.entries(patch)) {
+    if (value === null) {
+      delete result[key]
+    } else {
+      result[key] = applyMergePatch(result[key], value)
+    }
+  }
+  return result
+}
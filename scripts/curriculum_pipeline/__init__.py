@@ -0,0 +1,19 @@
+"""Shared curriculum data pipeline used by the scripts in scripts/.
+
+Run modules from the scripts/ directory (or with scripts/ on PYTHONPATH), e.g.
+    python -m curriculum_pipeline.ingest ../data/gatherround
+or any of them through the CLI: python -m curriculum_pipeline --help
+
+Submodules are not imported here, so `import curriculum_pipeline.cli` stays
+cheap; the record types below load on first access.
+"""
+
+__all__ = ["HoursRow", "OptionalEntry", "UnitYear"]
+
+
+def __getattr__(name: str):
+    if name in __all__:
+        from . import records
+
+        return getattr(records, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Benchmark the data pipeline on a synthetic provider.
+
+Generates year sheets and an annotated optional-entries file
+(curriculum_pipeline.synthetic), then times each stage in its own forked
+process so peak RSS is per stage:
+
+  parse   ingest every sheet, write the hours CSV and raw entries JSON
+  split   stream the annotated JSONC into the by-type bucket files
+  seed    build the catalog and render seed SQL (--seed-format)
+  plan    ingest unit/year records and write the plan JSON
+  bundle  build the unit summary and write the columnar bundle
+
+Each stage reports seconds (best of --repeat), rows/sec, peak RSS and output
+bytes. --out saves the results as JSON; --compare checks them against a
+saved run and exits 1 when a stage is slower than --max-regression allows.
+
+Usage (from scripts/):
+    python -m curriculum_pipeline.bench [--sheets 20] [--units 12] [--out results.json]
+    python -m curriculum_pipeline.bench --compare results.json
+"""
+
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from pathlib import Path
+
+from . import split
+from .bundle import encode_bundle, write_bundle
+from .catalog import GROUPS_TABLE, TABLES, build_catalog, render_seed
+from .ingest import (
+    IngestResult,
+    find_year_sheets,
+    ingest_sheets,
+    iter_sheet,
+    write_entries_json,
+    write_hours_csv,
+)
+from .paths import REPO_ROOT
+from .records import UnitYear
+from .seed_writer import FORMATS
+from .summary import build_summary
+from .synthetic import write_entries, write_provider
+
+PROVIDER = "synthetic"
+RESULTS_FORMAT = 1
+
+
+def _provider_dir(work: Path) -> Path:
+    return work / PROVIDER
+
+
+def _entries_path(work: Path) -> Path:
+    return _provider_dir(work) / f"{PROVIDER}-optional-entries.json"
+
+
+def stage_parse(work: Path, config: dict) -> tuple[int, list[Path]]:
+    provider_dir = _provider_dir(work)
+    result = ingest_sheets(find_year_sheets(provider_dir), PROVIDER)
+    hours_out = provider_dir / "unit_subcategory_hours.csv"
+    entries_out = work / "entries.raw.json"
+    write_hours_csv(result.hours, hours_out)
+    write_entries_json(result.entries, entries_out)
+    return len(result.hours) + len(result.entries) + len(result.unit_years), [hours_out, entries_out]
+
+
+def stage_split(work: Path, config: dict) -> tuple[int, list[Path]]:
+    out_dir = _provider_dir(work) / "optional-entries-by-type"
+    counts = split.split_entries(_entries_path(work), out_dir)
+    return sum(counts.values()), split.bucket_paths(out_dir)
+
+
+def stage_seed(work: Path, config: dict) -> tuple[int, list[Path]]:
+    catalog, _ = build_catalog(_provider_dir(work), PROVIDER)
+    out = work / f"seed.{config['seed_format']}.sql"
+    with open(out, "w", encoding="utf-8") as f:
+        for table in TABLES:
+            if catalog[table]:
+                f.write(render_seed(config["seed_format"], table, catalog[table], catalog[GROUPS_TABLE]) + "\n\n")
+    return sum(len(rows) for rows in catalog.values()), [out]
+
+
+def stage_plan(work: Path, config: dict) -> tuple[int, list[Path]]:
+    result = IngestResult()
+    records = 0
+    for year, path in find_year_sheets(_provider_dir(work)):
+        for record in iter_sheet(path, year, PROVIDER):
+            records += 1
+            if isinstance(record, UnitYear):
+                result.add(record)
+    out = work / "plan.json"
+    plan = {"assignments": result.unit_year_map(), "unitOrderByYear": result.unit_order_by_year()}
+    out.write_text(json.dumps(plan, indent=2) + "\n", encoding="utf-8")
+    return records, [out]
+
+
+def stage_bundle(work: Path, config: dict) -> tuple[int, list[Path]]:
+    catalog, _ = build_catalog(_provider_dir(work), PROVIDER)
+    out = work / f"{PROVIDER}.bundle.json"
+    write_bundle(out, encode_bundle(build_summary(catalog), PROVIDER))
+    return sum(len(rows) for rows in catalog.values()), [out]
+
+
+STAGES = {
+    "parse": stage_parse,
+    "split": stage_split,
+    "seed": stage_seed,
+    "plan": stage_plan,
+    "bundle": stage_bundle,
+}
+
+# Stages whose outputs another stage reads; run untimed when not selected
+REQUIRES = {"seed": ("parse", "split"), "bundle": ("parse", "split")}
+
+
+def _timed_stage(name: str, work: Path, config: dict) -> dict:
+    """Runs in a fresh worker process: (seconds, rows, peak RSS in KiB, output bytes)."""
+    start = time.perf_counter()
+    rows, outputs = STAGES[name](work, config)
+    seconds = time.perf_counter() - start
+    return {
+        "seconds": seconds,
+        "rows": rows,
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "output_bytes": sum(p.stat().st_size for p in outputs if p.exists()),
+    }
+
+
+def run_stage(name: str, work: Path, config: dict, repeat: int = 1) -> dict:
+    best = None
+    for _ in range(repeat):
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("fork")) as pool:
+            run = pool.submit(_timed_stage, name, work, config).result()
+        if best is None or run["seconds"] < best["seconds"]:
+            best = run
+    best["rows_per_sec"] = best["rows"] / best["seconds"] if best["seconds"] else 0.0
+    return best
+
+
+def prepare(work: Path, config: dict) -> None:
+    """Synthetic sheets plus the annotated entries file (inputs, not timed)."""
+    provider_dir = _provider_dir(work)
+    write_provider(
+        provider_dir,
+        sheets=config["sheets"],
+        units=config["units"],
+        subcategories=config["subcategories"],
+        optional_rate=config["optional_rate"],
+        categories=config["categories"],
+        provider=PROVIDER,
+        seed=config["seed"],
+    )
+    result = ingest_sheets(find_year_sheets(provider_dir), PROVIDER)
+    write_entries(result, _entries_path(work), seed=config["seed"])
+
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_benchmarks(config: dict, stages: list[str], repeat: int = 1) -> dict:
+    with tempfile.TemporaryDirectory(prefix="curriculum-bench-") as tmp:
+        work = Path(tmp)
+        prepare(work, config)
+        needed = {dep for name in stages for dep in REQUIRES.get(name, ())}
+        results = {}
+        for name in STAGES:
+            if name in stages:
+                results[name] = run_stage(name, work, config, repeat)
+            elif name in needed:
+                STAGES[name](work, config)
+    return {
+        "format": RESULTS_FORMAT,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "config": config,
+        "stages": results,
+    }
+
+
+def print_results(results: dict) -> None:
+    print(f"{'stage':<8} {'seconds':>9} {'rows':>10} {'rows/s':>12} {'peak RSS':>10} {'output':>12}")
+    for name, r in results["stages"].items():
+        print(
+            f"{name:<8} {r['seconds']:9.3f} {r['rows']:10,} {r['rows_per_sec']:12,.0f}"
+            f" {r['peak_rss_kb'] / 1024:8.1f}MB {r['output_bytes']:12,}"
+        )
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> list[str]:
+    """Stages slower than baseline by more than max_regression (a fraction)."""
+    regressions = []
+    if baseline.get("config") != results["config"]:
+        print("warning: baseline was run with a different config")
+    print(f"\nvs {baseline.get('commit') or 'baseline'} ({baseline.get('created', '?')}):")
+    for name, r in results["stages"].items():
+        base = baseline.get("stages", {}).get(name)
+        if not base or not base["seconds"]:
+            continue
+        ratio = r["seconds"] / base["seconds"]
+        rss = r["peak_rss_kb"] / base["peak_rss_kb"] if base.get("peak_rss_kb") else 1.0
+        flag = ""
+        if ratio > 1 + max_regression:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"  {name:<8} time x{ratio:5.2f}  rss x{rss:5.2f}{flag}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark pipeline stages on synthetic data.")
+    parser.add_argument("--sheets", type=int, default=20, help="year sheets to generate")
+    parser.add_argument("--units", type=int, default=12, help="units per sheet")
+    parser.add_argument("--subcategories", type=int, default=5, help="subcategories per category")
+    parser.add_argument("--categories", type=int, default=None, help="categories per sheet (default: all)")
+    parser.add_argument("--optional-rate", type=float, default=0.3, help="share of units with optional sections")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the generator")
+    parser.add_argument("--seed-format", choices=FORMATS, default="bulk")
+    parser.add_argument("--stage", action="append", choices=list(STAGES), help="run only these stages")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per stage; the fastest is reported")
+    parser.add_argument("--out", type=Path, help="write results JSON here")
+    parser.add_argument("--compare", type=Path, help="baseline results JSON to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    config = {
+        "sheets": args.sheets,
+        "units": args.units,
+        "subcategories": args.subcategories,
+        "categories": args.categories,
+        "optional_rate": args.optional_rate,
+        "seed": args.seed,
+        "seed_format": args.seed_format,
+    }
+    results = run_benchmarks(config, args.stage or list(STAGES), max(1, args.repeat))
+    print_results(results)
+
+    if args.out:
+        args.out.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"\nWrote {args.out}")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        if compare(results, baseline, args.max_regression):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark type-label classification on a synthetic sheet corpus.
+
+Compares the original per-pattern scan with the compiled classifier
+(ingest.classify_type, with and without its cache) over every cell of the
+corpus, checks they agree, and times a full iter_sheet pass.
+
+Usage (from scripts/):
+    python -m curriculum_pipeline.bench_labels [--sheets 100] [--units 12]
+"""
+
+import argparse
+import csv
+import tempfile
+import time
+from pathlib import Path
+
+from .ingest import TYPE_PATTERNS, classify_type, find_year_sheets, iter_sheet
+from .synthetic import write_provider
+
+
+def legacy_is_type_label(cell: str) -> bool:
+    """The original is_type_label: two substring tests per pattern."""
+    if not cell or not cell.strip():
+        return False
+    t = cell.strip()
+    for pattern in TYPE_PATTERNS:
+        if pattern in t or t in pattern:
+            return True
+    if t.startswith("Optional ") and ("Lab" in t or "LA Addition" in t or "PE " in t):
+        return True
+    if t.startswith("Required PE"):
+        return True
+    return False
+
+
+def _rate(label: str, cells: int, seconds: float) -> None:
+    print(f"  {label:<24} {seconds * 1000:9.1f} ms  {cells / seconds:14,.0f} cells/s")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark type-label classification.")
+    parser.add_argument("--sheets", type=int, default=100)
+    parser.add_argument("--units", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_provider(Path(tmp), sheets=args.sheets, units=args.units, seed=args.seed)
+        sheets = find_year_sheets(Path(tmp))
+        cells = []
+        for _, path in sheets:
+            with open(path, newline="", encoding="utf-8") as f:
+                for row in csv.reader(f):
+                    cells.extend(row[1:])
+        print(f"{len(sheets)} sheets, {len(cells):,} cells")
+
+        start = time.perf_counter()
+        legacy = [legacy_is_type_label(c) for c in cells]
+        _rate("legacy scan", len(cells), time.perf_counter() - start)
+
+        uncached = classify_type.__wrapped__
+        start = time.perf_counter()
+        compiled = [uncached(c) is not None for c in cells]
+        _rate("compiled", len(cells), time.perf_counter() - start)
+
+        classify_type.cache_clear()
+        start = time.perf_counter()
+        cached = [classify_type(c) is not None for c in cells]
+        _rate("compiled + cache", len(cells), time.perf_counter() - start)
+
+        if legacy != compiled or legacy != cached:
+            mismatches = sum(a != b for a, b in zip(legacy, compiled))
+            print(f"Classifier mismatch on {mismatches} cells")
+            return 1
+
+        start = time.perf_counter()
+        records = sum(1 for year, path in sheets for _ in iter_sheet(path, year))
+        _rate("iter_sheet (all stages)", len(cells), time.perf_counter() - start)
+        print(f"  {records:,} records")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
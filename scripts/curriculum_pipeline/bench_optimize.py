@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark the year optimizer on synthetic catalogs of increasing size.
+
+Each size is a multi-provider catalog (--units-per-provider units per
+synthetic provider, synthetic.unit_summaries) solved twice: choosing units to
+meet the targets, and with --place-all. Reports time, search steps and how far
+the result is from the targets; exits 1 if a solve takes longer than
+--max-seconds.
+
+Usage (from scripts/):
+    python -m curriculum_pipeline.bench_optimize [--sizes 40,100,200,400,800] [--max-seconds 1]
+"""
+
+import argparse
+
+from .credits import CurriculumModel
+from .optimize import Problem, Targets, optimize
+from .synthetic import unit_summaries
+
+# Targets a four-year plan would set; the synthetic catalogs can meet them from ~40 units
+CATEGORY_MINIMUMS = {"Science": 3.0, "Language Arts": 4.0, "Social Sciences": 3.0, "Bible": 1.0}
+
+
+def catalog(units: int, per_provider: int, seed: int) -> CurriculumModel:
+    summary = []
+    for p, start in enumerate(range(0, units, per_provider)):
+        summary += unit_summaries(min(per_provider, units - start), f"provider{p}", seed + p)
+    return CurriculumModel.from_summary(summary)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the year optimizer on synthetic catalogs.")
+    parser.add_argument("--sizes", default="40,100,200,400,800", help="comma-separated catalog sizes (units)")
+    parser.add_argument("--units-per-provider", type=int, default=40)
+    parser.add_argument("--min-credits", type=float, default=25.0)
+    parser.add_argument("--max-seconds", type=float, default=1.0, help="fail if any solve is slower")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    targets = Targets(min_credits=args.min_credits, category_min=CATEGORY_MINIMUMS)
+    slow = 0
+    print(f"{'units':>6} {'mode':<10} {'ms':>8} {'steps':>6} {'placed':>7} {'credits':>8} {'year spread':>12} {'short':>6}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        model = catalog(size, max(1, args.units_per_provider), args.seed)
+        problem = Problem.from_model(model)
+        for mode, place_all in (("choose", False), ("place-all", True)):
+            solution = optimize(problem, targets, place_all)
+            spread = solution.year_credits.max() - solution.year_credits.min()
+            slow += solution.seconds > args.max_seconds
+            print(
+                f"{size:>6} {mode:<10} {solution.seconds * 1000:8.1f} {solution.steps:>6} "
+                f"{int((solution.years > 0).sum()):>7} {solution.year_credits.sum():8.2f} {spread:12.3f} "
+                f"{solution.short_credits:6.2f}"
+            )
+    if slow:
+        print(f"{slow} solve(s) over {args.max_seconds:g} s")
+    return 1 if slow else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Load generator for the planner's curriculum reads.
+
+Each simulated client replays the app's fan-out for its curriculum sets, all
+four requests at once on their own keep-alive connections (as a browser
+would): the three unit-ref queries from fetchCurriculumUnitRefs
+(unit_subcategory_hours, unit_option_groups, unit_optional_items, select
+unit,curriculum_id) and useCurriculum's unit_hours_summary query (or, with
+--bundle, the /curriculum/<id>.json bundle it tries first). --revalidate
+sends If-None-Match with the ETags from the previous round, as a browser
+cache would. Reports request and fan-out latency percentiles and throughput.
+
+By default it starts `curriculum_pipeline.serve --port 0` in a child process
+(so the server does not share the generator's event loop); --url points it
+at a running server instead, such as a local Supabase (pass --apikey).
+
+Usage (from scripts/):
+    python -m curriculum_pipeline.bench_serve [--clients 50] [--rounds 20] [--revalidate] [--bundle]
+    python -m curriculum_pipeline.bench_serve --synthetic 2000 --clients 200
+    python -m curriculum_pipeline.bench_serve --url http://127.0.0.1:54321 --curriculum gatherround
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from urllib.parse import quote, urlencode, urlsplit
+
+from .paths import SCRIPTS_DIR
+
+PERCENTILES = (50, 90, 99)
+SERVING_RE = re.compile(r"Serving (http://\S+?)/rest/v1/")
+
+
+def _in_list(values: list[str]) -> str:
+    """postgrest-js .in(): values with reserved characters are double-quoted."""
+    quoted = [f'"{v}"' if any(c in v for c in ',()"\\') else v for v in values]
+    return f"in.({','.join(quoted)})"
+
+
+def fanout(curriculum_ids: list[str], bundle: bool = False) -> list[tuple[str, str]]:
+    """(name, path) for the requests the planner makes when it loads these curriculum sets."""
+    ids = _in_list(curriculum_ids)
+    refs = urlencode({"select": "unit,curriculum_id", "curriculum_id": ids})
+    requests = [
+        (table, f"/rest/v1/{table}?{refs}")
+        for table in ("unit_subcategory_hours", "unit_option_groups", "unit_optional_items")
+    ]
+    if bundle:
+        requests += [(f"bundle {cid}", f"/curriculum/{quote(cid)}.json") for cid in curriculum_ids]
+    else:
+        summary = urlencode({
+            "select": "unit,curriculum_id,base_rows,option_groups,optional_items", "curriculum_id": ids,
+        })
+        requests.append(("unit_hours_summary", f"/rest/v1/unit_hours_summary?{summary}"))
+    return requests
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection; reconnects when the server closes it."""
+
+    def __init__(self, host: str, port: int, headers: dict[str, str]) -> None:
+        self.host = host
+        self.port = port
+        self.headers = headers
+        self.reader: asyncio.StreamReader | None = None
+        self.writer: asyncio.StreamWriter | None = None
+
+    async def get(self, path: str, etag: str | None = None) -> tuple[int, dict[str, str], bytes]:
+        if self.writer is None or self.writer.is_closing():
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        lines = [f"GET {path} HTTP/1.1", f"Host: {self.host}:{self.port}", "Accept: application/json"]
+        lines += [f"{name}: {value}" for name, value in self.headers.items()]
+        if etag:
+            lines.append(f"If-None-Match: {etag}")
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("server closed the connection")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        body = await self.reader.readexactly(int(headers.get("content-length") or 0))
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, headers, body
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+@dataclass
+class Stats:
+    requests: dict[str, list[float]] = field(default_factory=dict)  # name -> seconds
+    rounds: list[float] = field(default_factory=list)
+    statuses: dict[int, int] = field(default_factory=dict)
+    bytes: int = 0
+    errors: int = 0
+
+
+async def simulate_client(
+    host: str, port: int, headers: dict[str, str], requests: list[tuple[str, str]],
+    rounds: int, revalidate: bool, stats: Stats,
+) -> None:
+    connections = [Connection(host, port, headers) for _ in requests]
+    etags: dict[str, str] = {}
+
+    async def one(conn: Connection, name: str, path: str) -> None:
+        started = time.perf_counter()
+        try:
+            status, response_headers, body = await conn.get(path, etags.get(path) if revalidate else None)
+        except (ConnectionError, OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+            stats.errors += 1
+            await conn.close()
+            return
+        stats.requests.setdefault(name, []).append(time.perf_counter() - started)
+        stats.statuses[status] = stats.statuses.get(status, 0) + 1
+        stats.bytes += len(body)
+        if "etag" in response_headers:
+            etags[path] = response_headers["etag"]
+
+    try:
+        for _ in range(rounds):
+            started = time.perf_counter()
+            await asyncio.gather(*(one(conn, name, path) for conn, (name, path) in zip(connections, requests)))
+            stats.rounds.append(time.perf_counter() - started)
+    finally:
+        for conn in connections:
+            await conn.close()
+
+
+def percentiles(seconds: list[float], points=PERCENTILES) -> dict:
+    """Sample count, then nearest-rank percentiles and max in milliseconds."""
+    if not seconds:
+        return {"n": 0}
+    ordered = sorted(seconds)
+    n = len(ordered)
+    out = {f"p{p}": ordered[min(n - 1, max(0, -(-p * n // 100) - 1))] * 1000 for p in points}
+    out["max"] = ordered[-1] * 1000
+    return {"n": n, **{k: round(v, 3) for k, v in out.items()}}
+
+
+async def start_server(args: argparse.Namespace) -> tuple[asyncio.subprocess.Process, str]:
+    """`serve --port 0` in a child process, and its base URL once it is listening."""
+    command = [sys.executable, "-m", "curriculum_pipeline.serve", "--port", "0"]
+    if args.synthetic is not None:
+        command += ["--synthetic", str(args.synthetic), "--seed", str(args.seed)]
+    for curriculum_id in args.curriculum or []:
+        command += ["--curriculum", curriculum_id]
+    process = await asyncio.create_subprocess_exec(*command, cwd=SCRIPTS_DIR, stdout=asyncio.subprocess.PIPE)
+    line = (await process.stdout.readline()).decode()
+    match = SERVING_RE.search(line)
+    if not match:
+        process.kill()
+        await process.wait()
+        raise SystemExit(f"serve did not start (exit {process.returncode})")
+    return process, match.group(1)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    process = None
+    if args.url:
+        base_url = args.url
+    else:
+        process, base_url = await start_server(args)
+    url = urlsplit(base_url)
+    host, port = url.hostname or "127.0.0.1", url.port or 80
+    if args.synthetic is not None:
+        curriculum_ids = ["synthetic"]
+    else:
+        curriculum_ids = args.curriculum or ["gatherround"]
+
+    headers = {"apikey": args.apikey, "Authorization": f"Bearer {args.apikey}"} if args.apikey else {}
+    requests = fanout(curriculum_ids, args.bundle)
+    stats = Stats()
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(
+            simulate_client(host, port, headers, requests, args.rounds, args.revalidate, stats)
+            for _ in range(args.clients)
+        ))
+    finally:
+        if process is not None:
+            process.terminate()
+            await process.wait()
+    seconds = time.perf_counter() - started
+
+    total = sum(len(v) for v in stats.requests.values())
+    return {
+        "clients": args.clients,
+        "rounds": args.rounds,
+        "revalidate": args.revalidate,
+        "bundle": args.bundle,
+        "requests": total,
+        "errors": stats.errors,
+        "statuses": {str(k): v for k, v in sorted(stats.statuses.items())},
+        "seconds": round(seconds, 3),
+        "requests_per_second": round(total / seconds) if seconds else None,
+        "megabytes": round(stats.bytes / 1e6, 3),
+        "fanout_ms": percentiles(stats.rounds),
+        "request_ms": {name: percentiles(values) for name, values in stats.requests.items()},
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay the planner's curriculum fan-out from simulated clients.")
+    parser.add_argument("--url", help="server to load (default: start curriculum_pipeline.serve in-process)")
+    parser.add_argument("--apikey", help="apikey / bearer token for a Supabase URL")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--curriculum", action="append", help="curriculum ids to request (default: gatherround)")
+    source.add_argument("--synthetic", type=int, metavar="UNITS", help="in-process server: synthetic curriculum size")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for --synthetic")
+    parser.add_argument("--clients", type=int, default=50, help="simulated clients, each with its own connections")
+    parser.add_argument("--rounds", type=int, default=20, help="fan-outs per client")
+    parser.add_argument("--revalidate", action="store_true", help="send If-None-Match with the previous ETags")
+    parser.add_argument("--bundle", action="store_true", help="fetch the static bundle instead of unit_hours_summary")
+    parser.add_argument("--json", action="store_true", help="print the JSON report instead of a table")
+    args = parser.parse_args()
+    if args.synthetic is not None and args.url:
+        parser.error("--synthetic only applies to the in-process server")
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0 if not report["errors"] else 1
+
+    columns = (*(f"p{p}" for p in PERCENTILES), "max")
+    print(f"{'request':<24} {'n':>7} " + " ".join(f"{k:>9}" for k in columns) + "  (ms)")
+    for name, p in [*report["request_ms"].items(), ("fan-out", report["fanout_ms"])]:
+        print(f"{name:<24} {p['n']:>7} " + " ".join(f"{p.get(k, 0):9.2f}" for k in columns))
+    statuses = ", ".join(f"{status}: {n}" for status, n in report["statuses"].items())
+    print(
+        f"{report['requests']} requests from {report['clients']} clients in {report['seconds']:.2f} s "
+        f"({report['requests_per_second']} req/s, {report['megabytes']:.1f} MB; {statuses}; {report['errors']} errors)"
+    )
+    return 0 if not report["errors"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Columnar curriculum bundle served as a static file to the planner.
+
+Encodes the per-unit summary (curriculum_pipeline.summary) column by column:
+every string goes through one dictionary, hours are plain number arrays, and
+each parent table points at its children with CSR-style offsets
+(children of row i are offsets[i]:offsets[i + 1]). The client
+(app/src/utils/curriculumBundle.ts) decodes it back to unit_hours_summary
+rows, so it loads one file instead of querying PostgREST.
+
+The published bundle (app/public/curriculum/<id>.json) is exported from the
+database with --database-url: the set's unit_hours_summary rows and its
+curriculum_sets.catalog_version, read in one snapshot. Only those rows carry
+the ids saved plans refer to, every option set (PE and LA included) and
+recommended_books as the string arrays the planner reads. Without
+--database-url the bundle is built from data/ and written to
+.pipeline-cache/bundles/ for inspection; its ids are not the live ones.
+--check compares an existing bundle with its source instead of writing it.
+
+Layout (BUNDLE_VERSION 1):
+  catalog_version              curriculum_sets.catalog_version (data/ builds: summary.catalog_version)
+  strings                      string dictionary; other columns hold indexes (-1 = null)
+  units    unit, default_hours, base_offsets, group_offsets, item_offsets
+  base     category, subcategory, hours
+  groups   id, category, label, note, default_choice (index into the group's choices, -1 = none), choice_offsets
+  choices  id, subcategory, hours, recommended_books (dictionary index of the JSON text)
+  items    id, category, subcategory, hours, description, type
+
+Usage (from scripts/):
+    python -m curriculum_pipeline.bundle gatherround --database-url URL [--verify]
+    python -m curriculum_pipeline.bundle gatherround --database-url URL --check
+    python -m curriculum_pipeline.bundle gatherround [--out-dir DIR]
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from .cache import CACHE_DIR
+from .catalog import build_catalog
+from .paths import APP_DIR, DATA_DIR
+from .summary import build_summary, catalog_version
+
+BUNDLE_FORMAT = "curriculum-bundle"
+BUNDLE_VERSION = 1
+BUNDLE_DIR = APP_DIR / "public" / "curriculum"
+PREVIEW_DIR = CACHE_DIR / "bundles"
+SUMMARY_COLUMNS = ("curriculum_id", "unit", "base_rows", "option_groups", "optional_items", "default_hours")
+
+
+class _Strings:
+    def __init__(self) -> None:
+        self.values: list[str] = []
+        self._index: dict[str, int] = {}
+
+    def ref(self, value: str | None) -> int:
+        if value is None:
+            return -1
+        idx = self._index.get(value)
+        if idx is None:
+            idx = self._index[value] = len(self.values)
+            self.values.append(value)
+        return idx
+
+
+def encode_bundle(summary: list[dict], curriculum_id: str, version: str | None = None) -> dict:
+    """Summary rows for one curriculum -> bundle dict (see module docstring); version defaults to their checksum."""
+    s = _Strings()
+    units = {"unit": [], "default_hours": [], "base_offsets": [0], "group_offsets": [0], "item_offsets": [0]}
+    base = {"category": [], "subcategory": [], "hours": []}
+    groups = {"id": [], "category": [], "label": [], "note": [], "default_choice": [], "choice_offsets": [0]}
+    choices = {"id": [], "subcategory": [], "hours": [], "recommended_books": []}
+    items = {"id": [], "category": [], "subcategory": [], "hours": [], "description": [], "type": []}
+
+    for row in summary:
+        units["unit"].append(s.ref(row["unit"]))
+        units["default_hours"].append(row["default_hours"])
+        for r in row["base_rows"]:
+            base["category"].append(s.ref(r["category"]))
+            base["subcategory"].append(s.ref(r["subcategory"]))
+            base["hours"].append(r["hours"])
+        for g in row["option_groups"]:
+            groups["id"].append(g["id"])
+            groups["category"].append(s.ref(g["category"]))
+            groups["label"].append(s.ref(g["label"]))
+            groups["note"].append(s.ref(g["note"]))
+            subcategories = [c["subcategory"] for c in g["choices"]]
+            default = g["default_subcategory"]
+            groups["default_choice"].append(subcategories.index(default) if default in subcategories else -1)
+            for c in g["choices"]:
+                choices["id"].append(c["id"])
+                choices["subcategory"].append(s.ref(c["subcategory"]))
+                choices["hours"].append(c["hours"])
+                books = c["recommended_books"]
+                choices["recommended_books"].append(
+                    s.ref(json.dumps(books, ensure_ascii=False, separators=(",", ":")) if books is not None else None)
+                )
+            groups["choice_offsets"].append(len(choices["id"]))
+        for i in row["optional_items"]:
+            items["id"].append(i["id"])
+            items["category"].append(s.ref(i["category"]))
+            items["subcategory"].append(s.ref(i["subcategory"]))
+            items["hours"].append(i["hours"])
+            items["description"].append(s.ref(i["description"]))
+            items["type"].append(s.ref(i["type"]))
+        units["base_offsets"].append(len(base["hours"]))
+        units["group_offsets"].append(len(groups["id"]))
+        units["item_offsets"].append(len(items["id"]))
+
+    return {
+        "format": BUNDLE_FORMAT,
+        "version": BUNDLE_VERSION,
+        "curriculum_id": curriculum_id,
+        "catalog_version": version if version is not None else catalog_version(summary),
+        "strings": s.values,
+        "units": units,
+        "base": base,
+        "groups": groups,
+        "choices": choices,
+        "items": items,
+    }
+
+
+def decode_bundle(bundle: dict) -> list[dict]:
+    """Bundle dict -> summary rows, the inverse of encode_bundle."""
+    if bundle.get("format") != BUNDLE_FORMAT or bundle.get("version") != BUNDLE_VERSION:
+        raise ValueError(f"Unsupported bundle: {bundle.get('format')!r} v{bundle.get('version')!r}")
+    strings = bundle["strings"]
+    units, base, groups, choices, items = (
+        bundle["units"], bundle["base"], bundle["groups"], bundle["choices"], bundle["items"]
+    )
+
+    def text(idx: int) -> str | None:
+        return strings[idx] if idx >= 0 else None
+
+    out = []
+    for u, unit_idx in enumerate(units["unit"]):
+        option_groups = []
+        for g in range(units["group_offsets"][u], units["group_offsets"][u + 1]):
+            start, end = groups["choice_offsets"][g], groups["choice_offsets"][g + 1]
+            group_choices = [
+                {
+                    "id": choices["id"][c],
+                    "subcategory": strings[choices["subcategory"][c]],
+                    "hours": choices["hours"][c],
+                    "recommended_books": (
+                        json.loads(strings[choices["recommended_books"][c]])
+                        if choices["recommended_books"][c] >= 0
+                        else None
+                    ),
+                }
+                for c in range(start, end)
+            ]
+            default = groups["default_choice"][g]
+            option_groups.append({
+                "id": groups["id"][g],
+                "category": strings[groups["category"][g]],
+                "label": strings[groups["label"][g]],
+                "note": text(groups["note"][g]),
+                "default_subcategory": group_choices[default]["subcategory"] if default >= 0 else None,
+                "choices": group_choices,
+            })
+        out.append({
+            "curriculum_id": bundle["curriculum_id"],
+            "unit": strings[unit_idx],
+            "base_rows": [
+                {
+                    "category": strings[base["category"][b]],
+                    "subcategory": strings[base["subcategory"][b]],
+                    "hours": base["hours"][b],
+                }
+                for b in range(units["base_offsets"][u], units["base_offsets"][u + 1])
+            ],
+            "option_groups": option_groups,
+            "optional_items": [
+                {
+                    "id": items["id"][i],
+                    "category": strings[items["category"][i]],
+                    "subcategory": strings[items["subcategory"][i]],
+                    "hours": items["hours"][i],
+                    "description": strings[items["description"][i]],
+                    "type": text(items["type"][i]),
+                }
+                for i in range(units["item_offsets"][u], units["item_offsets"][u + 1])
+            ],
+            "default_hours": units["default_hours"][u],
+        })
+    return out
+
+
+def bundle_path(curriculum_id: str, out_dir: Path = BUNDLE_DIR) -> Path:
+    return out_dir / f"{curriculum_id}.json"
+
+
+def write_bundle(path: Path, bundle: dict) -> int:
+    """Write compact JSON; returns the size in bytes."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = json.dumps(bundle, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    path.write_bytes(data + b"\n")
+    return len(data) + 1
+
+
+def read_bundle(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def load_database_summary(database_url: str, curriculum_id: str) -> tuple[list[dict], str]:
+    """unit_hours_summary rows for curriculum_id (sorted by unit) and the set's catalog_version, from one snapshot."""
+    try:
+        import psycopg
+    except ImportError:
+        raise SystemExit("Install psycopg to export the bundle from Postgres: pip install psycopg")
+
+    with psycopg.connect(database_url) as conn:
+        # Rows and version must describe the same commit
+        conn.isolation_level = psycopg.IsolationLevel.REPEATABLE_READ
+        found = conn.execute("SELECT catalog_version FROM curriculum_sets WHERE id = %s", [curriculum_id]).fetchone()
+        rows = conn.execute(
+            f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM unit_hours_summary WHERE curriculum_id = %s",
+            [curriculum_id],
+        ).fetchall()
+    if found is None or found[0] is None:
+        raise SystemExit(f"Curriculum set {curriculum_id!r} has no catalog_version in the database")
+    summary = []
+    for row in sorted(rows, key=lambda r: r[1]):
+        summary.append(dict(zip(SUMMARY_COLUMNS, row)))
+        # numeric column; the jsonb columns already decode to plain numbers
+        summary[-1]["default_hours"] = float(summary[-1]["default_hours"])
+    return summary, found[0]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Write the columnar curriculum bundle for a provider.")
+    parser.add_argument("curriculum_id", help="curriculum set id, e.g. gatherround")
+    parser.add_argument("--database-url", metavar="URL", help="export from this Postgres (the published bundle)")
+    parser.add_argument(
+        "--out-dir", type=Path,
+        help="default: app/public/curriculum with --database-url, else .pipeline-cache/bundles",
+    )
+    parser.add_argument("--verify", action="store_true", help="re-read the written bundle and compare with the summary")
+    parser.add_argument("--check", action="store_true", help="compare the existing bundle with the source, write nothing")
+    args = parser.parse_args()
+
+    if args.database_url:
+        summary, version = load_database_summary(args.database_url, args.curriculum_id)
+    else:
+        catalog, _ = build_catalog(DATA_DIR / args.curriculum_id, args.curriculum_id)
+        summary = build_summary(catalog)
+        version = catalog_version(summary)
+    out = bundle_path(args.curriculum_id, args.out_dir or (BUNDLE_DIR if args.database_url else PREVIEW_DIR))
+
+    if args.check:
+        if not out.exists():
+            print(f"No bundle at {out}")
+            return 1
+        bundle = read_bundle(out)
+        if bundle.get("catalog_version") != version:
+            print(f"Stale bundle: {out} has catalog version {bundle.get('catalog_version')}, the source has {version}")
+            return 1
+        if decode_bundle(bundle) != summary:
+            print(f"Stale bundle: {out} decodes to different rows than the source")
+            return 1
+        print(f"{out} matches the source ({len(summary)} units, catalog version {version})")
+        return 0
+
+    size = write_bundle(out, encode_bundle(summary, args.curriculum_id, version))
+    print(f"Wrote {out} ({len(summary)} units, {size} bytes, catalog version {version})")
+
+    if args.verify:
+        if decode_bundle(read_bundle(out)) != summary:
+            print("Round trip mismatch: decoded bundle differs from the summary")
+            return 1
+        print("Round trip OK")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,116 @@
+"""
+Content-hash build cache for the data pipeline scripts.
+
+Each stage keeps a JSON manifest under .pipeline-cache/<stage>.json mapping a
+key (usually one input file) to the SHA-256 of its inputs and the value the
+stage derived from them (parsed records, generated SQL, ...). The stage's own
+source files and every module of the curriculum_pipeline package
+(package_sources) are hashed into the manifest version, so editing a script
+or anything it imports (ids, seed_writer, names, ...) invalidates what it
+cached.
+
+Hashing is skipped when a file's (mtime_ns, size) still matches what was
+recorded, so an unchanged tree costs a stat() per input.
+
+Set CURRICULUM_PIPELINE_NO_CACHE=1 to force a full rebuild.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterable
+
+from .paths import REPO_ROOT
+
+CACHE_DIR = REPO_ROOT / ".pipeline-cache"
+PACKAGE_DIR = Path(__file__).resolve().parent
+NO_CACHE_ENV = "CURRICULUM_PIPELINE_NO_CACHE"
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 hex digest of a file's bytes."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def package_sources() -> list[Path]:
+    """Every module of the curriculum_pipeline package, in a stable order."""
+    return sorted(PACKAGE_DIR.glob("*.py"))
+
+
+def code_version(*paths: Path) -> str:
+    """Combined digest of the source files that produce a stage's output."""
+    h = hashlib.sha256()
+    for path in paths:
+        h.update(file_digest(path).encode())
+    return h.hexdigest()
+
+
+class BuildCache:
+    """Per-stage manifest of input digests -> cached value."""
+
+    def __init__(self, stage: str, version: str, root: Path = CACHE_DIR):
+        self.path = root / f"{stage}.json"
+        self.version = version
+        self.enabled = not os.environ.get(NO_CACHE_ENV)
+        self._entries: dict[str, dict] = {}
+        self._dirty = False
+        if self.enabled and self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                data = {}
+            if data.get("version") == version:
+                self._entries = data.get("entries", {})
+        # Stat fingerprints from the previous run, so unchanged files are not re-hashed
+        self._known = {
+            p: info for entry in self._entries.values() for p, info in entry["inputs"].items()
+        }
+
+    def _fingerprint(self, path: Path) -> dict:
+        st = path.stat()
+        key = str(path.resolve())
+        known = self._known.get(key)
+        if known and known["mtime_ns"] == st.st_mtime_ns and known["size"] == st.st_size:
+            return known
+        info = {"sha256": file_digest(path), "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+        self._known[key] = info
+        return info
+
+    def get(self, key: str, inputs: Iterable[Path], outputs: Iterable[Path] = ()) -> Any | None:
+        """Cached value for key if every input is unchanged and every output still exists."""
+        if not self.enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if any(not Path(p).exists() for p in outputs):
+            return None
+        inputs = list(inputs)
+        if len(inputs) != len(entry["inputs"]):
+            return None
+        for path in inputs:
+            recorded = entry["inputs"].get(str(path.resolve()))
+            if recorded is None or recorded["sha256"] != self._fingerprint(path)["sha256"]:
+                return None
+        return entry["value"]
+
+    def put(self, key: str, inputs: Iterable[Path], value: Any) -> None:
+        self._entries[key] = {
+            "inputs": {str(p.resolve()): self._fingerprint(p) for p in inputs},
+            "value": value,
+        }
+        self._dirty = True
+
+    def save(self) -> None:
+        if not self.enabled or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": self.version, "entries": self._entries}), encoding="utf-8")
+        tmp.replace(self.path)
+        self._dirty = False
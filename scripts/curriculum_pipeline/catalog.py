@@ -0,0 +1,319 @@
+"""
+Seedable curriculum rows for one provider, built from its data files.
+
+A catalog maps each seeded table to a list of row dicts holding *stored*
+column values (what lands in Postgres), with the deterministic ids from
+curriculum_pipeline.ids. Loaded rows keep the ids the database gave them
+(gen_random_uuid() for the historical seeds, and saved plans refer to those),
+so SQL that touches existing rows matches them on NATURAL_KEYS instead
+(render_seed). The seed generators render these rows; the diff tool compares
+them against a previous snapshot.
+
+Sources (relative to data/<provider>/):
+  unit_subcategory_hours.csv                     -> unit_subcategory_hours
+  optional-entries-by-type/required-reading.json -> unit_option_groups / unit_option_choices
+  optional-entries-by-type/labs.json             -> unit_optional_items (type "Optional Lab")
+"""
+
+import csv
+import json
+import re
+from pathlib import Path
+
+from .ids import hours_row_id, option_choice_id, option_group_id, optional_item_id
+from .names import NameIndex, TextBlocks, name_key
+from .seed_writer import ParentRef, render_copy, render_merge
+
+HOURS_TABLE = "unit_subcategory_hours"
+GROUPS_TABLE = "unit_option_groups"
+CHOICES_TABLE = "unit_option_choices"
+ITEMS_TABLE = "unit_optional_items"
+
+# Parents before children: inserts run in this order, deletes in reverse
+TABLES = (HOURS_TABLE, GROUPS_TABLE, CHOICES_TABLE, ITEMS_TABLE)
+
+COLUMNS = {
+    HOURS_TABLE: ("id", "unit", "category", "subcategory", "hours", "curriculum_id"),
+    GROUPS_TABLE: ("id", "unit", "category", "label", "note", "curriculum_id"),
+    CHOICES_TABLE: ("id", "option_group_id", "subcategory", "hours", "recommended_books", "curriculum_id"),
+    ITEMS_TABLE: ("id", "unit", "category", "subcategory", "hours", "description", "curriculum_id", "type"),
+}
+
+CASTS = {"id": "uuid", "option_group_id": "uuid", "recommended_books": "jsonb"}
+# Column types for render_merge's VALUES text
+TYPES = {**CASTS, "hours": "numeric"}
+
+# What identifies a row in the live tables; hours use the table's UNIQUE constraint
+NATURAL_KEYS = {
+    HOURS_TABLE: ("unit", "category", "subcategory"),
+    GROUPS_TABLE: ("curriculum_id", "unit", "category", "label"),
+    CHOICES_TABLE: ("option_group_id", "subcategory"),
+    ITEMS_TABLE: ("curriculum_id", "unit", "category", "subcategory", "type", "description"),
+}
+# Choices reach their group through the group's natural key, not its id
+PARENTS = {CHOICES_TABLE: ParentRef("option_group_id", GROUPS_TABLE, NATURAL_KEYS[GROUPS_TABLE])}
+
+REQUIRED_READING_LABEL = "Required Reading"
+LAB_ITEM_TYPE = "Optional Lab"
+
+Catalog = dict[str, list[dict]]
+
+
+def stored_text(value) -> str:
+    """
+    Text as the historical sql_escape()d literals stored it (backslashes
+    doubled), so every output format seeds identical rows.
+    """
+    if value is None:
+        return ""
+    return str(value).replace("\\", "\\\\")
+
+
+def read_hours_csv(csv_path: Path) -> list[dict]:
+    """unit_subcategory_hours.csv rows, first occurrence per (unit, category, subcategory)."""
+    seen = set()
+    rows = []
+    with open(csv_path, "r", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            key = (row["unit"], row["category"], row["subcategory"])
+            if key in seen:
+                continue
+            seen.add(key)
+            rows.append(row)
+    return rows
+
+
+def hours_rows(csv_rows: list[dict], curriculum_id: str) -> list[dict]:
+    return [
+        {
+            "id": hours_row_id(curriculum_id, r["unit"], r["category"], r["subcategory"]),
+            "unit": r["unit"],
+            "category": r["category"],
+            "subcategory": r["subcategory"],
+            "hours": float(r["hours"]),
+            "curriculum_id": curriculum_id,
+        }
+        for r in csv_rows
+    ]
+
+
+def recommended_books_json(books_text: str) -> str:
+    """
+    JSON text for the recommended_books column: one string per non-blank line,
+    the shape migration 20260204170000 (transform_recommended_books.py) left
+    the column in.
+    """
+    lines = (books_text or "").replace("\\n", "\n").split("\n")
+    return json.dumps([line.strip() for line in lines if line.strip()], ensure_ascii=False)
+
+
+def unit_index(csv_rows: list[dict]) -> NameIndex:
+    """Canonical (hours CSV) unit spellings."""
+    return NameIndex(row["unit"] for row in csv_rows)
+
+
+def required_reading_rows(
+    entries: list[dict], curriculum_id: str, units: NameIndex | None = None
+) -> tuple[list[dict], list[dict]]:
+    """
+    (option groups, option choices) for required-reading.json entries. With
+    units, entry unit names are resolved to their canonical spelling.
+    """
+    groups = []
+    choices = []
+    for e in entries:
+        unit = stored_text((units.resolve(e["unit"]) if units else None) or e["unit"])
+        group_id = option_group_id(curriculum_id, unit, "Language Arts", REQUIRED_READING_LABEL)
+        note = (e.get("body") or "").replace("\n", "\\n")
+        groups.append({
+            "id": group_id,
+            "unit": unit,
+            "category": "Language Arts",
+            "label": REQUIRED_READING_LABEL,
+            "note": stored_text(note),
+            "curriculum_id": curriculum_id,
+        })
+        hours_val = e.get("hours")
+        for subcat, books_text in e.get("options") or []:
+            subcategory = stored_text(subcat)
+            choices.append({
+                "id": option_choice_id(curriculum_id, group_id, subcategory),
+                "option_group_id": group_id,
+                "subcategory": subcategory,
+                "hours": float(hours_val) if hours_val is not None else None,
+                "recommended_books": recommended_books_json(books_text),
+                "curriculum_id": curriculum_id,
+            })
+    return groups, choices
+
+
+def split_blocks(body: str) -> list[str]:
+    if not body:
+        return []
+    normalized = body.strip().replace("\r\n", "\n")
+    blocks = re.split(r"\n\s*\n", normalized)
+    return [block.strip() for block in blocks if block.strip()]
+
+
+def lab_item_rows(
+    entries: list[dict], csv_rows: list[dict], curriculum_id: str, units: NameIndex | None = None
+) -> tuple[list[dict], list[str]]:
+    """(optional item rows, skip warnings) for labs.json entries, matched against the hours rows."""
+    units = units if units is not None else unit_index(csv_rows)
+    unit_map: dict[str, dict[str, object]] = {}
+    for row in csv_rows:
+        sub_key = name_key(row["subcategory"])
+        category_key = name_key(row["category"])
+        entry = unit_map.setdefault(
+            name_key(row["unit"]), {"canonical": row["unit"], "subs": {}, "categories": {}}
+        )
+        entry["subs"][sub_key] = {
+            "category": row["category"],
+            "subcategory": row["subcategory"],
+        }
+        entry["categories"][category_key] = row["category"]
+
+    items: list[dict] = []
+    warnings: list[str] = []
+
+    for entry in entries:
+        options = entry.get("options")
+        if not options:
+            warnings.append(f"Skip {entry.get('unit')} ({entry.get('type')}): no options")
+            continue
+
+        canonical = units.resolve(entry["unit"])
+        unit_entry = unit_map.get(name_key(canonical)) if canonical else None
+        if not unit_entry:
+            warnings.append(f"Skip {entry.get('unit')} ({entry.get('type')}): unit not found")
+            continue
+
+        canonical_unit = unit_entry["canonical"]
+        subs = unit_entry["subs"]
+        categories = unit_entry["categories"]
+
+        blocks = TextBlocks(split_blocks(entry.get("body") or ""))
+
+        for index, option in enumerate(options):
+            if not isinstance(option, list) or len(option) < 2:
+                warnings.append(f"Skip {entry.get('unit')} ({entry.get('type')}): invalid option")
+                continue
+            sub_key = name_key(option[1])
+            sub_entry = subs.get(sub_key)
+            if sub_entry:
+                category = sub_entry["category"]
+                subcategory = sub_entry["subcategory"]
+            else:
+                category_match = categories.get(sub_key)
+                if not category_match:
+                    warnings.append(
+                        f"Skip {entry.get('unit')} ({entry.get('type')}): subcategory {option[1]!r} not found"
+                    )
+                    continue
+                category = category_match
+                subcategory = category_match
+
+            hours = entry.get("hours")
+            try:
+                hours_val = float(hours)
+            except (TypeError, ValueError):
+                warnings.append(
+                    f"Skip {entry.get('unit')} ({entry.get('type')}): invalid hours"
+                )
+                continue
+
+            option_label = option[0] if option else ""
+            block = blocks.pick(str(option_label), index)
+            if option_label and name_key(option_label) not in name_key(block):
+                description = f"{option_label}: {block}"
+            else:
+                description = block
+            description = stored_text(description.replace("\n", "\\n"))
+
+            unit = stored_text(canonical_unit)
+            category = stored_text(category)
+            subcategory = stored_text(subcategory)
+            items.append({
+                "id": optional_item_id(curriculum_id, unit, category, subcategory, LAB_ITEM_TYPE, description),
+                "unit": unit,
+                "category": category,
+                "subcategory": subcategory,
+                "hours": hours_val,
+                "description": description,
+                "curriculum_id": curriculum_id,
+                "type": LAB_ITEM_TYPE,
+            })
+
+    return items, warnings
+
+
+def build_catalog(provider_dir: Path, curriculum_id: str | None = None) -> tuple[Catalog, list[str]]:
+    """All seedable rows for a provider directory, plus lab-matching warnings."""
+    curriculum_id = curriculum_id or provider_dir.name
+    by_type = provider_dir / "optional-entries-by-type"
+    csv_rows = read_hours_csv(provider_dir / "unit_subcategory_hours.csv")
+
+    catalog: Catalog = {table: [] for table in TABLES}
+    catalog[HOURS_TABLE] = hours_rows(csv_rows, curriculum_id)
+    warnings: list[str] = []
+    units = unit_index(csv_rows)
+
+    reading_path = by_type / "required-reading.json"
+    if reading_path.exists():
+        entries = json.loads(reading_path.read_text(encoding="utf-8"))
+        catalog[GROUPS_TABLE], catalog[CHOICES_TABLE] = required_reading_rows(entries, curriculum_id, units)
+
+    labs_path = by_type / "labs.json"
+    if labs_path.exists():
+        entries = json.loads(labs_path.read_text(encoding="utf-8"))
+        catalog[ITEMS_TABLE], warnings = lab_item_rows(entries, csv_rows, curriculum_id, units)
+
+    warnings.extend(f"unit name {line}" for line in units.report())
+    return catalog, warnings
+
+
+def row_values(table: str, row: dict) -> tuple:
+    """Row dict -> tuple in COLUMNS[table] order (for seed_writer)."""
+    return tuple(row[c] for c in COLUMNS[table])
+
+
+def natural_key(table: str, row: dict, groups_by_id: dict[str, dict] | None = None) -> tuple:
+    """
+    NATURAL_KEYS values of a row. A choice's group is spelled out by the
+    group's own natural key (looked up in groups_by_id), since group ids differ
+    between the catalog and the database.
+    """
+    parent = PARENTS.get(table)
+    out = []
+    for column in NATURAL_KEYS[table]:
+        if parent and column == parent.column:
+            out.extend(natural_key(parent.table, groups_by_id[row[column]]))
+        else:
+            out.append(row[column])
+    return tuple(out)
+
+
+def render_seed(fmt: str, table: str, rows: list[dict], groups: list[dict] = ()) -> str:
+    """
+    Seed SQL for catalog rows of one table. bulk merges on NATURAL_KEYS and
+    lets the table assign ids to new rows, so it can be applied to a loaded
+    database; copy loads the catalog ids as-is and needs empty tables. Choices
+    need their groups to name them by natural key.
+    """
+    if fmt == "copy":
+        return render_copy(table, COLUMNS[table], [row_values(table, r) for r in rows])
+    if fmt != "bulk":
+        raise ValueError(f"Unsupported bulk format: {fmt!r}")
+    parent = PARENTS.get(table)
+    groups_by_id = {g["id"]: g for g in groups}
+    columns = COLUMNS[table][1:]  # without id
+    values = []
+    for r in rows:
+        row = []
+        for column in columns:
+            if parent and column == parent.column:
+                row.extend(groups_by_id[r[column]][k] for k in parent.key)
+            else:
+                row.append(r[column])
+        values.append(tuple(row))
+    return render_merge(table, columns, values, NATURAL_KEYS[table], TYPES, parent)
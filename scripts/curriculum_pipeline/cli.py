@@ -0,0 +1,123 @@
+"""
+curriculum-pipeline: one entry point for the pipeline modules and scripts.
+
+    python -m curriculum_pipeline <command> [args...]    (from scripts/)
+    scripts/curriculum-pipeline <command> [args...]      (from anywhere)
+
+Commands are resolved by name and their module (or script) is only imported
+when that command runs, so `--help` and unrelated commands do not pay for
+catalog/ingest imports, and optional clients (supabase, psycopg) are only
+loaded by the commands that use them. This module itself imports nothing
+beyond os and sys; `startup-check` keeps it that way.
+"""
+
+import os
+import sys
+
+_SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_DATA_DIR = os.path.join(os.path.dirname(_SCRIPTS_DIR), "data")
+
+
+class Command:
+    """A subcommand: a module in this package (".name") or a script path under scripts/."""
+
+    __slots__ = ("target", "help", "cwd", "probe")
+
+    def __init__(self, target: str, help: str, cwd: str | None = None, probe: bool = True) -> None:
+        self.target = target
+        self.help = help
+        self.cwd = cwd  # directory to run in (for scripts that use relative paths)
+        self.probe = probe  # accepts --help, so startup-check may run it
+
+
+COMMANDS = {
+    "run": Command(".pipeline", "run pipeline stages as a dependency graph"),
+    "ingest": Command(".ingest", "ingest one provider's year sheets"),
+    "ingest-all": Command(".runner", "ingest every provider under data/ in parallel"),
+    "parse": Command(
+        "oneoff/gatherround/parse_curriculum.py", "write gatherround unit_subcategory_hours.csv",
+        cwd=os.path.join(_DATA_DIR, "gatherround"), probe=False,
+    ),
+    "entries": Command(
+        "oneoff/parse_optional_entries.py", "re-extract optional entries (overwrites annotations)", probe=False,
+    ),
+    "split": Command(
+        "oneoff/split_optional_entries_by_type.py", "split optional entries into by-type files", probe=False,
+    ),
+    "validate": Command(".validate", "check hours against sheet TOTALS, duplicate keys and option choices"),
+    "seed-hours": Command("generate_seed_sql.py", "unit_subcategory_hours seed SQL"),
+    "seed-labs": Command("oneoff/generate_optional_labs_seed.py", "optional labs seed SQL"),
+    "seed-required-reading": Command("oneoff/generate_required_reading_seed.py", "required-reading seed SQL"),
+    "diff": Command(".diff", "minimal upsert/delete migration against a snapshot"),
+    "matrix": Command(".matrix", "load year sheets as hours matrices and cross-check TOTALS"),
+    "summary": Command(".summary", "per-unit hours summary JSON"),
+    "bundle": Command(".bundle", "columnar curriculum bundle for the app"),
+    "credits": Command(".credits", "credits per year/category for stored plans; list plans that fall short"),
+    "optimize": Command(".optimize", "assign units to years to meet credit targets with an even load"),
+    "migrate-plans": Command(".migrate_plans", "normalize stored plans and remap renamed units in bulk"),
+    "serve": Command(".serve", "serve curriculum tables with the PostgREST query subset the app uses"),
+    "names": Command(".names", "report how unit names resolve"),
+    "bench": Command(".bench", "benchmark pipeline stages on synthetic data"),
+    "bench-labels": Command(".bench_labels", "benchmark type-label classification"),
+    "bench-optimize": Command(".bench_optimize", "benchmark the year optimizer on synthetic catalogs"),
+    "bench-serve": Command(".bench_serve", "load-test curriculum reads with the app's query fan-out"),
+    "transform-books": Command("transform_recommended_books.py", "rewrite recommended_books as string arrays"),
+    "startup-check": Command(".startup", "check command start-up import time against a budget"),
+}
+
+PROG = "curriculum-pipeline"
+
+
+def usage() -> str:
+    width = max(len(name) for name in COMMANDS)
+    lines = [f"usage: {PROG} <command> [args...]", "", "commands:"]
+    lines += [f"  {name:<{width}}  {cmd.help}" for name, cmd in COMMANDS.items()]
+    lines += ["", f"Run `{PROG} <command> --help` for a command's options."]
+    return "\n".join(lines)
+
+
+def dispatch(argv: list[str]) -> int:
+    """Run one command in this process; returns its exit status."""
+    name, args = argv[0], argv[1:]
+    cmd = COMMANDS[name]
+    saved_argv, saved_cwd = sys.argv, os.getcwd()
+    sys.argv = [f"{PROG} {name}", *args]
+    if cmd.cwd:
+        os.chdir(cmd.cwd)
+    try:
+        if cmd.target.startswith("."):
+            import importlib
+
+            module = importlib.import_module(cmd.target, __package__)
+            status = module.main()
+        else:
+            import runpy
+
+            runpy.run_path(os.path.join(_SCRIPTS_DIR, cmd.target), run_name="__main__")
+            status = 0
+    except SystemExit as e:
+        status = e.code
+    finally:
+        sys.argv = saved_argv
+        os.chdir(saved_cwd)
+    if status is None:
+        return 0
+    if isinstance(status, int):
+        return status
+    print(status, file=sys.stderr)
+    return 1
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0 if argv else 2
+    if argv[0] not in COMMANDS:
+        print(f"{PROG}: unknown command {argv[0]!r}\n\n{usage()}", file=sys.stderr)
+        return 2
+    return dispatch(argv)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+"""
+Credits for stored plans (planner_plans.data), computed in bulk.
+
+Follows the planner's tally (useCurriculum's effective breakdown and
+TallyBar): a unit counts only if it is in the plan's curriculumUnits, and its
+hours are its base rows, one choice per option group (the chosen subcategory,
+else the max-hours default; optionGroupHoursOverride replaces the hours) and
+its included optional items (optionalItemHoursOverride replaces theirs).
+Credits are hours / the plan's hoursPerCredit.
+
+Plans are evaluated together: assignments become one (plans x units) year
+array, hours per (plan, year, category) are four matrix products against the
+curriculum's default (units x categories) hours, and only choices and items
+that differ from the default are added afterwards as sparse corrections.
+Category minimums (--category-min) apply to the app's rolled-up categories
+(rollupCategory in app/src/components/categoryUtils.ts).
+
+Plans come from a JSON export ([{"id", "name", "data"}, ...]), Postgres
+(--database-url, needs `pip install psycopg`) or --synthetic N random plans.
+
+Stored plans key option choices, included items and hours overrides by the
+database's option-group and optional-item ids, so the curriculum must come
+from the database too: unit_hours_summary over the same connection with
+--database-url, or --summary exports of it (a JSON list of its rows, or a
+bundle from `bundle --database-url`). Catalogs built from data/ have other
+ids and only serve --synthetic plans, which are generated from them. Ids a
+plan uses that the curriculum does not have are counted in the report
+instead of being dropped silently.
+
+Usage (from scripts/):
+    python -m curriculum_pipeline.credits --from-json plans.json --summary summary.json [--category-min Science=3 ...]
+    python -m curriculum_pipeline.credits --database-url URL [--out report.json]
+    python -m curriculum_pipeline.credits --synthetic 5000
+"""
+
+import argparse
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+
+from .plan_data import YEARS, normalize_plan_data
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# app/src/components/categoryUtils.ts CATEGORY_ROLLUPS
+CATEGORY_ROLLUPS = {
+    "Language Arts Electives": "Language Arts",
+    "Math Electives": "Math",
+    "Physical Science": "Science",
+    "Life Science": "Science",
+    "Earth Science": "Science",
+    "Science Electives": "Science",
+    "History": "Social Sciences",
+    "Social Science Electives": "Social Sciences",
+    "Electives": "General Electives",
+}
+
+# Credits are compared after summing in a different order than the browser does
+EPSILON = 1e-9
+
+# Kinds of plan ids that may not resolve against the curriculum
+UNRESOLVED_GROUPS = "option_groups"
+UNRESOLVED_ITEMS = "optional_items"
+UNRESOLVED_SAMPLE = 10
+
+
+def rollup_category(category: str) -> str:
+    return CATEGORY_ROLLUPS.get(category, category)
+
+
+def _js_truthy(value: Any) -> bool:
+    return value not in (None, False, 0, "") if not isinstance(value, (list, dict)) else True
+
+
+def _hours(value: Any) -> float | None:
+    """A stored hours override, or None when the app would fall back to the default."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return None
+
+
+@dataclass(frozen=True)
+class Group:
+    row: int  # unit row in CurriculumModel
+    category: int
+    default_hours: float  # hours of the max-hours choice
+    choices: dict[str, float]  # subcategory -> hours (None counts as 0)
+
+
+@dataclass(frozen=True)
+class Item:
+    row: int
+    category: int
+    hours: float
+
+
+@dataclass(frozen=True, eq=False)
+class CurriculumModel:
+    """Unit summaries (curriculum_pipeline.summary) as arrays: one row per (curriculum_id, unit)."""
+
+    rows: dict[tuple[str, str], int]
+    categories: tuple[str, ...]
+    default_hours: "np.ndarray"  # (units, categories): base rows + default choice per group
+    groups: dict[str, Group]
+    items: dict[str, Item]
+
+    @classmethod
+    def from_summary(cls, summary: Iterable[dict]) -> "CurriculumModel":
+        import numpy as np
+
+        summary = list(summary)
+        categories: dict[str, int] = {}
+
+        def col(category: str) -> int:
+            return categories.setdefault(category, len(categories))
+
+        rows: dict[tuple[str, str], int] = {}
+        cells: list[tuple[int, int, float]] = []
+        groups: dict[str, Group] = {}
+        items: dict[str, Item] = {}
+        for s in summary:
+            row = rows.setdefault((s["curriculum_id"], s["unit"]), len(rows))
+            for r in s["base_rows"]:
+                cells.append((row, col(r["category"]), float(r["hours"])))
+            for g in s["option_groups"]:
+                if not g["choices"]:
+                    continue
+                choices: dict[str, float] = {}
+                for c in g["choices"]:
+                    choices.setdefault(c["subcategory"], float(c["hours"] or 0))
+                default = choices.get(g["default_subcategory"], 0.0)
+                groups[g["id"]] = Group(row, col(g["category"]), default, choices)
+                cells.append((row, col(g["category"]), default))
+            for i in s["optional_items"]:
+                items[i["id"]] = Item(row, col(i["category"]), float(i["hours"]))
+
+        default_hours = np.zeros((len(rows), len(categories)))
+        if cells:
+            r, c, h = zip(*cells)
+            np.add.at(default_hours, (np.array(r), np.array(c)), np.array(h))
+        return cls(rows, tuple(categories), default_hours, groups, items)
+
+    def rollups(self) -> tuple[tuple[str, ...], "np.ndarray"]:
+        """(rolled-up names, (categories x rollups) 0/1 matrix)."""
+        import numpy as np
+
+        names = tuple(dict.fromkeys(rollup_category(c) for c in self.categories))
+        matrix = np.zeros((len(self.categories), len(names)))
+        for i, c in enumerate(self.categories):
+            matrix[i, names.index(rollup_category(c))] = 1.0
+        return names, matrix
+
+
+@dataclass(frozen=True, eq=False)
+class PlanCredits:
+    """Credits for a batch of plans; arrays are indexed by plan first."""
+
+    ids: tuple[str, ...]
+    names: tuple[str, ...]
+    year_hours: "np.ndarray"  # (plans, 4)
+    year_credits: "np.ndarray"  # (plans, 4)
+    total_credits: "np.ndarray"  # (plans,)
+    min_credits: "np.ndarray"  # (plans,)
+    rollups: tuple[str, ...]
+    category_credits: "np.ndarray"  # (plans, rollups)
+    # UNRESOLVED_* -> ids plans chose or included that no unit of theirs has
+    unresolved: dict[str, set[str]] = field(default_factory=dict)
+
+    def short_of_graduation(self) -> "np.ndarray":
+        """Boolean mask of plans under their minCreditsForGraduation."""
+        return self.total_credits + EPSILON < self.min_credits
+
+    def short_of_categories(self, minimums: dict[str, float]) -> dict[str, "np.ndarray"]:
+        """rolled-up category -> mask of plans under its minimum (missing categories count as 0 credits)."""
+        import numpy as np
+
+        out = {}
+        for category, minimum in minimums.items():
+            if category in self.rollups:
+                credits = self.category_credits[:, self.rollups.index(category)]
+            else:
+                credits = np.zeros(len(self.ids))
+            out[category] = credits + EPSILON < minimum
+        return out
+
+    def report(self, minimums: dict[str, float], everything: bool = False) -> list[dict]:
+        """Per-plan JSON rows (only plans that fall short unless everything)."""
+        import numpy as np
+
+        short_total = self.short_of_graduation()
+        short_categories = self.short_of_categories(minimums)
+        any_short = short_total.copy()
+        for mask in short_categories.values():
+            any_short |= mask
+        out = []
+        for p in np.flatnonzero(any_short | everything).tolist():
+            categories = {
+                c: round(float(v), 4) for c, v in zip(self.rollups, self.category_credits[p].tolist()) if v
+            }
+            out.append({
+                "id": self.ids[p],
+                "name": self.names[p],
+                "total_credits": round(float(self.total_credits[p]), 4),
+                "min_credits": float(self.min_credits[p]),
+                "year_credits": {str(y): round(float(c), 4) for y, c in zip(YEARS, self.year_credits[p].tolist())},
+                "category_credits": categories,
+                "short_credits": round(max(0.0, float(self.min_credits[p] - self.total_credits[p])), 4),
+                "short_categories": sorted(c for c, mask in short_categories.items() if mask[p]),
+            })
+        return out
+
+
+def _dict(value: Any) -> dict:
+    return value if isinstance(value, dict) else {}
+
+
+def plan_rows(model: CurriculumModel, data: dict) -> dict[str, int]:
+    """unit -> model row for the units in a normalized plan's curriculumUnits (first curriculum listed wins)."""
+    rows: dict[str, int] = {}
+    for ref in data["curriculumUnits"]:
+        row = model.rows.get((ref["curriculumId"], ref["unit"]))
+        if row is not None and ref["unit"] not in rows:
+            rows[ref["unit"]] = row
+    return rows
+
+
+def unit_adjustments(
+    model: CurriculumModel, data: dict, unit: str, row: int, unresolved: dict[str, set[str]] | None = None
+) -> Iterator[tuple[int, float]]:
+    """
+    (category, hours) to add to the unit's default hours for a normalized
+    plan: chosen or overridden option groups (as a difference from the
+    default choice) and included optional items. Group and item ids the unit
+    does not have are skipped and added to unresolved.
+    """
+    choices = _dict(_dict(data["optionChoices"]).get(unit))
+    group_hours = _dict(_dict(data["optionGroupHoursOverride"]).get(unit))
+    for gid in {*choices, *group_hours}:
+        group = model.groups.get(gid)
+        if group is None or group.row != row:
+            if unresolved is not None:
+                unresolved.setdefault(UNRESOLVED_GROUPS, set()).add(gid)
+            continue
+        chosen = choices.get(gid)
+        hours = group.choices[chosen] if chosen in group.choices else group.default_hours
+        override = _hours(group_hours.get(gid))
+        if override is not None:
+            hours = override
+        if hours != group.default_hours:
+            yield group.category, hours - group.default_hours
+
+    item_hours = _dict(_dict(data["optionalItemHoursOverride"]).get(unit))
+    for iid, flag in _dict(_dict(data["includedOptionalItems"]).get(unit)).items():
+        if not _js_truthy(flag):
+            continue
+        item = model.items.get(iid)
+        if item is None or item.row != row:
+            if unresolved is not None:
+                unresolved.setdefault(UNRESOLVED_ITEMS, set()).add(iid)
+            continue
+        override = _hours(item_hours.get(iid))
+        yield item.category, item.hours if override is None else override
+
+
+def solve(model: CurriculumModel, plans: list[dict]) -> PlanCredits:
+    """
+    Credits for plans ({"id", "name", "data"} rows). Assignments are gathered
+    into one array; option choices and items differing from the default are
+    the only per-plan Python work.
+    """
+    import numpy as np
+
+    n = len(plans)
+    years = np.zeros((n, len(model.rows)), dtype=np.int8)
+    hours_per_credit = np.empty(n)
+    min_credits = np.empty(n)
+    # Sparse (plan, year, category, hours delta) corrections to the default hours
+    fix_p: list[int] = []
+    fix_y: list[int] = []
+    fix_c: list[int] = []
+    fix_h: list[float] = []
+    unresolved: dict[str, set[str]] = {}
+
+    for p, plan in enumerate(plans):
+        data = normalize_plan_data(plan.get("data"))
+        hours_per_credit[p] = data["config"]["hoursPerCredit"]
+        min_credits[p] = data["config"]["minCreditsForGraduation"]
+        rows = plan_rows(model, data)
+        for unit, year in data["assignments"].items():
+            # Years like 2.5 pass the app's normalizer but land in no tally column
+            row = rows.get(unit)
+            if row is None or year not in YEARS:
+                continue
+            year = int(year)
+            years[p, row] = year
+            for category, hours in unit_adjustments(model, data, unit, row, unresolved):
+                fix_p.append(p)
+                fix_y.append(year - 1)
+                fix_c.append(category)
+                fix_h.append(hours)
+
+    hours = np.empty((n, len(YEARS), len(model.categories)))
+    for y in YEARS:
+        hours[:, y - 1, :] = (years == y) @ model.default_hours
+    if fix_p:
+        np.add.at(hours, (np.array(fix_p), np.array(fix_y), np.array(fix_c)), np.array(fix_h))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = np.where(hours_per_credit > 0, 1.0 / hours_per_credit, 0.0)
+    credits = hours * scale[:, None, None]
+    rollups, rollup_matrix = model.rollups()
+    year_credits = credits.sum(axis=2)
+    return PlanCredits(
+        ids=tuple(str(plan.get("id", i)) for i, plan in enumerate(plans)),
+        names=tuple(str(plan.get("name") or "") for plan in plans),
+        year_hours=hours.sum(axis=2),
+        year_credits=year_credits,
+        total_credits=year_credits.sum(axis=1),
+        min_credits=min_credits,
+        rollups=rollups,
+        category_credits=credits.sum(axis=1) @ rollup_matrix,
+        unresolved=unresolved,
+    )
+
+
+def unresolved_report(unresolved: dict[str, set[str]]) -> dict[str, dict]:
+    """UNRESOLVED_* -> {"count", "ids": first UNRESOLVED_SAMPLE ids} for the JSON report."""
+    return {
+        kind: {"count": len(ids), "ids": sorted(ids)[:UNRESOLVED_SAMPLE]}
+        for kind, ids in sorted(unresolved.items())
+    }
+
+
+def read_summary(path: Path) -> list[dict]:
+    """unit_hours_summary rows from a JSON export: a list of rows or a curriculum bundle."""
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(raw, dict):
+        from .bundle import decode_bundle
+
+        try:
+            return decode_bundle(raw)
+        except (KeyError, ValueError) as e:
+            raise SystemExit(f"{path}: not a curriculum bundle ({e})")
+    if not isinstance(raw, list) or not all(isinstance(row, dict) and "unit" in row for row in raw):
+        raise SystemExit(f"{path}: expected a list of unit_hours_summary rows or a curriculum bundle")
+    return raw
+
+
+def database_summary(conn, curriculum_ids: Iterable[str]) -> list[dict]:
+    """unit_hours_summary rows for curriculum_ids, with the database's group and item ids."""
+    cur = conn.execute(
+        "SELECT curriculum_id, unit, base_rows, option_groups, optional_items FROM unit_hours_summary "
+        "WHERE curriculum_id = ANY(%s) ORDER BY curriculum_id, unit",
+        [list(curriculum_ids)],
+    )
+    columns = ("curriculum_id", "unit", "base_rows", "option_groups", "optional_items")
+    return [dict(zip(columns, row)) for row in cur.fetchall()]
+
+
+def load_model(curriculum_ids: Iterable[str], summaries: Iterable[Path] = (), conn=None) -> CurriculumModel:
+    """
+    The curriculum for curriculum_ids from summary exports, else from
+    unit_hours_summary over conn, else built from data/ (whose ids are not
+    the ones stored plans use).
+    """
+    curriculum_ids = list(curriculum_ids)
+    summaries = list(summaries)
+    if summaries:
+        wanted = set(curriculum_ids)
+        summary = [row for path in summaries for row in read_summary(path) if row["curriculum_id"] in wanted]
+    elif conn is not None:
+        summary = database_summary(conn, curriculum_ids)
+    else:
+        from .catalog import build_catalog
+        from .paths import DATA_DIR
+        from .summary import build_summary
+
+        summary = []
+        for curriculum_id in curriculum_ids:
+            provider_dir = DATA_DIR / curriculum_id
+            if not provider_dir.is_dir():
+                raise SystemExit(f"No curriculum data for {curriculum_id!r} ({provider_dir})")
+            catalog, _ = build_catalog(provider_dir, curriculum_id)
+            summary += build_summary(catalog)
+    missing = sorted(set(curriculum_ids) - {row["curriculum_id"] for row in summary})
+    if missing and (summaries or conn is not None):
+        raise SystemExit(f"No unit_hours_summary rows for {', '.join(missing)}")
+    return CurriculumModel.from_summary(summary)
+
+
+def plan_curricula(plans: Iterable[dict]) -> list[str]:
+    """Curriculum ids the plans' curriculumUnits refer to."""
+    return sorted({
+        ref["curriculumId"] for plan in plans for ref in normalize_plan_data(plan.get("data"))["curriculumUnits"]
+    })
+
+
+def fetch_db(conn, page_size: int) -> Iterator[dict]:
+    """planner_plans rows in id order (keyset pages)."""
+    last = None
+    while True:
+        if last is None:
+            cur = conn.execute("SELECT id::text, name, data FROM planner_plans ORDER BY id LIMIT %s", [page_size])
+        else:
+            cur = conn.execute(
+                "SELECT id::text, name, data FROM planner_plans WHERE id > %s ORDER BY id LIMIT %s", [last, page_size]
+            )
+        page = [{"id": pid, "name": name, "data": data} for pid, name, data in cur.fetchall()]
+        yield from page
+        if len(page) < page_size:
+            return
+        last = page[-1]["id"]
+
+
+def _category_minimum(text: str) -> tuple[str, float]:
+    category, sep, value = text.rpartition("=")
+    try:
+        if not sep or not category.strip():
+            raise ValueError
+        return category.strip(), float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected CATEGORY=CREDITS, got {text!r}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compute credits for stored plans and list those that fall short.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--from-json", type=Path, help='JSON export: [{"id", "name", "data"}, ...]')
+    source.add_argument("--database-url", help="read planner_plans from Postgres")
+    source.add_argument("--synthetic", type=int, metavar="N", help="N random plans over the curriculum")
+    parser.add_argument("--curriculum", action="append", help="curriculum ids to load (default: those the plans use)")
+    parser.add_argument(
+        "--summary", action="append", type=Path, default=[], metavar="FILE",
+        help="unit_hours_summary export or database bundle to take the curriculum from (repeatable)",
+    )
+    parser.add_argument(
+        "--category-min", action="append", type=_category_minimum, default=[], metavar="CATEGORY=CREDITS",
+        help="minimum credits for a rolled-up category (repeatable)",
+    )
+    parser.add_argument("--all", action="store_true", help="report every plan, not just those that fall short")
+    parser.add_argument("--json", action="store_true", help="print the JSON report instead of a summary")
+    parser.add_argument("--out", type=Path, help="write the JSON report here")
+    parser.add_argument("--page-size", type=int, default=1000, help="rows per database read")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for --synthetic")
+    args = parser.parse_args()
+    minimums = dict(args.category_min)
+
+    if args.from_json:
+        if not args.summary:
+            parser.error("--from-json needs --summary: plans store database ids, which data/ catalogs do not have")
+        rows = json.loads(args.from_json.read_text(encoding="utf-8"))
+        plans = [row if isinstance(row, dict) and "data" in row else {"id": i, "data": row} for i, row in enumerate(rows)]
+        model = load_model(args.curriculum or plan_curricula(plans), args.summary)
+    elif args.database_url:
+        try:
+            import psycopg
+        except ImportError:
+            raise SystemExit("Install psycopg to read plans from Postgres: pip install psycopg")
+        with psycopg.connect(args.database_url) as conn:
+            plans = list(fetch_db(conn, max(1, args.page_size)))
+            model = load_model(args.curriculum or plan_curricula(plans), args.summary, conn)
+    else:
+        from .synthetic import plan_payloads
+
+        model = load_model(args.curriculum or ["gatherround"], args.summary)
+        plans = plan_payloads(model, args.synthetic, args.seed)
+
+    started = time.perf_counter()
+    result = solve(model, plans)
+    seconds = time.perf_counter() - started
+    rows = result.report(minimums, args.all)
+    report = {
+        "plans": len(plans),
+        "short_of_graduation": int(result.short_of_graduation().sum()),
+        "short_of_categories": {c: int(mask.sum()) for c, mask in result.short_of_categories(minimums).items()},
+        "category_minimums": minimums,
+        "unresolved_ids": unresolved_report(result.unresolved),
+        "results": rows,
+    }
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        args.out.write_text(text + "\n", encoding="utf-8")
+    if args.json:
+        print(text)
+        return 0
+    for row in rows:
+        problems = []
+        if row["short_credits"] > 0:
+            problems.append(f"needs {row['short_credits']:g} more credits")
+        if row["short_categories"]:
+            problems.append(f"under minimum in {', '.join(row['short_categories'])}")
+        label = f"{row['id']} {row['name']!r}" if row["name"] else row["id"]
+        print(f"{label}: {row['total_credits']:.2f} / {row['min_credits']:g} cr{'; ' if problems else ''}{'; '.join(problems)}")
+    print(
+        f"{len(plans)} plans in {seconds * 1000:.1f} ms: {report['short_of_graduation']} short of graduation credits"
+        + "".join(f", {n} short in {c}" for c, n in report["short_of_categories"].items())
+    )
+    for kind, ids in report["unresolved_ids"].items():
+        print(f"  {ids['count']} {kind.replace('_', ' ')} ids in plans match nothing in the curriculum (ignored): "
+              + ", ".join(ids["ids"]) + (" ..." if ids["count"] > len(ids["ids"]) else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Generate a minimal upsert/delete migration instead of a full reseed.
+
+Compares the freshly built catalog (curriculum_pipeline.catalog) with a
+snapshot of what is already loaded and emits only the changed rows:
+DELETEs for rows that disappeared (children first), then one merge per
+table for new and changed rows (parents first). Applying it refreshes
+unit_hours_summary, which gives every curriculum set a new catalog_version;
+export the bundle again afterwards (curriculum_pipeline.bundle
+--database-url). Rows are matched on catalog.NATURAL_KEYS, never on ids: the
+loaded rows have random ids that saved plans refer to, so changed rows are
+updated in place and keep them.
+
+Snapshot sources:
+  manifest (default)  supabase/manifests/<curriculum_id>.json, written by
+                      the previous --write run; it is an error if missing
+  --from-db URL       a Postgres with the catalog loaded (needs
+                      `pip install psycopg`); use it for the first run
+
+Usage (from scripts/):
+    python -m curriculum_pipeline.diff gatherround [--from-db URL] [--write]
+"""
+
+import argparse
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+from .catalog import (
+    CHOICES_TABLE,
+    COLUMNS,
+    GROUPS_TABLE,
+    ITEMS_TABLE,
+    LAB_ITEM_TYPE,
+    NATURAL_KEYS,
+    PARENTS,
+    REQUIRED_READING_LABEL,
+    TABLES,
+    Catalog,
+    build_catalog,
+    natural_key,
+    render_seed,
+)
+from .paths import DATA_DIR, MIGRATIONS_DIR, REPO_ROOT
+from .seed_writer import render_delete
+
+MANIFEST_DIR = REPO_ROOT / "supabase" / "manifests"
+JSON_COLUMNS = {"recommended_books"}
+
+
+@dataclass
+class TableDiff:
+    table: str
+    upserts: list[dict] = field(default_factory=list)
+    inserted: int = 0
+    updated: int = 0
+    deletes: list[tuple] = field(default_factory=list)  # natural keys
+
+    @property
+    def empty(self) -> bool:
+        return not self.upserts and not self.deletes
+
+
+def _comparable(table: str, row: dict) -> tuple:
+    """Column values other than ids (the natural key already covers a choice's group)."""
+    out = []
+    for column in COLUMNS[table]:
+        if column in ("id", "option_group_id"):
+            continue
+        value = row.get(column)
+        if column in JSON_COLUMNS and value is not None:
+            # Compare JSON by value: the DB hands back parsed jsonb, the catalog JSON text
+            parsed = json.loads(value) if isinstance(value, str) else value
+            value = json.dumps(parsed, sort_keys=True, ensure_ascii=False)
+        elif isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+            value = float(value)
+        out.append(value)
+    return tuple(out)
+
+
+def _by_natural_key(catalog: Catalog, table: str) -> dict[tuple, dict]:
+    groups_by_id = {g["id"]: g for g in catalog.get(GROUPS_TABLE, [])}
+    return {natural_key(table, r, groups_by_id): r for r in catalog.get(table, [])}
+
+
+def diff_catalogs(old: Catalog, new: Catalog) -> dict[str, TableDiff]:
+    diffs = {}
+    for table in TABLES:
+        old_rows = _by_natural_key(old, table)
+        new_rows = _by_natural_key(new, table)
+        d = TableDiff(table)
+        for key in sorted(new_rows):
+            row = new_rows[key]
+            previous = old_rows.get(key)
+            if previous is None:
+                d.upserts.append(row)
+                d.inserted += 1
+            elif _comparable(table, previous) != _comparable(table, row):
+                d.upserts.append(row)
+                d.updated += 1
+        d.deletes = sorted(key for key in old_rows if key not in new_rows)
+        diffs[table] = d
+    return diffs
+
+
+def render_migration(diffs: dict[str, TableDiff], catalog: Catalog, curriculum_id: str) -> str:
+    """SQL for diffs against the new catalog (its groups name the choices to merge)."""
+    lines = [f"-- Generated by curriculum_pipeline.diff for {curriculum_id}"]
+    for table in TABLES:
+        d = diffs[table]
+        lines.append(f"-- {table}: +{d.inserted} ~{d.updated} -{len(d.deletes)}")
+    lines.append("")
+
+    for table in reversed(TABLES):
+        if diffs[table].deletes:
+            lines.append(render_delete(table, NATURAL_KEYS[table], diffs[table].deletes, PARENTS.get(table)) + "\n")
+
+    for table in TABLES:
+        if diffs[table].upserts:
+            lines.append(render_seed("bulk", table, diffs[table].upserts, catalog[GROUPS_TABLE]) + "\n")
+
+    return "\n".join(lines).rstrip() + "\n"
+
+
+def manifest_path(curriculum_id: str) -> Path:
+    return MANIFEST_DIR / f"{curriculum_id}.json"
+
+
+def load_manifest(path: Path) -> Catalog:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {table: data.get("tables", {}).get(table, []) for table in TABLES}
+
+
+def write_manifest(path: Path, curriculum_id: str, catalog: Catalog) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tables = {table: sorted(catalog[table], key=lambda r: r["id"]) for table in TABLES}
+    path.write_text(
+        json.dumps({"curriculum_id": curriculum_id, "tables": tables}, indent=1, ensure_ascii=False) + "\n",
+        encoding="utf-8",
+    )
+
+
+def load_database(database_url: str, curriculum_id: str) -> Catalog:
+    """Current rows for curriculum_id, limited to the kinds of rows the catalog generates."""
+    try:
+        import psycopg
+    except ImportError:
+        raise SystemExit("Install psycopg to diff against Postgres: pip install psycopg")
+
+    scopes = {
+        GROUPS_TABLE: ("label = %s", [REQUIRED_READING_LABEL]),
+        CHOICES_TABLE: (
+            f"option_group_id IN (SELECT id FROM {GROUPS_TABLE} WHERE label = %s)",
+            [REQUIRED_READING_LABEL],
+        ),
+        ITEMS_TABLE: ("type = %s", [LAB_ITEM_TYPE]),
+    }
+    out: Catalog = {}
+    with psycopg.connect(database_url) as conn:
+        for table in TABLES:
+            columns = COLUMNS[table]
+            where, params = scopes.get(table, ("true", []))
+            sql = f"SELECT {', '.join(columns)} FROM {table} WHERE curriculum_id = %s AND {where}"
+            rows = conn.execute(sql, [curriculum_id, *params]).fetchall()
+            out[table] = [
+                {c: (str(v) if c in ("id", "option_group_id") else v) for c, v in zip(columns, row)}
+                for row in rows
+            ]
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Emit a minimal curriculum update migration.")
+    parser.add_argument("curriculum_id", help="provider directory under data/, e.g. gatherround")
+    parser.add_argument("--manifest", type=Path, help="snapshot manifest (default: supabase/manifests/<id>.json)")
+    parser.add_argument(
+        "--from-db", "--database-url", dest="database_url", metavar="URL",
+        help="diff against this Postgres instead of the manifest",
+    )
+    parser.add_argument("--name", default="update_curriculum", help="migration name suffix")
+    parser.add_argument("--write", action="store_true", help="write the migration and refresh the manifest")
+    args = parser.parse_args()
+
+    catalog, warnings = build_catalog(DATA_DIR / args.curriculum_id, args.curriculum_id)
+    for msg in warnings:
+        print(f"-- warning: {msg}")
+
+    manifest = args.manifest or manifest_path(args.curriculum_id)
+    if args.database_url:
+        snapshot = load_database(args.database_url, args.curriculum_id)
+    elif manifest.exists():
+        snapshot = load_manifest(manifest)
+    else:
+        raise SystemExit(
+            f"No manifest at {manifest}: diff against the loaded catalog with --from-db URL "
+            "(add --write to record the manifest)"
+        )
+
+    diffs = diff_catalogs(snapshot, catalog)
+    if all(d.empty for d in diffs.values()):
+        print(f"No changes for {args.curriculum_id}")
+        return 0
+
+    sql = render_migration(diffs, catalog, args.curriculum_id)
+    if not args.write:
+        print(sql, end="")
+        return 0
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+    out = MIGRATIONS_DIR / f"{stamp}_{args.name}_{args.curriculum_id}.sql"
+    out.write_text(sql, encoding="utf-8")
+    write_manifest(manifest, args.curriculum_id, catalog)
+    print(f"Wrote {out}")
+    print(f"Updated {manifest}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,44 @@
+"""
+Deterministic row ids for seeded curriculum tables.
+
+Ids are UUIDv5 values derived from a row's natural key, so every build of a
+catalog gives a row the same id: diffs and bundles are stable, choices can
+reference their group without a lookup, and COPY seeds can load an empty
+database with consistent keys. They are not the ids of the rows already
+loaded (those came from gen_random_uuid() and saved plans refer to them), so
+SQL meant for a loaded database matches rows on catalog.NATURAL_KEYS instead.
+
+Key parts are used verbatim (no whitespace normalization) because they must
+match the text stored in the unit/category/subcategory columns.
+"""
+
+import uuid
+
+NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "https://github.com/andinnovate/hs-curriculum-planner/curriculum")
+
+# ASCII unit separator: cannot appear in sheet labels, so keys cannot collide by concatenation
+_SEP = "\x1f"
+
+
+def row_id(table: str, curriculum_id: str, *parts: str) -> str:
+    """UUIDv5 for (table, curriculum_id, *parts)."""
+    return str(uuid.uuid5(NAMESPACE, _SEP.join([table, curriculum_id, *parts])))
+
+
+def hours_row_id(curriculum_id: str, unit: str, category: str, subcategory: str) -> str:
+    return row_id("unit_subcategory_hours", curriculum_id, unit, category, subcategory)
+
+
+def option_group_id(curriculum_id: str, unit: str, category: str, label: str) -> str:
+    return row_id("unit_option_groups", curriculum_id, unit, category, label)
+
+
+def option_choice_id(curriculum_id: str, group_id: str, subcategory: str) -> str:
+    return row_id("unit_option_choices", curriculum_id, group_id, subcategory)
+
+
+def optional_item_id(
+    curriculum_id: str, unit: str, category: str, subcategory: str, item_type: str, description: str
+) -> str:
+    """Items can share a subcategory (e.g. two Physics labs), so the description is part of the key."""
+    return row_id("unit_optional_items", curriculum_id, unit, category, subcategory, item_type, description)
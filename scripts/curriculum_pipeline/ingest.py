@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Single-pass streaming ingest for provider year sheets.
+
+Each "<provider> year N" CSV is read exactly once, row by row, and yields
+HoursRow, OptionalEntry and UnitYear records together. Replaces the separate
+full-file passes in parse_curriculum.py and parse_optional_entries.py.
+Where things sit in a sheet comes from the provider's SheetLayout
+(curriculum_pipeline.layout; data/<provider>/layout.json).
+
+Usage (from scripts/):
+    python -m curriculum_pipeline.ingest ../data/gatherround \
+        [--entries-out PATH] [--plan-out PATH]
+"""
+
+import argparse
+import csv
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .layout import DEFAULT_LAYOUT, SheetLayout, load_layout, normalize_type
+from .records import HoursRow, OptionalEntry, Record, UnitYear
+
+# The Gather Round layout, kept under the names earlier scripts import
+CATEGORIES = DEFAULT_LAYOUT.categories
+CATEGORIES_WITH_HOURS = DEFAULT_LAYOUT.categories_with_hours
+TYPE_PATTERNS = list(DEFAULT_LAYOUT.type_patterns)
+SHEET_NAME_RE = DEFAULT_LAYOUT.sheet_re
+
+
+def normalize_unit_name(s: str) -> str:
+    """Replace newlines with space and strip extra whitespace."""
+    if not s:
+        return ""
+    return " ".join(s.replace("\n", " ").split()).strip()
+
+
+def sheet_label(s: str) -> str:
+    """
+    Row/column label as stored in unit_subcategory_hours (newlines -> spaces,
+    inner spacing kept). Compare labels with names.name_key / NameIndex rather
+    than either spelling.
+    """
+    return s.strip().replace("\n", " ")
+
+
+# Cached classifier for the default layout's type labels (layout.type_classifier)
+classify_type = DEFAULT_LAYOUT.classify_type
+
+
+def is_type_label(cell: str) -> bool:
+    """Return True if cell content is one of our known type labels."""
+    return classify_type(cell) is not None
+
+
+def _is_skipped_row_label(name: str, layout: SheetLayout = DEFAULT_LAYOUT) -> bool:
+    """Rows that are clearly not data (TOTALS, Required Reading, notes in parentheses)."""
+    return layout.is_total(name) or name.startswith(layout.skip_row_prefixes)
+
+
+def iter_sheet(path: Path, year: int, provider: str = "", layout: SheetLayout = DEFAULT_LAYOUT) -> Iterator[Record]:
+    """
+    Stream one year sheet, yielding records in sheet order.
+
+    The layout's header row has unit names in the columns after its label
+    column; category header rows are followed by subcategory rows with hours;
+    the optional section (type label cell with its body in the cell below)
+    follows the TOTALS rows. Only the previous row's pending type labels are
+    buffered, so memory does not grow with the sheet.
+    """
+    label_col = layout.label_column
+    first = label_col + 1  # first unit column
+    categories = layout.categories
+    categories_with_hours = layout.categories_with_hours
+    placeholders = layout.placeholder_cells
+    classify = layout.classify_type
+    is_total = layout.is_total
+
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        for _ in range(layout.header_row):
+            next(reader, None)
+        header = next(reader, None)
+        if not header:
+            return
+
+        # Hours rows keep the sheet's spacing; optional entries use collapsed names
+        # and skip blank/TOTALS columns positionally (matching the published JSON).
+        hour_units = [sheet_label(u) for u in header[first:]]
+        hour_columns = [
+            (first + i, unit) for i, unit in enumerate(hour_units) if not is_total(unit)
+        ]
+        entry_units = [
+            n for n in (normalize_unit_name(u) for u in header[first:]) if n and not is_total(n)
+        ]
+        n_units = len(entry_units)
+
+        seen_units: set[str] = set()
+        current_category: str | None = None
+        # column -> type label waiting for its body in the next row
+        pending: dict[int, str] = {}
+
+        def type_cells(row: list[str]) -> dict[int, str]:
+            """column -> normalized type, each cell classified once."""
+            found = {}
+            for j in range(first, min(len(row), n_units + first)):
+                label = classify(row[j])
+                if label is not None:
+                    found[j] = label
+            return found
+
+        def flush(next_row: list[str], next_types: dict[int, str]) -> Iterator[OptionalEntry]:
+            for j, label in pending.items():
+                # A type label directly below another one is not its body
+                body = next_row[j].strip() if j < len(next_row) and j not in next_types else ""
+                yield OptionalEntry(provider, year, j, entry_units[j - first], label, body)
+
+        pending = type_cells(header)
+
+        for row in reader:
+            types = type_cells(row)
+            yield from flush(row, types)
+            pending = types
+
+            if len(row) <= label_col or not row[label_col].strip():
+                continue
+            name = sheet_label(row[label_col])
+            if _is_skipped_row_label(name, layout):
+                continue
+            if name in categories:
+                current_category = name
+                # For Bible and Physical Education, they ARE the subcategory too
+                if name not in categories_with_hours:
+                    continue
+
+            width = len(row)
+            for col, unit in hour_columns:
+                if col >= width:
+                    break
+                hours_str = row[col].strip()
+                if not hours_str or hours_str in placeholders:
+                    continue
+                try:
+                    hours = float(hours_str)
+                except ValueError:
+                    continue
+                if hours <= 0:
+                    continue
+                if unit not in seen_units:
+                    seen_units.add(unit)
+                    yield UnitYear(provider, year, col, unit)
+                yield HoursRow(provider, year, col, unit, current_category, name, hours)
+
+        yield from flush([], {})
+
+
+def find_year_sheets(provider_dir: Path, layout: SheetLayout = DEFAULT_LAYOUT) -> list[tuple[int, Path]]:
+    """Return [(year, path)] for every "* year N *.csv" sheet (layout.sheet_pattern) in provider_dir, ordered by year."""
+    sheets = []
+    for path in provider_dir.glob("*.csv"):
+        m = layout.sheet_re.search(path.name)
+        if m:
+            sheets.append((int(m.group(1)), path))
+    return sorted(sheets)
+
+
+@dataclass
+class IngestResult:
+    """Records from one or more sheets, split by kind."""
+
+    hours: list[HoursRow] = field(default_factory=list)
+    entries: list[OptionalEntry] = field(default_factory=list)
+    unit_years: list[UnitYear] = field(default_factory=list)
+
+    def add(self, record: Record) -> None:
+        if isinstance(record, HoursRow):
+            self.hours.append(record)
+        elif isinstance(record, OptionalEntry):
+            self.entries.append(record)
+        else:
+            self.unit_years.append(record)
+
+    def extend(self, other: "IngestResult") -> None:
+        self.hours.extend(other.hours)
+        self.entries.extend(other.entries)
+        self.unit_years.extend(other.unit_years)
+
+    def unit_year_map(self) -> dict[str, int]:
+        """unit -> first year with hours (years 1-4 only), as in gatherround-plan.json."""
+        out: dict[str, int] = {}
+        for uy in self.unit_years:
+            if uy.unit not in out and 1 <= uy.year <= 4:
+                out[uy.unit] = uy.year
+        return out
+
+    def unit_order_by_year(self) -> dict[str, list[str]]:
+        """year -> units assigned to it, in sheet column order (gatherround-plan.json unitOrderByYear)."""
+        assignments = self.unit_year_map()
+        order: dict[str, list[str]] = {}
+        for uy in sorted(self.unit_years, key=lambda uy: (uy.year, uy.column)):
+            if assignments.get(uy.unit) == uy.year:
+                order.setdefault(str(uy.year), []).append(uy.unit)
+        return order
+
+
+def ingest_sheets(
+    sheets: Iterable[tuple[int, Path]], provider: str = "", layout: SheetLayout = DEFAULT_LAYOUT
+) -> IngestResult:
+    """Stream every sheet once and collect the records."""
+    result = IngestResult()
+    for year, path in sheets:
+        for record in iter_sheet(path, year, provider, layout):
+            result.add(record)
+    return result
+
+
+def write_hours_csv(rows: Iterable[HoursRow], path: Path) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["year", "unit", "category", "subcategory", "hours"])
+        for row in rows:
+            writer.writerow(row.as_csv_row())
+
+
+def write_entries_json(entries: Iterable[OptionalEntry], path: Path) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([e.as_dict() for e in entries], f, indent=2, ensure_ascii=False)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Ingest provider year sheets in one pass.")
+    parser.add_argument("provider_dir", type=Path, help="e.g. data/gatherround")
+    parser.add_argument("--hours-out", type=Path, help="default: <provider_dir>/unit_subcategory_hours.csv")
+    parser.add_argument("--entries-out", type=Path, help="write raw optional entries JSON here")
+    parser.add_argument("--plan-out", type=Path, help="write unit->year JSON here")
+    args = parser.parse_args()
+
+    provider_dir = args.provider_dir.resolve()
+    try:
+        layout = load_layout(provider_dir)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    sheets = find_year_sheets(provider_dir, layout)
+    if not sheets:
+        raise SystemExit(f"No year sheets found in {provider_dir}")
+
+    result = ingest_sheets(sheets, provider_dir.name, layout)
+
+    hours_out = args.hours_out or provider_dir / "unit_subcategory_hours.csv"
+    write_hours_csv(result.hours, hours_out)
+    print(f"Wrote {len(result.hours)} hours rows to {hours_out}")
+    if args.entries_out:
+        write_entries_json(result.entries, args.entries_out)
+        print(f"Wrote {len(result.entries)} optional entries to {args.entries_out}")
+    if args.plan_out:
+        unit_years = result.unit_year_map()
+        args.plan_out.write_text(json.dumps(unit_years, indent=2), encoding="utf-8")
+        print(f"Wrote {len(unit_years)} unit->year entries to {args.plan_out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,217 @@
+"""
+Timing and profiling spans for the pipeline scripts, emitted as JSON lines.
+
+Wrap a script's work in session() and each stage (or sheet) in span():
+
+    with instrument.session("parse_curriculum"):
+        for year, path in sheets:
+            with instrument.span("sheet", sheet=path.name, year=year) as s:
+                rows = ...
+                s.rows = len(rows)
+
+Every finished span writes one line:
+
+    {"event": "span", "run": "...", "script": "parse_curriculum",
+     "span": "parse_curriculum/sheet", "depth": 1, "wall_ms": 12.3,
+     "cpu_ms": 11.9, "rows": 412, "status": "ok", "sheet": "...", "year": 1}
+
+plus "alloc_kb" / "alloc_peak_kb" when tracemalloc is on. Nothing is
+recorded unless a trace sink is configured, so spans cost a couple of clock
+reads when tracing is off.
+
+Configuration (flags from add_arguments() override the environment):
+  CURRICULUM_PIPELINE_TRACE=PATH          append JSON lines to PATH ("-" = stderr)
+  CURRICULUM_PIPELINE_TRACEMALLOC=1       record allocations per span
+  CURRICULUM_PIPELINE_PROFILE=PATH        dump cProfile stats for the session to PATH
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, TextIO
+
+TRACE_ENV = "CURRICULUM_PIPELINE_TRACE"
+TRACEMALLOC_ENV = "CURRICULUM_PIPELINE_TRACEMALLOC"
+PROFILE_ENV = "CURRICULUM_PIPELINE_PROFILE"
+
+
+class Span:
+    """An open span; set .rows or extra fields with set() before it closes."""
+
+    __slots__ = ("name", "path", "depth", "fields", "rows", "peak_seen")
+
+    def __init__(self, name: str, path: str, depth: int, fields: dict) -> None:
+        self.name = name
+        self.path = path
+        self.depth = depth
+        self.fields = fields
+        self.rows: int | None = None
+        self.peak_seen = 0
+
+    def set(self, **fields) -> None:
+        self.fields.update(fields)
+
+
+class Tracer:
+    def __init__(self, script: str, sink: TextIO | None = None, trace_malloc: bool = False) -> None:
+        self.script = script
+        self.sink = sink
+        self.trace_malloc = trace_malloc
+        self.run = os.urandom(6).hex()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def enabled(self) -> bool:
+        return self.sink is not None
+
+    def _stack(self) -> list[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def emit(self, event: str, **fields) -> None:
+        if self.sink is None:
+            return
+        record = {"event": event, "ts": round(time.time(), 3), "run": self.run, "script": self.script, **fields}
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self.sink.write(line + "\n")
+            self.sink.flush()
+
+    @contextmanager
+    def span(self, name: str, **fields) -> Iterator[Span]:
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        s = Span(name, f"{parent.path}/{name}" if parent else name, len(stack), fields)
+        if not self.enabled:
+            yield s
+            return
+
+        tracemalloc = _tracemalloc() if self.trace_malloc else None
+        tracing = tracemalloc is not None and tracemalloc.is_tracing()
+        if tracing:
+            start_mem = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        stack.append(s)
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        status, error = "ok", None
+        try:
+            yield s
+        except BaseException as e:
+            status, error = "error", f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            stack.pop()
+            out = {
+                "span": s.path,
+                "depth": s.depth,
+                "wall_ms": round(wall * 1000, 3),
+                "cpu_ms": round(cpu * 1000, 3),
+                "rows": s.rows,
+                "status": status,
+            }
+            if s.rows is not None and wall > 0:
+                out["rows_per_sec"] = round(s.rows / wall, 1)
+            if tracing:
+                current, peak = tracemalloc.get_traced_memory()
+                # reset_peak() in child spans hides their peak from us; they report it back
+                peak = max(peak, s.peak_seen)
+                if parent is not None:
+                    parent.peak_seen = max(parent.peak_seen, peak)
+                out["alloc_kb"] = round((current - start_mem) / 1024, 1)
+                out["alloc_peak_kb"] = round((peak - start_mem) / 1024, 1)
+            if error:
+                out["error"] = error
+            self.emit("span", **out, **s.fields)
+
+
+_tracer = Tracer("")
+
+
+def _tracemalloc():
+    # Imported on demand so scripts that never trace do not load it at start-up
+    import tracemalloc
+
+    return tracemalloc
+
+
+def tracer() -> Tracer:
+    return _tracer
+
+
+def span(name: str, **fields):
+    """Span on the current session's tracer (a no-op outside a traced session)."""
+    return _tracer.span(name, **fields)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group("instrumentation")
+    group.add_argument("--trace", metavar="PATH", help=f"append JSON-lines spans to PATH, - for stderr (env {TRACE_ENV})")
+    group.add_argument("--trace-malloc", action="store_true", help=f"record allocations per span (env {TRACEMALLOC_ENV})")
+    group.add_argument("--profile", metavar="PATH", help=f"write cProfile stats to PATH (env {PROFILE_ENV})")
+
+
+def _open_sink(target: str | None) -> TextIO | None:
+    if not target:
+        return None
+    if target == "-":
+        return sys.stderr
+    path = Path(target)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return open(path, "a", encoding="utf-8")
+
+
+@contextmanager
+def session(
+    script: str,
+    args: argparse.Namespace | None = None,
+    **fields,
+) -> Iterator[Span]:
+    """
+    Configure tracing for one script run and wrap it in a root span named
+    after the script. args: a namespace from a parser with add_arguments().
+    """
+    global _tracer
+    trace = getattr(args, "trace", None) or os.environ.get(TRACE_ENV)
+    trace_malloc = bool(getattr(args, "trace_malloc", False) or os.environ.get(TRACEMALLOC_ENV))
+    profile_path = getattr(args, "profile", None) or os.environ.get(PROFILE_ENV)
+
+    sink = _open_sink(trace)
+    previous = _tracer
+    _tracer = Tracer(script, sink, trace_malloc)
+    started_tracemalloc = False
+    if sink is not None and trace_malloc and not _tracemalloc().is_tracing():
+        _tracemalloc().start()
+        started_tracemalloc = True
+    profiler = None
+    if profile_path:
+        import cProfile
+
+        profiler = cProfile.Profile()
+
+    try:
+        if profiler:
+            profiler.enable()
+        with _tracer.span(script, argv=sys.argv[1:], **fields) as root:
+            yield root
+    finally:
+        if profiler:
+            profiler.disable()
+            Path(profile_path).parent.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(profile_path)
+            _tracer.emit("profile", path=str(profile_path))
+        if started_tracemalloc:
+            _tracemalloc().stop()
+        if sink is not None and sink is not sys.stderr:
+            sink.close()
+        _tracer = previous
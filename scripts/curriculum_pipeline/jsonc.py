@@ -0,0 +1,142 @@
+"""
+Streaming reader for JSON-with-comments arrays of entries.
+
+gatherround-optional-entries.json is hand-annotated: inline `// ?` notes
+after a brace, and whole entries disabled by commenting every line:
+
+    // {
+    //   "unit": "Chemistry",
+    //   ...
+    // },
+
+iter_entries reads the file line by line and yields one JsoncEntry per array
+element as soon as it closes, so memory is bounded by the largest entry and
+each character is tokenized once. Line (`//`) and block (`/* */`) comments
+are dropped, except that a run of full-line comments at the top level of the
+array that opens with `{` and closes with `}` is parsed as an entry with
+commented=True.
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+# Strings never span lines in JSON, so per-line tokens are complete
+_TOKEN_RE = re.compile(r'"[^"\\\n]*(?:\\.[^"\\\n]*)*"|//.*|/\*|[\[\]{},]|[^"/\[\]{},]+|.', re.S)
+# Inside an entry, a line without these cannot open/close anything or hold a comment
+_SIGNIFICANT_RE = re.compile(r"[/\[\]{}]")
+
+
+@dataclass(frozen=True)
+class JsoncEntry:
+    value: object
+    commented: bool
+    line: int  # 1-based line where the entry starts
+
+
+def _uncomment(token: str) -> str:
+    """Text after `//` and one optional space, like an editor's toggle-comment."""
+    text = token[2:]
+    if text.startswith(" "):
+        text = text[1:]
+    return text.rstrip()
+
+
+def iter_entries(lines: Iterable[str]) -> Iterator[JsoncEntry]:
+    """Yield the elements of a top-level JSONC array (see module docstring)."""
+    depth = 0
+    done = False
+    in_block_comment = False
+    buf: list[str] = []
+    start_line = 0
+    block: list[str] | None = None  # commented-out entry being collected
+    block_line = 0
+
+    def element() -> Iterator[JsoncEntry]:
+        text = "".join(buf).strip()
+        buf.clear()
+        if text:
+            try:
+                yield JsoncEntry(json.loads(text), False, start_line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid entry starting on line {start_line}: {e}") from e
+
+    def commented_entry() -> Iterator[JsoncEntry]:
+        text = "\n".join(block)
+        if text.endswith(","):
+            text = text[:-1]
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError:
+            return  # commented-out prose, not an entry
+        if isinstance(value, dict):
+            yield JsoncEntry(value, True, block_line)
+
+    for lineno, line in enumerate(lines, 1):
+        if depth > 1 and not in_block_comment and not _SIGNIFICANT_RE.search(line):
+            buf.append(line)
+            continue
+        pos = 0
+        if in_block_comment:
+            end = line.find("*/")
+            if end < 0:
+                continue
+            in_block_comment = False
+            pos = end + 2
+
+        while pos < len(line):
+            m = _TOKEN_RE.match(line, pos)
+            tok = m.group()
+            pos = m.end()
+
+            if tok.startswith("//"):
+                if depth == 1 and not "".join(buf).strip():
+                    text = _uncomment(tok)
+                    if block is None and text.lstrip().startswith("{"):
+                        block, block_line = [text], lineno
+                    elif block is not None:
+                        block.append(text)
+                        if text.lstrip().startswith("}"):
+                            yield from commented_entry()
+                            block = None
+                break
+            if tok == "/*":
+                end = line.find("*/", pos)
+                if end < 0:
+                    in_block_comment = True
+                    break
+                pos = end + 2
+                continue
+
+            if tok.isspace():
+                if depth > 1 or buf:
+                    buf.append(tok)
+                continue
+            if done:
+                raise ValueError(f"Unexpected content after the array on line {lineno}")
+            if block is not None:
+                block = None  # an unterminated comment run is not an entry
+
+            if depth == 0:
+                if tok != "[":
+                    raise ValueError(f"Expected a JSON array, found {tok[:20]!r} on line {lineno}")
+                depth = 1
+                continue
+            if depth == 1 and tok in (",", "]"):
+                yield from element()
+                if tok == "]":
+                    depth = 0
+                    done = True
+                continue
+
+            if not buf:
+                start_line = lineno
+            if tok in ("[", "{"):
+                depth += 1
+            elif tok in ("]", "}"):
+                depth -= 1
+            buf.append(tok)
+
+    if not done:
+        raise ValueError("Unterminated JSON array")
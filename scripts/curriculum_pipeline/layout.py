@@ -0,0 +1,212 @@
+"""
+Declarative layouts for provider year sheets.
+
+A SheetLayout says which files are year sheets, which row holds the unit
+names, which row labels are categories, how totals are marked and which cells
+label an optional section; ingest.iter_sheet reads every provider's sheets
+through one. Gather Round is DEFAULT_LAYOUT.
+
+A new provider adds data/<provider>/layout.json with only the fields that
+differ from the default (lists for the set/tuple fields):
+
+    {
+      "sheet_pattern": "level\\s*(\\d+)",
+      "categories": ["Science", "Math", "Language Arts"],
+      "categories_with_hours": ["Math"],
+      "type_patterns": ["Optional Project"],
+      "type_prefix_pattern": null
+    }
+
+Layouts are validated when built, so a bad config fails before any sheet is
+read.
+"""
+
+import json
+import re
+from dataclasses import dataclass, fields, replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable
+
+LAYOUT_FILE = "layout.json"
+
+
+def normalize_type(cell: str) -> str:
+    """Return a clean type string for the cell (use as-is if it's a known type)."""
+    t = cell.strip()
+    # Normalize slash variants
+    t = t.replace("\n", " ").replace("  ", " ")
+    return t
+
+
+def _compile_type_matcher(
+    patterns: tuple[str, ...], prefix_pattern: str | None
+) -> tuple[re.Pattern | None, frozenset[str]]:
+    """
+    One regex for "cell contains a pattern" plus the prefix rules, and the set
+    of every substring of every pattern for "cell is part of a pattern".
+    """
+    ordered = sorted(set(patterns), key=len, reverse=True)
+    alternatives = [re.escape(p) for p in ordered]
+    if prefix_pattern:
+        alternatives.append(prefix_pattern)
+    matcher = re.compile("|".join(alternatives), re.S) if alternatives else None
+    fragments = frozenset(p[i:j] for p in ordered for i in range(len(p)) for j in range(i + 1, len(p) + 1))
+    return matcher, fragments
+
+
+_classifiers: dict[tuple, Callable[[str], str | None]] = {}
+
+
+def type_classifier(patterns: tuple[str, ...], prefix_pattern: str | None) -> Callable[[str], str | None]:
+    """Cached cell -> normalized type (or None) function, one per distinct pattern set."""
+    key = (patterns, prefix_pattern)
+    classify = _classifiers.get(key)
+    if classify is not None:
+        return classify
+    matcher, fragments = _compile_type_matcher(patterns, prefix_pattern)
+
+    @lru_cache(maxsize=4096)
+    def classify(cell: str) -> str | None:
+        """Normalized type for a type-label cell (see normalize_type), else None. One lookup plus one regex search."""
+        if not cell:
+            return None
+        t = cell.strip()
+        if not t:
+            return None
+        if t in fragments or (matcher is not None and matcher.search(t)):
+            return normalize_type(t)
+        return None
+
+    _classifiers[key] = classify
+    return classify
+
+
+@dataclass(frozen=True)
+class SheetLayout:
+    # Year sheets are the *.csv files whose name matches; group 1 is the year
+    sheet_pattern: str = r"year\s*(\d+)"
+    # Row with the unit names (one per column after label_column); earlier rows are ignored
+    header_row: int = 0
+    # Column holding category / subcategory row labels
+    label_column: int = 0
+    # Row labels that start a category; the rows below are its subcategories
+    categories: frozenset[str] = frozenset([
+        "Physical Science", "Earth Science", "Life Science", "Language Arts",
+        "History", "Bible", "Physical Education", "Fine Arts", "Electives",
+        "Social Science Electives", "Language Arts Electives", "Science Electives",
+        "Math Electives",
+    ])
+    # Categories that also have hours directly (no subcategories)
+    categories_with_hours: frozenset[str] = frozenset(["Bible", "Physical Education"])
+    # Marks the totals column (header cell) and totals rows (label prefix), case-insensitive
+    total_label: str = "TOTALS"
+    # Other row labels that are never subcategories
+    skip_row_prefixes: tuple[str, ...] = ("Required", "(")
+    # Non-numeric cells in hour rows that are not worth a parse attempt
+    placeholder_cells: frozenset[str] = frozenset(["Hours"])
+    # Types we consider "optional/configurable" (exact or prefix match on cell content)
+    type_patterns: tuple[str, ...] = (
+        "Required Reading",
+        "Optional Lab Addition",
+        "Optional LA Addition",
+        "Optional PE Addition",
+        "Optional Chemistry Lab",
+        "Optional Biology Lab",
+        "Optional Physics Lab",
+        "Optional Physics Labs",
+        "Optional Labs",
+        "Optional Life Science Lab",
+        "Optional Physical Science Lab",
+        "Optional Physics/Earth Science Labs",
+        "Optional Chemistry/Physics Lab",
+        "Optional Chemistry/\nPhysics Lab",
+        "Required PE Add-on:",
+    )
+    # Regex for type labels not worth listing one by one
+    type_prefix_pattern: str | None = r"^Optional .*(?:Lab|LA Addition|PE )|^Required PE"
+
+    def __post_init__(self) -> None:
+        errors = []
+        for name in ("sheet_pattern", "type_prefix_pattern"):
+            value = getattr(self, name)
+            if value is None:
+                continue
+            try:
+                compiled = re.compile(value)
+            except re.error as e:
+                errors.append(f"{name}: {e}")
+                continue
+            if name == "sheet_pattern" and compiled.groups < 1:
+                errors.append("sheet_pattern: needs a group capturing the year")
+        if self.header_row < 0 or self.label_column < 0:
+            errors.append("header_row and label_column must be >= 0")
+        if not self.categories_with_hours <= self.categories:
+            extra = sorted(self.categories_with_hours - self.categories)
+            errors.append(f"categories_with_hours not in categories: {', '.join(extra)}")
+        if not self.total_label.strip():
+            errors.append("total_label must not be empty")
+        if errors:
+            raise ValueError("Invalid sheet layout: " + "; ".join(errors))
+
+    @property
+    def sheet_re(self) -> re.Pattern:
+        return _compiled(self.sheet_pattern)
+
+    @property
+    def classify_type(self) -> Callable[[str], str | None]:
+        return type_classifier(self.type_patterns, self.type_prefix_pattern)
+
+    def is_total(self, label: str) -> bool:
+        return label.upper().startswith(self.total_label.upper())
+
+    @classmethod
+    def from_dict(cls, data: dict, base: "SheetLayout | None" = None) -> "SheetLayout":
+        """Layout with data's fields over base (DEFAULT_LAYOUT); raises ValueError on unknown or mistyped fields."""
+        base = base or DEFAULT_LAYOUT
+        unknown = sorted(set(data) - {f.name for f in fields(cls)})
+        if unknown:
+            raise ValueError(f"Unknown sheet layout field(s): {', '.join(unknown)}")
+        values = {}
+        for name, value in data.items():
+            current = getattr(base, name)
+            if isinstance(current, (frozenset, tuple)):
+                if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+                    raise ValueError(f"Sheet layout field {name} must be a list of strings")
+                value = type(current)(value)
+            elif isinstance(current, int):
+                if not isinstance(value, int) or isinstance(value, bool):
+                    raise ValueError(f"Sheet layout field {name} must be an integer")
+            elif not (isinstance(value, str) or (value is None and name == "type_prefix_pattern")):
+                raise ValueError(f"Sheet layout field {name} must be a string")
+            values[name] = value
+        return replace(base, **values)
+
+
+@lru_cache(maxsize=None)
+def _compiled(pattern: str) -> re.Pattern:
+    return re.compile(pattern, re.I)
+
+
+DEFAULT_LAYOUT = SheetLayout()
+
+
+def layout_path(provider_dir: Path) -> Path:
+    return provider_dir / LAYOUT_FILE
+
+
+def load_layout(provider_dir: Path) -> SheetLayout:
+    """The provider's layout.json over DEFAULT_LAYOUT, or DEFAULT_LAYOUT when it has none."""
+    path = layout_path(provider_dir)
+    if not path.exists():
+        return DEFAULT_LAYOUT
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"{path}: {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a JSON object")
+    try:
+        return SheetLayout.from_dict(data)
+    except ValueError as e:
+        raise ValueError(f"{path}: {e}") from e
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Year sheets as unit x subcategory hours matrices.
+
+load_sheet reads a sheet once into an HoursMatrix: a float array with one row
+per subcategory row (sheet order) and one column per unit, NaN for blank
+cells, plus the row labels, unit labels and the sheet's own TOTALS column and
+TOTALS rows. Per-unit totals, category rollups and the TOTALS cross-checks are
+array operations on it, and hours_rows() yields the same HoursRow stream as
+ingest.iter_sheet, so stages that want records do not parse the sheet again.
+
+NumPy is imported inside the functions that use it, so importing this module
+(and `curriculum-pipeline matrix --help`) does not load it.
+
+Usage (from scripts/):
+    python -m curriculum_pipeline.matrix ../data/gatherround [--tolerance 0.01]
+"""
+
+import argparse
+import csv
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
+
+from .ingest import _is_skipped_row_label, find_year_sheets, sheet_label
+from .layout import DEFAULT_LAYOUT, SheetLayout, load_layout
+from .records import HoursRow, UnitYear
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Sums of half-hour cells are exact in floating point; this only absorbs
+# sheets that round their totals
+DEFAULT_TOLERANCE = 0.01
+
+
+def _parse_cells(cells: list[str], placeholders: frozenset[str]):
+    """Float array for stripped cells: blanks and placeholders are NaN, anything else non-numeric too."""
+    import numpy as np
+
+    values = ["nan" if not c or c in placeholders else c for c in cells]
+    try:
+        # One C-level conversion for the whole sheet
+        return np.array(values, dtype=np.float64)
+    except ValueError:
+        pass
+
+    def number(c: str) -> float:
+        try:
+            return float(c)
+        except ValueError:
+            return float("nan")
+
+    return np.fromiter(map(number, values), dtype=np.float64, count=len(values))
+
+
+@dataclass(frozen=True, eq=False)
+class HoursMatrix:
+    """One year sheet: hours[i, j] is subcategory row i for unit j (NaN = blank)."""
+
+    provider: str
+    year: int
+    units: tuple[str, ...]  # sheet_label spelling, as in unit_subcategory_hours.csv
+    columns: tuple[int, ...]  # sheet column of each unit
+    categories: tuple[str | None, ...]  # per row
+    subcategories: tuple[str, ...]  # per row
+    hours: "np.ndarray"  # (rows, units)
+    # The sheet's TOTALS column (NaN where blank, or everywhere if it has none)
+    row_totals: "np.ndarray"  # (rows,)
+    # TOTALS rows by label ("TOTALS", "TOTALS WITH EXTRAS", ...), one value per unit
+    total_rows: dict[str, "np.ndarray"] = field(default_factory=dict)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.hours.shape
+
+    def unit_totals(self) -> "np.ndarray":
+        """Hours per unit (column sums)."""
+        import numpy as np
+
+        return np.nansum(self.hours, axis=0)
+
+    def row_sums(self) -> "np.ndarray":
+        """Hours per subcategory row across units (what the TOTALS column should say)."""
+        import numpy as np
+
+        return np.nansum(self.hours, axis=1)
+
+    def category_totals(self) -> dict[str | None, "np.ndarray"]:
+        """category -> hours per unit, categories in sheet order."""
+        import numpy as np
+
+        order = list(dict.fromkeys(self.categories))
+        codes = np.fromiter((order.index(c) for c in self.categories), dtype=np.intp, count=len(self.categories))
+        sums = np.zeros((len(order), len(self.units)))
+        np.add.at(sums, codes, np.nan_to_num(self.hours))
+        return dict(zip(order, sums))
+
+    def row_total_mismatches(self, tolerance: float = DEFAULT_TOLERANCE) -> list[tuple[int, float, float]]:
+        """(row, sum of the row, TOTALS column) for rows whose TOTALS cell disagrees with its cells."""
+        import numpy as np
+
+        sums = self.row_sums()
+        bad = np.flatnonzero(~np.isnan(self.row_totals) & (np.abs(sums - self.row_totals) > tolerance))
+        return [(int(i), float(sums[i]), float(self.row_totals[i])) for i in bad]
+
+    def unit_total_mismatches(
+        self, label: str | None = None, tolerance: float = DEFAULT_TOLERANCE
+    ) -> list[tuple[int, float, float]]:
+        """(unit index, column sum, TOTALS row value) for units whose TOTALS row cell disagrees."""
+        import numpy as np
+
+        expected = self.total_rows.get(label) if label else next(iter(self.total_rows.values()), None)
+        if expected is None:
+            return []
+        sums = self.unit_totals()
+        bad = np.flatnonzero(~np.isnan(expected) & (np.abs(sums - expected) > tolerance))
+        return [(int(j), float(sums[j]), float(expected[j])) for j in bad]
+
+    def hours_rows(self) -> Iterator[HoursRow]:
+        """Positive cells as HoursRow records, in ingest.iter_sheet order (row by row, left to right)."""
+        import numpy as np
+
+        rows, cols = np.nonzero(self.hours > 0)
+        values = self.hours[rows, cols].tolist()
+        for i, j, hours in zip(rows.tolist(), cols.tolist(), values):
+            yield HoursRow(
+                self.provider, self.year, self.columns[j], self.units[j],
+                self.categories[i], self.subcategories[i], hours,
+            )
+
+    def unit_years(self) -> list[UnitYear]:
+        """A UnitYear per unit with hours, in the order iter_sheet first sees them."""
+        import numpy as np
+
+        has_hours = self.hours > 0
+        firsts = []
+        for j in np.flatnonzero(has_hours.any(axis=0)).tolist():
+            firsts.append((int(has_hours[:, j].argmax()), j))
+        out = []
+        seen: set[str] = set()
+        for _, j in sorted(firsts):
+            unit = self.units[j]
+            if unit not in seen:
+                seen.add(unit)
+                out.append(UnitYear(self.provider, self.year, self.columns[j], unit))
+        return out
+
+
+def load_sheet(path: Path, year: int, provider: str = "", layout: SheetLayout = DEFAULT_LAYOUT) -> HoursMatrix:
+    """Read one year sheet into an HoursMatrix (same rows and cells as iter_sheet's HoursRow records)."""
+    import numpy as np
+
+    label_col = layout.label_column
+    first = label_col + 1
+    is_total = layout.is_total
+
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        for _ in range(layout.header_row):
+            next(reader, None)
+        header = next(reader, None) or []
+
+        units: list[str] = []
+        columns: list[int] = []
+        totals_col = None
+        for col, cell in enumerate(header[first:], start=first):
+            unit = sheet_label(cell)
+            if is_total(unit):
+                if totals_col is None:
+                    totals_col = col
+            else:
+                units.append(unit)
+                columns.append(col)
+        # The TOTALS column rides along as an extra column and is split off after parsing
+        wanted = columns + ([totals_col] if totals_col is not None else [])
+
+        categories: list[str | None] = []
+        subcategories: list[str] = []
+        total_labels: list[str] = []
+        cells: list[str] = []
+        total_cells: list[str] = []
+        current_category: str | None = None
+
+        def take(row: list[str], out: list[str]) -> None:
+            width = len(row)
+            out.extend(row[c].strip() if c < width else "" for c in wanted)
+
+        for row in reader:
+            if len(row) <= label_col or not row[label_col].strip():
+                continue
+            name = sheet_label(row[label_col])
+            if is_total(name):
+                total_labels.append(name)
+                take(row, total_cells)
+                continue
+            if _is_skipped_row_label(name, layout):
+                continue
+            if name in layout.categories:
+                current_category = name
+                if name not in layout.categories_with_hours:
+                    continue
+            categories.append(current_category)
+            subcategories.append(name)
+            take(row, cells)
+
+    width = len(wanted)
+    values = _parse_cells(cells, layout.placeholder_cells).reshape(len(subcategories), width)
+    totals = _parse_cells(total_cells, layout.placeholder_cells).reshape(len(total_labels), width)
+    n = len(units)
+    row_totals = values[:, n] if totals_col is not None else np.full(len(subcategories), np.nan)
+    total_rows: dict[str, np.ndarray] = {}
+    for label, values_row in zip(total_labels, totals[:, :n]):
+        total_rows.setdefault(label, values_row)
+
+    return HoursMatrix(
+        provider, year, tuple(units), tuple(columns), tuple(categories), tuple(subcategories),
+        np.ascontiguousarray(values[:, :n]), row_totals, total_rows,
+    )
+
+
+def load_provider(provider_dir: Path, layout: SheetLayout | None = None) -> list[HoursMatrix]:
+    """Every year sheet of a provider, in year order."""
+    layout = layout or load_layout(provider_dir)
+    return [load_sheet(path, year, provider_dir.name, layout) for year, path in find_year_sheets(provider_dir, layout)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load year sheets as hours matrices and cross-check their TOTALS.")
+    parser.add_argument("provider_dir", type=Path, help="e.g. ../data/gatherround")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed |sum - TOTALS|")
+    args = parser.parse_args()
+
+    provider_dir = args.provider_dir.resolve()
+    try:
+        matrices = load_provider(provider_dir)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    if not matrices:
+        raise SystemExit(f"No year sheets found in {provider_dir}")
+
+    for m in matrices:
+        rows, units = m.shape
+        unit_totals = m.unit_totals()
+        print(f"Year {m.year}: {rows} subcategory rows x {units} units, {unit_totals.sum():g} hours")
+        for i, total, sheet in m.row_total_mismatches(args.tolerance):
+            print(f"  row {m.subcategories[i]!r}: cells sum to {total:g}, TOTALS column says {sheet:g}")
+        for j, total, sheet in m.unit_total_mismatches(tolerance=args.tolerance):
+            print(f"  unit {m.units[j]!r}: cells sum to {total:g}, TOTALS row says {sheet:g}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
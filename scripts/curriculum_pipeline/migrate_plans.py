@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Normalize stored plans (planner_plans.data) in bulk.
+
+The planner normalizes a plan every time it loads one (normalizePlanData in
+app/src/planStorage.ts), so legacy and stale shapes stay in the table until
+the plan's owner opens it. This job applies the same rules on the server
+(curriculum_pipeline.plan_data): assignments, lockedYears, unitOrderByYear,
+curriculumUnits (inferred as gatherround units for plans saved before it
+existed) and config. It also remaps unit names the curriculum no longer uses:
+
+  rename    --renames FILE, {"gatherround": {"Old unit": "New unit"}, ...}
+  spelling  a name that matches a current unit only after whitespace, case or
+            punctuation folding (names.NameIndex exact/token; --fuzzy also
+            takes trigram matches)
+
+A remapped unit is renamed everywhere the plan keys by unit (assignments, the
+option maps, unitOrderByYear and curriculumUnits). Names that match no
+current unit are kept and listed in the report. Current unit names come from
+unit_hours_summary over the same connection with --database-url (data/ can
+lag behind edits made in the admin page), and from data/<curriculum_id>
+otherwise.
+
+Postgres rows are read in id order, one keyset page at a time. Each page's
+changed rows go back in one UPDATE ... FROM unnest(...), guarded by
+planner_plans.version, so a plan its owner saved in the meantime is skipped
+and counted as a conflict instead of being overwritten. The update bumps
+version but keeps updated_at (planner_plans.keep_updated_at, see
+supabase/migrations/20261018113000_planner_plans_keep_updated_at.sql):
+normalizing is not an edit, so a client with unsynced edits re-reads the plan
+on its version conflict, keeps its newer local copy and patches it onto the
+normalized one. Clients that already have the plan keep their copy, which the
+planner normalizes on load anyway.
+--dry-run reads and reports without writing. Read, normalize and write
+times are reported with rows per second.
+
+Usage (from scripts/):
+    python -m curriculum_pipeline.migrate_plans --database-url URL [--dry-run] [--renames renames.json]
+    python -m curriculum_pipeline.migrate_plans --from-json plans.json [--out normalized.json] [--json]
+    python -m curriculum_pipeline.migrate_plans --synthetic 20000
+"""
+
+import argparse
+import json
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+from .names import NameIndex
+from .paths import DATA_DIR
+from .plan_data import normalize_plan_data
+
+UNIT_MAPS = (
+    "assignments",
+    "optionChoices",
+    "includedOptionalItems",
+    "optionGroupHoursOverride",
+    "optionalItemHoursOverride",
+)
+
+RENAME = "rename"
+UNKNOWN = "unknown"
+SUMMARY_LINES = 20
+
+UPDATE_SQL = """
+UPDATE planner_plans AS p
+SET data = v.data::jsonb
+FROM unnest(%s::uuid[], %s::bigint[], %s::text[]) AS v(id, version, data)
+WHERE p.id = v.id AND p.version = v.version
+RETURNING p.id::text
+"""
+# Read by the planner_plans trigger; transaction-local, so it ends with the page
+KEEP_UPDATED_AT_SQL = "SELECT set_config('planner_plans.keep_updated_at', 'on', true)"
+
+
+def load_units(curriculum_id: str, conn=None) -> list[str] | None:
+    """
+    Current unit names of a curriculum, or None without data for it: from
+    unit_hours_summary when given a connection, else built from data/.
+    """
+    if conn is not None:
+        rows = conn.execute(
+            "SELECT unit FROM unit_hours_summary WHERE curriculum_id = %s ORDER BY unit", [curriculum_id]
+        ).fetchall()
+        return [unit for (unit,) in rows] or None
+
+    from .catalog import build_catalog
+    from .summary import build_summary
+
+    provider_dir = DATA_DIR / curriculum_id
+    if not provider_dir.is_dir():
+        return None
+    catalog, _ = build_catalog(provider_dir, curriculum_id)
+    return [row["unit"] for row in build_summary(catalog)]
+
+
+@dataclass
+class UnitResolver:
+    """Maps (curriculum_id, unit) from a stored plan to the name the curriculum uses now."""
+
+    renames: dict[str, dict[str, str]] = field(default_factory=dict)
+    fuzzy: bool = False
+    indexes: dict[str, NameIndex | None] = field(default_factory=dict)
+    conn: object | None = None  # read unit names from this database instead of data/
+    seconds: float = 0.0  # spent loading curricula
+    _resolved: dict[tuple[str, str], tuple[str, str | None]] = field(default_factory=dict)
+
+    def index(self, curriculum_id: str) -> NameIndex | None:
+        if curriculum_id not in self.indexes:
+            started = time.perf_counter()
+            units = load_units(curriculum_id, self.conn)
+            self.indexes[curriculum_id] = None if units is None else NameIndex(units)
+            self.seconds += time.perf_counter() - started
+        return self.indexes[curriculum_id]
+
+    def resolve(self, curriculum_id: str, unit: str) -> tuple[str, str | None]:
+        """
+        (unit, how): how is None when the name is current (or its curriculum is
+        unknown here), "rename", a NameIndex method, or "unknown" for no match.
+        """
+        key = (curriculum_id, unit)
+        if key in self._resolved:
+            return self._resolved[key]
+        renames = self.renames.get(curriculum_id, {})
+        name, seen = unit, set()
+        while name in renames and name not in seen:  # follow chains: A -> B, later B -> C
+            seen.add(name)
+            name = renames[name]
+        index = self.index(curriculum_id)
+        if name != unit:
+            result = (name, RENAME)
+        elif index is None:
+            result = (unit, None)
+        else:
+            match = index.match(unit, self.fuzzy)
+            if not match.found:
+                result = (unit, UNKNOWN)
+            elif match.name == unit:
+                result = (unit, None)
+            else:
+                result = (match.name, match.method)
+        self._resolved[key] = result
+        return result
+
+
+def rename_units(data: dict, renames: dict[str, str]) -> dict:
+    """data with unit keys renamed; where a plan has both names, the entry under the new name wins."""
+    out = dict(data)
+    for key in UNIT_MAPS:
+        units = data[key]
+        if not isinstance(units, dict):
+            continue
+        renamed = {}
+        for unit, value in units.items():
+            new = renames.get(unit, unit)
+            if new != unit and new in units:
+                continue
+            renamed.setdefault(new, value)
+        out[key] = renamed
+    out["curriculumUnits"] = [
+        {**ref, "unit": renames.get(ref["unit"], ref["unit"])} for ref in data["curriculumUnits"]
+    ]
+    out["unitOrderByYear"] = {
+        year: [renames.get(unit, unit) for unit in units] for year, units in data["unitOrderByYear"].items()
+    }
+    return out
+
+
+@dataclass(frozen=True)
+class PlanMigration:
+    id: str
+    data: dict  # normalized, units remapped
+    changed: list[str]  # top-level fields that differ from the stored data
+    remapped: list[tuple[str, str, str, str]]  # (curriculum_id, old, new, how)
+    unknown: list[tuple[str, str]]  # (curriculum_id, unit)
+
+
+def migrate_plan(plan_id: str, raw, resolver: UnitResolver) -> PlanMigration:
+    data = normalize_plan_data(raw)
+    renames: dict[str, str] = {}
+    remapped = []
+    unknown = []
+    for ref in data["curriculumUnits"]:
+        curriculum_id, unit = ref["curriculumId"], ref["unit"]
+        name, how = resolver.resolve(curriculum_id, unit)
+        if how == UNKNOWN:
+            unknown.append((curriculum_id, unit))
+        elif how is not None:
+            renames[unit] = name
+            remapped.append((curriculum_id, unit, name, how))
+    if renames:
+        # Normalizing again drops duplicates the renames created (curriculumUnits, unitOrderByYear)
+        data = normalize_plan_data(rename_units(data, renames))
+    stored = raw if isinstance(raw, dict) else {}
+    changed = [key for key in dict.fromkeys([*data, *stored]) if data.get(key) != stored.get(key)]
+    return PlanMigration(plan_id, data, changed, remapped, unknown)
+
+
+@dataclass
+class Report:
+    dry_run: bool
+    plans: int = 0
+    changed: int = 0
+    written: int = 0
+    conflicts: list[str] = field(default_factory=list)
+    fields: Counter = field(default_factory=Counter)
+    remapped: Counter = field(default_factory=Counter)  # (curriculum_id, old, new, how) -> plans
+    unknown: Counter = field(default_factory=Counter)  # (curriculum_id, unit) -> plans
+    seconds: Counter = field(default_factory=Counter)  # phase -> seconds
+
+    def add(self, migration: PlanMigration) -> None:
+        self.plans += 1
+        if migration.changed:
+            self.changed += 1
+            self.fields.update(migration.changed)
+        self.remapped.update(migration.remapped)
+        self.unknown.update(migration.unknown)
+
+    def as_dict(self) -> dict:
+        return {
+            "dry_run": self.dry_run,
+            "plans": self.plans,
+            "changed": self.changed,
+            "written": self.written,
+            "conflicts": self.conflicts,
+            "fields": dict(self.fields.most_common()),
+            "remapped": [
+                {"curriculum_id": c, "from": old, "to": new, "how": how, "plans": n}
+                for (c, old, new, how), n in self.remapped.most_common()
+            ],
+            "unknown_units": [
+                {"curriculum_id": c, "unit": unit, "plans": n} for (c, unit), n in self.unknown.most_common()
+            ],
+            "seconds": {phase: round(s, 4) for phase, s in self.seconds.items()},
+            "rows_per_second": {
+                phase: round(self.plans / s) for phase, s in self.seconds.items() if s and phase != "curricula"
+            },
+        }
+
+
+def migrate_rows(rows: list[dict], resolver: UnitResolver, report: Report) -> list[tuple[dict, PlanMigration]]:
+    """(row, migration) for the rows whose data changes."""
+    started = time.perf_counter()
+    loading = resolver.seconds
+    out = []
+    for row in rows:
+        migration = migrate_plan(str(row["id"]), row.get("data"), resolver)
+        report.add(migration)
+        if migration.changed:
+            out.append((row, migration))
+    # Curricula load on first use; keep that out of the per-plan time
+    loaded = resolver.seconds - loading
+    report.seconds["curricula"] += loaded
+    report.seconds["normalize"] += time.perf_counter() - started - loaded
+    return out
+
+
+def fetch_pages(conn, page_size: int) -> Iterator[list[dict]]:
+    """planner_plans rows in id order, one keyset page at a time."""
+    last = None
+    while True:
+        if last is None:
+            cur = conn.execute("SELECT id::text, version, data FROM planner_plans ORDER BY id LIMIT %s", [page_size])
+        else:
+            cur = conn.execute(
+                "SELECT id::text, version, data FROM planner_plans WHERE id > %s ORDER BY id LIMIT %s",
+                [last, page_size],
+            )
+        page = [{"id": pid, "version": version, "data": data} for pid, version, data in cur.fetchall()]
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        last = page[-1]["id"]
+
+
+def write_page(conn, changes: list[tuple[dict, PlanMigration]]) -> set[str]:
+    """Write one page's changed rows in one statement; returns the ids that were still at the read version."""
+    ids = [row["id"] for row, _ in changes]
+    versions = [row["version"] for row, _ in changes]
+    payloads = [json.dumps(m.data, ensure_ascii=False, separators=(",", ":")) for _, m in changes]
+    conn.execute(KEEP_UPDATED_AT_SQL)
+    cur = conn.execute(UPDATE_SQL, [ids, versions, payloads])
+    written = {pid for (pid,) in cur.fetchall()}
+    conn.commit()
+    return written
+
+
+def migrate_db(conn, resolver: UnitResolver, report: Report, page_size: int) -> None:
+    pages = fetch_pages(conn, page_size)
+    while True:
+        started = time.perf_counter()
+        page = next(pages, None)
+        report.seconds["read"] += time.perf_counter() - started
+        if page is None:
+            return
+        changes = migrate_rows(page, resolver, report)
+        if report.dry_run or not changes:
+            continue
+        started = time.perf_counter()
+        written = write_page(conn, changes)
+        report.seconds["write"] += time.perf_counter() - started
+        report.written += len(written)
+        report.conflicts += [row["id"] for row, _ in changes if row["id"] not in written]
+
+
+def _read_renames(path: Path) -> dict[str, dict[str, str]]:
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(raw, dict) or not all(
+        isinstance(v, dict) and all(isinstance(old, str) and isinstance(new, str) for old, new in v.items())
+        for v in raw.values()
+    ):
+        raise SystemExit(f'{path}: expected {{"<curriculum_id>": {{"<old unit>": "<new unit>", ...}}, ...}}')
+    return raw
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Normalize stored plans and remap renamed units in bulk.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--database-url", help="migrate planner_plans in Postgres")
+    source.add_argument("--from-json", type=Path, help='JSON export: [{"id", "data"}, ...]')
+    source.add_argument("--synthetic", type=int, metavar="N", help="N random plans with legacy shapes mixed in")
+    parser.add_argument("--renames", type=Path, help='{"<curriculum_id>": {"<old unit>": "<new unit>"}} JSON')
+    parser.add_argument("--fuzzy", action="store_true", help="also remap units that only fuzzy-match a current unit")
+    parser.add_argument("--dry-run", action="store_true", help="report what would change without writing anything")
+    parser.add_argument("--out", type=Path, help="with --from-json/--synthetic: write the migrated rows here")
+    parser.add_argument("--json", action="store_true", help="print the JSON report instead of a summary")
+    parser.add_argument("--page-size", type=int, default=1000, help="rows per database read and write")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for --synthetic")
+    args = parser.parse_args()
+
+    resolver = UnitResolver(_read_renames(args.renames) if args.renames else {}, args.fuzzy)
+    # Without a database, --out is the only place results go
+    report = Report(dry_run=args.dry_run or (args.database_url is None and args.out is None))
+
+    if args.database_url:
+        try:
+            import psycopg
+        except ImportError:
+            raise SystemExit("Install psycopg to migrate plans in Postgres: pip install psycopg")
+        with psycopg.connect(args.database_url) as conn:
+            resolver.conn = conn
+            migrate_db(conn, resolver, report, max(1, args.page_size))
+    else:
+        started = time.perf_counter()
+        if args.from_json:
+            raw = json.loads(args.from_json.read_text(encoding="utf-8"))
+            rows = [
+                row if isinstance(row, dict) and "data" in row else {"id": i, "data": row} for i, row in enumerate(raw)
+            ]
+        else:
+            from .credits import load_model
+            from .synthetic import legacy_plan_payloads
+
+            rows = legacy_plan_payloads(load_model(["gatherround"]), args.synthetic, args.seed)
+        report.seconds["read"] += time.perf_counter() - started
+        changes = {id(row): m for row, m in migrate_rows(rows, resolver, report)}
+        if args.out and not report.dry_run:
+            report.written = len(changes)
+            out = [{**row, "data": changes[id(row)].data} if id(row) in changes else row for row in rows]
+            args.out.write_text(json.dumps(out, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    result = report.as_dict()
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        return 0
+    for field_name, n in result["fields"].items():
+        print(f"  {field_name}: {n} plans")
+    for r in result["remapped"][:SUMMARY_LINES]:
+        print(f"  {r['how']} {r['curriculum_id']}/{r['from']!r} -> {r['to']!r}: {r['plans']} plans")
+    if len(result["remapped"]) > SUMMARY_LINES:
+        print(f"  ... {len(result['remapped']) - SUMMARY_LINES} more remapped names (--json lists all)")
+    for u in result["unknown_units"][:SUMMARY_LINES]:
+        print(f"  unknown unit {u['curriculum_id']}/{u['unit']!r}: {u['plans']} plans (kept)")
+    if report.conflicts:
+        skipped = ", ".join(report.conflicts[:10])
+        print(f"  {len(report.conflicts)} plans changed since they were read, skipped: {skipped}")
+    rates = result["rows_per_second"]
+    timings = ", ".join(
+        f"{phase} {s * 1000:.1f} ms" + (f" ({rates[phase]} rows/s)" if phase in rates else "")
+        for phase, s in report.seconds.items()
+    )
+    verb = "would change" if report.dry_run else f"wrote {report.written} of"
+    print(f"{report.plans} plans, {verb} {report.changed}; {timings}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,209 @@
+"""
+Unit / subcategory name resolution shared by the pipeline scripts.
+
+Source files spell the same unit differently ("Ancient  Civilizations" in
+unit_subcategory_hours.csv, "Ancient Civilizations" in the by-type JSON, stray
+newlines from sheet cells). A NameIndex is built once from the canonical
+names (the spelling stored in Postgres) and resolves a query by:
+
+  exact  normalized key (whitespace collapsed, case-folded)     dict lookup
+  token  same set of word tokens, ignoring punctuation/order    dict lookup
+  fuzzy  character-trigram Dice score >= cutoff, same numbers   trigram postings
+
+Every resolve() is recorded so scripts can print a match report listing
+fuzzy matches and misses.
+
+TextBlocks does the same for body text: blocks are normalized once, not once
+per option.
+
+Usage (from scripts/), report how by-type JSON unit names resolve:
+    python -m curriculum_pipeline.names gatherround
+"""
+
+import argparse
+import json
+import re
+import unicodedata
+from dataclasses import dataclass
+
+_WS_RE = re.compile(r"\s+")
+_TOKEN_RE = re.compile(r"[0-9a-z]+")
+_NUMBER_RE = re.compile(r"[0-9]+")
+
+FUZZY_CUTOFF = 0.8
+
+
+def name_key(value: str) -> str:
+    """Exact-match key: NFKC, whitespace runs (incl. newlines) -> one space, case-folded."""
+    if not value:
+        return ""
+    return _WS_RE.sub(" ", unicodedata.normalize("NFKC", value)).strip().casefold()
+
+
+def token_key(value: str) -> str:
+    """Order/punctuation-insensitive key: sorted distinct word tokens."""
+    return " ".join(sorted(set(_TOKEN_RE.findall(name_key(value)))))
+
+
+def trigrams(key: str) -> set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class NameMatch:
+    query: str
+    name: str | None
+    method: str | None  # "exact", "token", "fuzzy" or None for a miss
+    score: float = 0.0
+
+    @property
+    def found(self) -> bool:
+        return self.name is not None
+
+
+class NameIndex:
+    """Canonical names indexed for O(1) exact/token lookups and trigram fuzzy fallback."""
+
+    def __init__(self, names=(), cutoff: float = FUZZY_CUTOFF) -> None:
+        self.cutoff = cutoff
+        self.names: list[str] = []
+        self._exact: dict[str, int] = {}
+        self._tokens: dict[str, int] = {}
+        self._grams: list[set[str]] = []
+        self._numbers: list[tuple[str, ...]] = []
+        self._postings: dict[str, list[int]] = {}
+        self.matches: list[NameMatch] = []
+        for name in names:
+            self.add(name)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name_key(name) in self._exact
+
+    def add(self, name: str) -> None:
+        """Index name; the first spelling seen for a key stays canonical."""
+        key = name_key(name)
+        if not key or key in self._exact:
+            return
+        idx = len(self.names)
+        self.names.append(name)
+        self._exact[key] = idx
+        self._tokens.setdefault(token_key(name), idx)
+        grams = trigrams(key)
+        self._grams.append(grams)
+        self._numbers.append(tuple(_NUMBER_RE.findall(key)))
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(idx)
+
+    def _fuzzy(self, key: str) -> tuple[int, float] | None:
+        grams = trigrams(key)
+        numbers = tuple(_NUMBER_RE.findall(key))
+        shared: dict[int, int] = {}
+        for gram in grams:
+            for idx in self._postings.get(gram, ()):
+                shared[idx] = shared.get(idx, 0) + 1
+        best = None
+        for idx, count in shared.items():
+            # "US History 3" must not fuzzy-match "US History 1"
+            if self._numbers[idx] != numbers:
+                continue
+            score = 2 * count / (len(grams) + len(self._grams[idx]))
+            if best is None or score > best[1] or (score == best[1] and idx < best[0]):
+                best = (idx, score)
+        if best is None or best[1] < self.cutoff:
+            return None
+        return best
+
+    def match(self, query: str, fuzzy: bool = True) -> NameMatch:
+        key = name_key(query)
+        idx = self._exact.get(key)
+        if idx is not None:
+            result = NameMatch(query, self.names[idx], "exact", 1.0)
+        elif (idx := self._tokens.get(token_key(query))) is not None and key:
+            result = NameMatch(query, self.names[idx], "token", 1.0)
+        elif fuzzy and key and (hit := self._fuzzy(key)) is not None:
+            result = NameMatch(query, self.names[hit[0]], "fuzzy", round(hit[1], 3))
+        else:
+            result = NameMatch(query, None, None)
+        self.matches.append(result)
+        return result
+
+    def resolve(self, query: str, fuzzy: bool = True) -> str | None:
+        """Canonical spelling for query, or None."""
+        return self.match(query, fuzzy).name
+
+    def report(self) -> list[str]:
+        """One line per distinct non-exact resolution (fuzzy matches and misses)."""
+        lines = []
+        seen = set()
+        for m in self.matches:
+            if m.method == "exact" or (m.query, m.name) in seen:
+                continue
+            seen.add((m.query, m.name))
+            if m.found:
+                lines.append(f"{m.method} {m.query!r} -> {m.name!r} ({m.score:.2f})")
+            else:
+                lines.append(f"miss {m.query!r}")
+        return lines
+
+
+class TextBlocks:
+    """Paragraph blocks of an entry body, normalized once for repeated label lookups."""
+
+    def __init__(self, blocks: list[str]) -> None:
+        self.blocks = blocks
+        self._keys = [name_key(block) for block in blocks]
+
+    def __bool__(self) -> bool:
+        return bool(self.blocks)
+
+    def find(self, label: str) -> str | None:
+        """First block containing label (normalized substring), or None."""
+        key = name_key(label)
+        for block, block_key in zip(self.blocks, self._keys):
+            if key in block_key:
+                return block
+        return None
+
+    def pick(self, label: str, index: int) -> str:
+        """Block for the index-th option labelled label: containing block, sole block, positional, else the label."""
+        if not self.blocks:
+            return label
+        found = self.find(label)
+        if found is not None:
+            return found
+        if len(self.blocks) == 1:
+            return self.blocks[0]
+        if index < len(self.blocks):
+            return self.blocks[index]
+        return label
+
+
+def main() -> int:
+    from .catalog import read_hours_csv, unit_index
+    from .paths import DATA_DIR
+
+    parser = argparse.ArgumentParser(description="Report how optional-entry unit names resolve to hours CSV units.")
+    parser.add_argument("curriculum_id", help="provider directory under data/, e.g. gatherround")
+    args = parser.parse_args()
+
+    provider_dir = DATA_DIR / args.curriculum_id
+    units = unit_index(read_hours_csv(provider_dir / "unit_subcategory_hours.csv"))
+    queries = 0
+    for path in sorted((provider_dir / "optional-entries-by-type").glob("*.json")):
+        for entry in json.loads(path.read_text(encoding="utf-8")):
+            units.match(entry.get("unit") or "")
+            queries += 1
+
+    lines = units.report()
+    for line in lines:
+        print(line)
+    print(f"{queries} lookups against {len(units)} units, {len(lines)} non-exact")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Year-assignment optimizer for four-year plans.
+
+Given a curriculum (curriculum_pipeline.credits.CurriculumModel), places units
+in years 1-4 so the plan meets its graduation credits and per-category
+minimums (rolled-up categories, as in the tally bar) with an even load per
+year. Units in locked years stay where they are and nothing moves into a
+locked year. With --plan, the candidates are the plan's curriculum units
+(with its option choices and included items), its assignments are the
+starting point and its lockedYears and config apply; otherwise every unit of
+--curriculum is a candidate. A stored plan refers to option groups and items
+by database id, so --plan needs the curriculum from the database
+(--database-url, read from unit_hours_summary) or an export of it (--summary,
+as in curriculum_pipeline.credits); ids the plan uses that the curriculum does
+not have are reported.
+
+The score, in credits, is
+
+    SHORT_WEIGHT * (credits short of the graduation and category minimums)
+  + EXTRA_WEIGHT * (credits beyond the graduation minimum)
+  + BALANCE_WEIGHT * sum over years of (year credits - mean year credits)^2
+
+and the search is greedy local search with incremental scoring: each step
+scores every single-unit move (to another year, or out of the plan) as one
+array operation from the current year and category totals, takes the best
+improving one, and falls back to the best pairwise swap when no move helps
+(swaps between two years are scored in closed form from the year loads).
+--place-all keeps every candidate in some year.
+
+Usage (from scripts/):
+    python -m curriculum_pipeline.optimize [--curriculum gatherround] [--min-credits 25] \
+        [--category-min Science=3 ...] [--lock 1] [--place-all] [--out plan.json] [--json]
+    python -m curriculum_pipeline.optimize --plan plan.json (--database-url URL | --summary summary.json) [--out plan.json]
+"""
+
+import argparse
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .credits import (
+    CurriculumModel,
+    _category_minimum,
+    load_model,
+    plan_rows,
+    unit_adjustments,
+    unresolved_report,
+)
+from .plan_data import DEFAULT_HOURS_PER_CREDIT, DEFAULT_MIN_CREDITS, YEARS, normalize_plan_data
+
+if TYPE_CHECKING:
+    import numpy as np
+
+SHORT_WEIGHT = 100.0
+EXTRA_WEIGHT = 1.0
+BALANCE_WEIGHT = 1.0
+# Moves must improve the score by more than this (stops float-noise cycling)
+MIN_GAIN = 1e-9
+
+
+@dataclass(frozen=True)
+class Targets:
+    hours_per_credit: float = DEFAULT_HOURS_PER_CREDIT
+    min_credits: float = DEFAULT_MIN_CREDITS
+    category_min: dict[str, float] = field(default_factory=dict)  # rolled-up category -> credits
+
+
+@dataclass(frozen=True, eq=False)
+class Problem:
+    """Candidate units as arrays: hours[u, r] is unit u's hours in rolled-up category r."""
+
+    units: tuple[tuple[str, str], ...]  # (curriculum_id, unit)
+    rollups: tuple[str, ...]
+    hours: "np.ndarray"  # (units, rollups)
+    start: "np.ndarray"  # (units,) year 1-4, 0 = not placed
+    locked: frozenset[int]
+
+    @classmethod
+    def from_model(
+        cls,
+        model: CurriculumModel,
+        plan: dict | None = None,
+        locked: frozenset[int] = frozenset(),
+        unresolved: dict[str, set[str]] | None = None,
+    ) -> "Problem":
+        """
+        All of the model's units, or a normalized plan's curriculum units with
+        its choices and items (ids the model lacks go to unresolved).
+        """
+        import numpy as np
+
+        rollups, rollup_matrix = model.rollups()
+        if plan is None:
+            keys = list(model.rows)
+            rows = [model.rows[k] for k in keys]
+            hours = model.default_hours[rows]
+            start = np.zeros(len(keys), dtype=np.int8)
+        else:
+            unit_rows = plan_rows(model, plan)
+            key_of = {row: key for key, row in model.rows.items()}
+            keys = [key_of[row] for row in unit_rows.values()]
+            hours = model.default_hours[list(unit_rows.values())].copy()
+            start = np.zeros(len(keys), dtype=np.int8)
+            for i, (unit, row) in enumerate(unit_rows.items()):
+                for category, delta in unit_adjustments(model, plan, unit, row, unresolved):
+                    hours[i, category] += delta
+                year = plan["assignments"].get(unit)
+                if year in YEARS:
+                    start[i] = int(year)
+            locked = locked | frozenset(int(y) for y in plan["lockedYears"] if y in YEARS)
+        return cls(tuple(keys), rollups, hours @ rollup_matrix, start, locked)
+
+
+@dataclass(frozen=True, eq=False)
+class Solution:
+    problem: Problem
+    years: "np.ndarray"  # (units,) 0 = not placed
+    year_credits: "np.ndarray"  # (4,)
+    category_credits: "np.ndarray"  # (rollups,)
+    score: float
+    short_credits: float
+    steps: int
+    seconds: float
+
+    def assignments(self) -> dict[str, int]:
+        """unit -> year, grouped by year in candidate order (the plan's assignments/unitOrderByYear order)."""
+        order = sorted(range(len(self.years)), key=lambda i: (self.years[i], i))
+        return {self.problem.units[i][1]: int(self.years[i]) for i in order if self.years[i]}
+
+
+def _scores(loads: "np.ndarray", cats: "np.ndarray", targets: Targets, cat_targets: "np.ndarray") -> "np.ndarray":
+    """Score for stacks of candidate states: loads (..., 4) and category totals (..., rollups), in hours."""
+    import numpy as np
+
+    hpc = targets.hours_per_credit
+    total = loads.sum(axis=-1)
+    goal = targets.min_credits * hpc
+    short = np.maximum(cat_targets - cats, 0).sum(axis=-1) + np.maximum(goal - total, 0)
+    extra = np.maximum(total - goal, 0)
+    spread = ((loads - total[..., None] / len(YEARS)) ** 2).sum(axis=-1)
+    return (SHORT_WEIGHT * short + EXTRA_WEIGHT * extra) / hpc + BALANCE_WEIGHT * spread / (hpc * hpc)
+
+
+def _best_swap(cur, idx, loads, cats, unit_hours, hours, targets, cat_targets, one_hot) -> tuple[float, tuple | None]:
+    """
+    (score after, (unit i, unit j)) for the best swap of two movable units in
+    different years, or in and out of the plan. Two placed units only shift
+    load between their years (totals and categories stay put), so that block
+    is a closed-form change in spread; placed/unplaced pairs are scored in full.
+    """
+    import numpy as np
+
+    hpc = targets.hours_per_credit
+    score = float(_scores(loads, cats, targets, cat_targets))
+    best, pair = np.inf, None
+    placed, out = idx[cur > 0], idx[cur == 0]
+
+    if len(placed) > 1:
+        a = cur[cur > 0].astype(np.intp) - 1
+        d = unit_hours[placed][None, :] - unit_hours[placed][:, None]  # v's hours - u's
+        spread_change = 2 * d * (loads[a][:, None] - loads[a][None, :]) + 2 * d * d
+        change = BALANCE_WEIGHT * spread_change / (hpc * hpc)
+        change[a[:, None] == a[None, :]] = np.inf
+        k = int(change.argmin())
+        if score + change.flat[k] < best:
+            u, v = divmod(k, len(placed))
+            best, pair = score + float(change.flat[k]), (placed[u], placed[v])
+
+    if len(placed) and len(out):
+        a = cur[cur > 0]
+        d = (unit_hours[out][None, :] - unit_hours[placed][:, None])[..., None]
+        swap_loads = loads + d * one_hot[a][:, None, :]
+        swap_cats = cats + hours[out][None, :, :] - hours[placed][:, None, :]
+        scores = _scores(swap_loads, swap_cats, targets, cat_targets)
+        k = int(scores.argmin())
+        if scores.flat[k] < best:
+            u, v = divmod(k, len(out))
+            best, pair = float(scores.flat[k]), (placed[u], out[v])
+    return best, pair
+
+
+def optimize(
+    problem: Problem, targets: Targets, place_all: bool = False, max_steps: int | None = None
+) -> Solution:
+    import numpy as np
+
+    started = time.perf_counter()
+    hours = problem.hours
+    unit_hours = hours.sum(axis=1)
+    n = len(problem.units)
+    cat_targets = np.array([targets.category_min.get(r, 0.0) for r in problem.rollups]) * targets.hours_per_credit
+    # Minimums for categories the catalog does not have can never be met; they still count as short
+    missing_short = sum(v for k, v in targets.category_min.items() if k not in problem.rollups)
+
+    years = problem.start.copy()
+    movable = np.array([y not in problem.locked for y in years.tolist()])
+    open_years = [y for y in YEARS if y not in problem.locked]
+    destinations = np.array(open_years + ([] if place_all else [0]), dtype=np.int8)
+    if place_all and open_years:
+        # Everything starts placed, dealt round-robin over the open years
+        for i in np.flatnonzero(movable & (years == 0)).tolist():
+            years[i] = open_years[i % len(open_years)]
+
+    # one_hot[y] is the load vector of one hour in year y (year 0 = not placed)
+    one_hot = np.vstack([np.zeros(len(YEARS)), np.eye(len(YEARS))])
+    loads = np.zeros(len(YEARS))
+    np.add.at(loads, years[years > 0] - 1, unit_hours[years > 0])
+    cats = hours[years > 0].sum(axis=0)
+    score = float(_scores(loads, cats, targets, cat_targets))
+
+    idx = np.flatnonzero(movable)
+    max_steps = max_steps if max_steps is not None else 20 * n + 100
+    steps = 0
+    while steps < max_steps and len(idx) and len(destinations):
+        steps += 1
+        cur = years[idx]
+        h = unit_hours[idx][:, None, None]
+        # Single moves: (movable units, destinations)
+        move_loads = loads - h * one_hot[cur][:, None, :] + h * one_hot[destinations][None, :, :]
+        placed = (destinations > 0)[None, :, None].astype(float) - (cur > 0)[:, None, None]
+        move_cats = cats + placed * hours[idx][:, None, :]
+        move_scores = _scores(move_loads, move_cats, targets, cat_targets)
+        move_scores[cur[:, None] == destinations[None, :]] = np.inf
+        best = int(move_scores.argmin())
+        u, d = divmod(best, len(destinations))
+        if move_scores.flat[best] < score - MIN_GAIN:
+            i, year = idx[u], int(destinations[d])
+            loads += unit_hours[i] * (one_hot[year] - one_hot[years[i]])
+            cats += (int(year > 0) - int(years[i] > 0)) * hours[i]
+            years[i] = year
+            score = float(move_scores.flat[best])
+            continue
+
+        best_score, pair = _best_swap(years[idx], idx, loads, cats, unit_hours, hours, targets, cat_targets, one_hot)
+        if pair is None or best_score >= score - MIN_GAIN:
+            break
+        i, j = pair
+        loads += (unit_hours[j] - unit_hours[i]) * (one_hot[years[i]] - one_hot[years[j]])
+        cats += (int(years[i] > 0) - int(years[j] > 0)) * (hours[j] - hours[i])
+        years[i], years[j] = years[j], years[i]
+        score = best_score
+
+    hpc = targets.hours_per_credit
+    total = loads.sum() / hpc
+    short = float(np.maximum(cat_targets - cats, 0).sum() / hpc) + max(0.0, targets.min_credits - total) + missing_short
+    return Solution(
+        problem, years, loads / hpc, cats / hpc, score, short, steps, time.perf_counter() - started,
+    )
+
+
+def to_plan_data(solution: Solution, targets: Targets, base: dict | None = None) -> dict:
+    """PlanData JSON with the solution's assignments (over base, a normalized plan, when given)."""
+    data = dict(base or {})
+    data["assignments"] = solution.assignments()
+    if not base:
+        data["curriculumUnits"] = [{"curriculumId": c, "unit": u} for c, u in solution.problem.units]
+        data["lockedYears"] = sorted(solution.problem.locked)
+    data["unitOrderByYear"] = {}
+    data["config"] = {"hoursPerCredit": targets.hours_per_credit, "minCreditsForGraduation": targets.min_credits}
+    return normalize_plan_data(data)
+
+
+def describe(solution: Solution, targets: Targets) -> dict:
+    return {
+        "score": round(solution.score, 6),
+        "short_credits": round(solution.short_credits, 4),
+        "steps": solution.steps,
+        "seconds": round(solution.seconds, 4),
+        "placed": int((solution.years > 0).sum()),
+        "candidates": len(solution.years),
+        "year_credits": {str(y): round(float(c), 4) for y, c in zip(YEARS, solution.year_credits.tolist())},
+        "total_credits": round(float(solution.year_credits.sum()), 4),
+        "category_credits": {
+            r: round(float(c), 4) for r, c in zip(solution.problem.rollups, solution.category_credits.tolist()) if c
+        },
+        "category_minimums": targets.category_min,
+        "min_credits": targets.min_credits,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Assign units to years to meet credit targets with an even load.")
+    parser.add_argument("--curriculum", action="append", help="curriculum ids (default: the plan's, or gatherround)")
+    parser.add_argument("--plan", type=Path, help="PlanData JSON (or a planner_plans row with data) to start from")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--database-url", help="read the curriculum from unit_hours_summary in Postgres")
+    source.add_argument(
+        "--summary", action="append", type=Path, default=[], metavar="FILE",
+        help="unit_hours_summary export or database bundle to take the curriculum from (repeatable)",
+    )
+    parser.add_argument("--hours-per-credit", type=float, help=f"default: the plan's, else {DEFAULT_HOURS_PER_CREDIT}")
+    parser.add_argument("--min-credits", type=float, help=f"graduation minimum (default: the plan's, else {DEFAULT_MIN_CREDITS})")
+    parser.add_argument(
+        "--category-min", action="append", type=_category_minimum, default=[], metavar="CATEGORY=CREDITS",
+        help="minimum credits for a rolled-up category (repeatable)",
+    )
+    parser.add_argument("--lock", action="append", type=int, choices=YEARS, default=[], help="keep this year as it is")
+    parser.add_argument("--place-all", action="store_true", help="put every candidate unit in some year")
+    parser.add_argument("--out", type=Path, help="write the resulting PlanData JSON here")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    args = parser.parse_args()
+
+    plan = None
+    if args.plan:
+        raw = json.loads(args.plan.read_text(encoding="utf-8"))
+        plan = normalize_plan_data(raw.get("data") if isinstance(raw, dict) and "data" in raw else raw)
+    curriculum_ids = args.curriculum or (
+        sorted({ref["curriculumId"] for ref in plan["curriculumUnits"]}) if plan else ["gatherround"]
+    )
+    config = plan["config"] if plan else {}
+    targets = Targets(
+        hours_per_credit=args.hours_per_credit or config.get("hoursPerCredit", DEFAULT_HOURS_PER_CREDIT),
+        min_credits=args.min_credits if args.min_credits is not None else config.get("minCreditsForGraduation", DEFAULT_MIN_CREDITS),
+        category_min=dict(args.category_min),
+    )
+    if targets.hours_per_credit <= 0:
+        parser.error("--hours-per-credit must be positive")
+
+    if plan is not None and not (args.database_url or args.summary):
+        parser.error("--plan needs --database-url or --summary: plans store database ids, which data/ catalogs do not have")
+    if args.database_url:
+        try:
+            import psycopg
+        except ImportError:
+            raise SystemExit("Install psycopg to read the curriculum from Postgres: pip install psycopg")
+        with psycopg.connect(args.database_url) as conn:
+            model = load_model(curriculum_ids, conn=conn)
+    else:
+        model = load_model(curriculum_ids, args.summary)
+    unresolved: dict[str, set[str]] = {}
+    problem = Problem.from_model(model, plan, frozenset(args.lock), unresolved)
+    if not problem.units:
+        raise SystemExit("No candidate units (does the curriculum have the plan's units?)")
+    solution = optimize(problem, targets, args.place_all)
+    result = describe(solution, targets)
+
+    if args.out:
+        args.out.write_text(json.dumps(to_plan_data(solution, targets, plan), indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    if args.json:
+        print(json.dumps(
+            {**result, "assignments": solution.assignments(), "unresolved_ids": unresolved_report(unresolved)},
+            indent=2, ensure_ascii=False,
+        ))
+        return 0
+    for year in YEARS:
+        units = [u for u, y in solution.assignments().items() if y == year]
+        lock = " (locked)" if year in problem.locked else ""
+        print(f"Year {year}{lock}: {result['year_credits'][str(year)]:.2f} cr  {', '.join(units)}")
+    categories = ", ".join(f"{r} {c:g}" for r, c in result["category_credits"].items())
+    print(f"Total: {result['total_credits']:.2f} / {targets.min_credits:g} cr; {categories}")
+    print(
+        f"{result['placed']} of {result['candidates']} units placed in {solution.seconds * 1000:.1f} ms "
+        f"({solution.steps} steps); {result['short_credits']:g} credits short of the targets"
+    )
+    for kind, ids in unresolved_report(unresolved).items():
+        print(f"  {ids['count']} {kind.replace('_', ' ')} ids in the plan match nothing in the curriculum (ignored): "
+              + ", ".join(ids["ids"]) + (" ..." if ids["count"] > len(ids["ids"]) else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,9 @@
+"""Well-known repository locations, so scripts do not depend on the working directory."""
+
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+DATA_DIR = REPO_ROOT / "data"
+MIGRATIONS_DIR = REPO_ROOT / "supabase" / "migrations"
+APP_DIR = REPO_ROOT / "app"
+SCRIPTS_DIR = REPO_ROOT / "scripts"
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Run the Gather Round data pipeline as one dependency graph.
+
+Each stage is a curriculum_pipeline.cli command with declared input and output
+files; a stage depends on whichever stages produce its inputs. Independent
+stages run concurrently in forked worker processes, which start with the
+interpreter and imports already loaded (--isolated runs each stage in a fresh
+interpreter instead), and a stage is skipped when its inputs and script are
+unchanged (the command's script and the whole curriculum_pipeline
+package) since it last ran and its outputs still exist (content hashes in
+.pipeline-cache/pipeline.json; CURRICULUM_PIPELINE_NO_CACHE=1 or --force
+reruns everything).
+
+  hours                  year sheets -> unit_subcategory_hours.csv
+  entries *              year sheets -> gatherround-optional-entries.json
+  split *                optional entries -> optional-entries-by-type/*.json
+  validate               year sheets + by-type JSON -> .pipeline-cache/validation/gatherround.json
+  seed-hours             hours CSV -> migration seed_unit_subcategory_hours
+  seed-labs              labs.json + hours CSV -> migration seed_optional_labs
+  seed-required-reading  required-reading.json + hours CSV -> migration seed_required_reading
+  bundle                 hours CSV + by-type JSON -> .pipeline-cache/bundles/gatherround.json
+
+* entries and split overwrite hand-annotated files, so they only run when
+named on the command line; otherwise their outputs are treated as sources.
+
+The seed and bundle stages take the validation report as an input, so they
+run after validate and are blocked when it finds errors
+(curriculum_pipeline.validate). The bundle stage only previews the encoding;
+the app's bundle is exported from the database after the seeds are applied
+(curriculum_pipeline.bundle --database-url).
+
+Seed stages write their SQL as <timestamp>_<name>.sql to
+.pipeline-cache/migrations/ for review; only --write-migrations (or an
+explicit --migrations-dir) puts them in supabase/migrations/. A new migration
+is only written when the SQL differs from the newest existing *_<name>.sql.
+The default --format bulk merges on each table's natural key
+(catalog.NATURAL_KEYS): applying it again updates the rows it matches instead
+of duplicating them, but rows dropped from data/ stay in the database (use
+curriculum_pipeline.diff for updates). --format insert appends rows
+unconditionally, so it is only for an empty database.
+
+Usage (from scripts/, or scripts/curriculum-pipeline run ... from anywhere):
+    python -m curriculum_pipeline run [STAGE ...] [--jobs N] [--format bulk] [--dry-run] [--write-migrations]
+    python -m curriculum_pipeline run --list
+"""
+
+import argparse
+import io
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from multiprocessing import get_all_start_methods, get_context
+from pathlib import Path
+
+from . import cli, instrument
+from .cache import CACHE_DIR, BuildCache, code_version, package_sources
+from .ingest import find_year_sheets
+from .layout import layout_path, load_layout
+from .paths import DATA_DIR, MIGRATIONS_DIR, SCRIPTS_DIR
+from .seed_writer import FORMATS
+from .split import bucket_paths
+
+CURRICULUM_ID = "gatherround"
+PREVIEW_MIGRATIONS_DIR = CACHE_DIR / "migrations"
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    command: tuple[str, ...]  # curriculum_pipeline.cli command and its arguments
+    inputs: tuple[Path, ...]
+    outputs: tuple[Path, ...] = ()
+    sources: tuple[Path, ...] = ()  # code whose changes invalidate the stage
+    migration: str | None = None  # stdout becomes <timestamp>_<migration>.sql
+    explicit: bool = False  # only run when named
+
+
+@dataclass
+class StageResult:
+    stage: Stage
+    status: str  # "ran" | "skipped" | "unchanged" | "failed" | "blocked"
+    seconds: float = 0.0
+    outputs: list[Path] = field(default_factory=list)
+    error: str | None = None
+
+
+def build_stages(seed_format: str = "bulk", data_dir: Path = DATA_DIR) -> list[Stage]:
+    provider_dir = data_dir / CURRICULUM_ID
+    layout_file = layout_path(provider_dir)
+    sheets = tuple(path for _, path in find_year_sheets(provider_dir, load_layout(provider_dir)))
+    if layout_file.exists():
+        sheets += (layout_file,)
+    hours_csv = provider_dir / "unit_subcategory_hours.csv"
+    entries_json = provider_dir / f"{CURRICULUM_ID}-optional-entries.json"
+    by_type = provider_dir / "optional-entries-by-type"
+    report = CACHE_DIR / "validation" / f"{CURRICULUM_ID}.json"
+    fmt = ("--format", seed_format)
+
+    def code(command: str) -> tuple[Path, ...]:
+        """The command's script (if it is one) plus every package module, since modules import each other."""
+        target = cli.COMMANDS[command].target
+        script = () if target.startswith(".") else (SCRIPTS_DIR / target,)
+        return (*script, *package_sources())
+
+    return [
+        Stage("hours", ("parse",), sheets, (hours_csv,), code("parse")),
+        Stage("entries", ("entries",), sheets, (entries_json,), code("entries"), explicit=True),
+        Stage(
+            "split", ("split",), (entries_json,), tuple(bucket_paths(by_type)),
+            code("split"), explicit=True,
+        ),
+        Stage(
+            "validate", ("validate", CURRICULUM_ID, "--out", str(report)),
+            (*sheets, by_type / "labs.json", by_type / "required-reading.json"), (report,),
+            code("validate"),
+        ),
+        Stage(
+            "seed-hours", ("seed-hours", *fmt), (hours_csv, report),
+            sources=code("seed-hours"), migration="seed_unit_subcategory_hours",
+        ),
+        Stage(
+            "seed-labs", ("seed-labs", *fmt), (by_type / "labs.json", hours_csv, report),
+            sources=code("seed-labs"), migration="seed_optional_labs",
+        ),
+        Stage(
+            "seed-required-reading", ("seed-required-reading", *fmt),
+            (by_type / "required-reading.json", hours_csv, report),
+            sources=code("seed-required-reading"), migration="seed_required_reading",
+        ),
+        Stage(
+            "bundle", ("bundle", CURRICULUM_ID), (hours_csv, *bucket_paths(by_type), report),
+            (CACHE_DIR / "bundles" / f"{CURRICULUM_ID}.json",),
+            code("bundle"),
+        ),
+    ]
+
+
+def dependencies(stages: list[Stage]) -> dict[str, set[str]]:
+    """stage name -> names of the stages that produce its inputs."""
+    producers = {path: s.name for s in stages for path in s.outputs}
+    deps = {}
+    for s in stages:
+        deps[s.name] = {producers[p] for p in s.inputs if p in producers and producers[p] != s.name}
+    return deps
+
+
+def select(stages: list[Stage], targets: list[str]) -> list[Stage]:
+    """
+    The stages needed for targets (all implicit stages by default), in
+    declaration order. Explicit stages are only included when named.
+    """
+    by_name = {s.name: s for s in stages}
+    unknown = [t for t in targets if t not in by_name]
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(unknown)} (choose from {', '.join(by_name)})")
+    deps = dependencies(stages)
+    named = set(targets)
+    wanted: set[str] = set()
+    pending = list(targets or [s.name for s in stages if not s.explicit])
+    while pending:
+        name = pending.pop()
+        if name in wanted:
+            continue
+        if by_name[name].explicit and name not in named:
+            continue
+        wanted.add(name)
+        pending.extend(deps[name])
+    if targets:
+        # Anything downstream of a named stage is stale once it runs
+        changed = True
+        while changed:
+            changed = False
+            for s in stages:
+                if s.name not in wanted and not s.explicit and deps[s.name] & wanted & named:
+                    wanted.add(s.name)
+                    named.add(s.name)
+                    changed = True
+    return [s for s in stages if s.name in wanted]
+
+
+class Pipeline:
+    def __init__(
+        self,
+        stages: list[Stage],
+        migrations_dir: Path = PREVIEW_MIGRATIONS_DIR,
+        force: bool = False,
+        jobs: int | None = None,
+        isolated: bool = False,
+    ) -> None:
+        self.stages = stages
+        self.migrations_dir = migrations_dir
+        self.force = force
+        self.jobs = jobs or min(4, os.cpu_count() or 1)
+        self.cache = BuildCache("pipeline", code_version(Path(__file__)))
+        self.isolated = isolated
+        # One timestamp per run; migrations are spaced a second apart so their order is stable
+        self.stamp = datetime.now(timezone.utc).replace(microsecond=0)
+
+    def _key(self, stage: Stage) -> str:
+        key = f"{stage.name}:{' '.join(stage.command)}"
+        return f"{key}:{self.migrations_dir}" if stage.migration else key
+
+    def _fingerprint_inputs(self, stage: Stage) -> list[Path]:
+        return [*stage.inputs, *stage.sources]
+
+    def up_to_date(self, stage: Stage) -> list[Path] | None:
+        """Outputs from the previous run if nothing it depends on changed, else None."""
+        if self.force:
+            return None
+        missing = [p for p in stage.inputs if not p.exists()]
+        if missing:
+            return None
+        cached = self.cache.get(self._key(stage), self._fingerprint_inputs(stage))
+        if cached is None:
+            return None
+        outputs = [Path(p) for p in cached["outputs"]]
+        return outputs if all(p.exists() for p in outputs) else None
+
+    def migration_path(self, stage: Stage) -> Path:
+        index = [s.name for s in self.stages].index(stage.name)
+        stamp = (self.stamp + timedelta(seconds=index)).strftime("%Y%m%d%H%M%S")
+        return self.migrations_dir / f"{stamp}_{stage.migration}.sql"
+
+    def finish(self, stage: Stage, status: int, stdout: str, stderr: str, seconds: float) -> StageResult:
+        if status != 0:
+            detail = (stderr or stdout).strip().splitlines()
+            return StageResult(stage, "failed", seconds, error=detail[-1] if detail else f"exit {status}")
+        result = "ran"
+        outputs = list(stage.outputs)
+        if stage.migration:
+            result, path = self._write_migration(stage, stdout)
+            outputs = [path]
+        self.cache.put(self._key(stage), self._fingerprint_inputs(stage), {"outputs": [str(p) for p in outputs]})
+        return StageResult(stage, result, seconds, outputs)
+
+    def latest_migration(self, stage: Stage) -> Path | None:
+        existing = sorted(self.migrations_dir.glob(f"*_{stage.migration}.sql"))
+        return existing[-1] if existing else None
+
+    def _write_migration(self, stage: Stage, sql: str) -> tuple[str, Path]:
+        """Write stdout as a new migration unless the newest one for this stage already has it."""
+        previous = self.latest_migration(stage)
+        if previous is not None and previous.read_text(encoding="utf-8") == sql:
+            return "unchanged", previous
+        path = self.migration_path(stage)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".sql.tmp")
+        tmp.write_text(sql, encoding="utf-8")
+        tmp.replace(path)
+        return "ran", path
+
+    def _executor(self) -> Executor:
+        if not self.isolated and "fork" in get_all_start_methods():
+            # Forked workers start with this interpreter and its imports already loaded
+            return ProcessPoolExecutor(max_workers=self.jobs, mp_context=get_context("fork"))
+        return ThreadPoolExecutor(max_workers=self.jobs)
+
+    def run(self) -> list[StageResult]:
+        """Run every stage once its dependencies finish; a failure blocks only its dependents."""
+        deps = dependencies(self.stages)
+        names = {s.name for s in self.stages}
+        waiting = {s.name: deps[s.name] & names for s in self.stages}
+        by_name = {s.name: s for s in self.stages}
+        results: dict[str, StageResult] = {}
+
+        def record(result: StageResult) -> None:
+            results[result.stage.name] = result
+            report(result)
+
+        with self._executor() as pool:
+            worker = execute_isolated if isinstance(pool, ThreadPoolExecutor) else execute_stage
+            running: dict[Future, tuple[Stage, float]] = {}
+            while waiting or running:
+                for name in [n for n, d in waiting.items() if all(x in results for x in d)]:
+                    del waiting[name]
+                    stage = by_name[name]
+                    failed = [d for d in deps[name] if d in results and results[d].status in ("failed", "blocked")]
+                    if failed:
+                        record(StageResult(stage, "blocked", error=f"{failed[0]} failed"))
+                        continue
+                    outputs = self.up_to_date(stage)
+                    if outputs is not None:
+                        record(StageResult(stage, "skipped", 0.0, outputs))
+                        continue
+                    missing = [p for p in stage.inputs if not p.exists()]
+                    if missing:
+                        record(StageResult(stage, "failed", error=f"missing input {missing[0]}"))
+                        continue
+                    running[pool.submit(worker, stage.command)] = (stage, time.perf_counter())
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, started = running.pop(future)
+                    seconds = time.perf_counter() - started
+                    try:
+                        status, stdout, stderr = future.result()
+                    except Exception as e:
+                        record(StageResult(stage, "failed", seconds, error=f"{type(e).__name__}: {e}"))
+                        continue
+                    with instrument.span("stage", stage=stage.name) as span:
+                        span.set(returncode=status, worker_ms=round(seconds * 1000, 3))
+                        record(self.finish(stage, status, stdout, stderr, seconds))
+        self.cache.save()
+        return [results[s.name] for s in self.stages]
+
+
+def execute_stage(command: tuple[str, ...]) -> tuple[int, str, str]:
+    """Worker: run a CLI command in this process, capturing (status, stdout, stderr)."""
+    out, err = io.StringIO(), io.StringIO()
+    with redirect_stdout(out), redirect_stderr(err):
+        status = cli.dispatch(list(command))
+    return status, out.getvalue(), err.getvalue()
+
+
+def execute_isolated(command: tuple[str, ...]) -> tuple[int, str, str]:
+    """Run a CLI command in a fresh interpreter (--isolated, or where fork is unavailable)."""
+    proc = subprocess.run(
+        [sys.executable, "-m", "curriculum_pipeline", *command],
+        cwd=SCRIPTS_DIR,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+    )
+    return proc.returncode, proc.stdout, proc.stderr
+
+
+def report(result: StageResult) -> None:
+    outputs = ", ".join(_display(p) for p in result.outputs)
+    line = f"{result.status:>9}  {result.stage.name:<22} {result.seconds:6.2f}s"
+    if result.error:
+        line += f"  {result.error}"
+    elif outputs:
+        line += f"  {outputs}"
+    print(line, flush=True)
+
+
+def _display(path: Path) -> str:
+    try:
+        return str(path.relative_to(SCRIPTS_DIR.parent))
+    except ValueError:
+        return str(path)
+
+
+def print_plan(stages: list[Stage], pipeline: Pipeline) -> None:
+    deps = dependencies(stages)
+    stale: set[str] = set()
+    for s in stages:
+        if deps[s.name] & stale or pipeline.up_to_date(s) is None:
+            stale.add(s.name)
+        state = "would run" if s.name in stale else "up to date"
+        after = ", ".join(sorted(deps[s.name] & {x.name for x in stages}))
+        target = _display(pipeline.migration_path(s)) if s.migration else ", ".join(_display(p) for p in s.outputs)
+        print(f"{s.name:<22} {state:<11} {'after ' + after if after else '':<20} -> {target}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the curriculum data pipeline.")
+    parser.add_argument("stages", nargs="*", help="stages to run (default: all except entries/split)")
+    parser.add_argument("--format", choices=FORMATS, default="bulk", help="seed SQL format")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="stages to run at once")
+    parser.add_argument("--force", action="store_true", help="rerun stages even if up to date")
+    parser.add_argument("--isolated", action="store_true", help="run each stage in a fresh interpreter")
+    parser.add_argument(
+        "--write-migrations", action="store_true",
+        help="write seed SQL to supabase/migrations (default: .pipeline-cache/migrations)",
+    )
+    parser.add_argument("--migrations-dir", type=Path, help="write seed SQL here instead")
+    parser.add_argument("--dry-run", action="store_true", help="show what would run and exit")
+    parser.add_argument("--list", action="store_true", help="list stages with their inputs and outputs")
+    instrument.add_arguments(parser)
+    args = parser.parse_args()
+
+    stages = build_stages(args.format)
+    if args.list:
+        for s in stages:
+            print(f"{s.name}{' (explicit)' if s.explicit else ''}")
+            print(f"  inputs:  {', '.join(_display(p) for p in s.inputs)}")
+            print(f"  outputs: {'supabase migration ' + s.migration if s.migration else ', '.join(_display(p) for p in s.outputs)}")
+        return 0
+    try:
+        selected = select(stages, args.stages)
+    except ValueError as e:
+        raise SystemExit(str(e))
+
+    migrations_dir = args.migrations_dir or (MIGRATIONS_DIR if args.write_migrations else PREVIEW_MIGRATIONS_DIR)
+    pipeline = Pipeline(selected, migrations_dir.resolve(), args.force, args.jobs, args.isolated)
+    if args.dry_run:
+        print_plan(selected, pipeline)
+        return 0
+    with instrument.session("pipeline", args, stages=[s.name for s in selected]) as run:
+        results = pipeline.run()
+        run.set(failed=[r.stage.name for r in results if r.status in ("failed", "blocked")])
+    return 1 if any(r.status in ("failed", "blocked") for r in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
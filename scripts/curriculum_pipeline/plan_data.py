@@ -0,0 +1,143 @@
+"""
+planner_plans.data payloads, read the way the app reads them.
+
+normalize_plan_data mirrors normalizePlanData in app/src/planStorage.ts so
+batch tools see the same assignments, curriculum units and config the planner
+would show for a stored plan. Keep the two in step.
+"""
+
+from typing import Any
+
+DEFAULT_HOURS_PER_CREDIT = 120  # app/src/types.ts
+DEFAULT_MIN_CREDITS = 25
+# Plans saved before curriculumUnits existed only used Gather Round units
+LEGACY_CURRICULUM_ID = "gatherround"
+YEARS = (1, 2, 3, 4)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _number_or(value: Any, default: float) -> float:
+    """JavaScript `Number(value) || default`."""
+    if isinstance(value, bool):
+        number = float(value)
+    elif _is_number(value):
+        number = float(value)
+    elif isinstance(value, str):
+        try:
+            number = float(value.strip() or 0)
+        except ValueError:
+            return default
+    else:
+        return default
+    if number != number or number == 0:  # NaN or 0
+        return default
+    return int(number) if number.is_integer() else number
+
+
+def _js_string(value: Any) -> str:
+    """JavaScript `String(value ?? '')` for JSON values."""
+    if isinstance(value, str):
+        return value
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _coalesce(value: Any, default: Any) -> Any:
+    """JavaScript `value ?? default`."""
+    return default if value is None else value
+
+
+def _object(value: Any) -> dict:
+    return value if isinstance(value, dict) else {}
+
+
+def normalize_assignments(raw: Any) -> dict[str, int | float]:
+    return {unit: year for unit, year in _object(raw).items() if _is_number(year) and 1 <= year <= 4}
+
+
+def normalize_locked_years(raw: Any) -> list:
+    if not isinstance(raw, list):
+        return []
+    return [year for year in raw if _is_number(year) and 1 <= year <= 4]
+
+
+def normalize_unit_order_by_year(raw: Any, assignments: dict) -> dict[str, list[str]]:
+    if not isinstance(raw, dict):
+        return {}
+    units_by_year: dict[int, list[str]] = {year: [] for year in YEARS}
+    for unit, year in assignments.items():
+        if year in units_by_year:
+            units_by_year[year].append(unit)
+    out = {}
+    for year in YEARS:
+        listed = raw.get(str(year))
+        if not isinstance(listed, list):
+            continue
+        in_year = set(units_by_year[year])
+        ordered = list(dict.fromkeys(u for u in listed if isinstance(u, str) and u in in_year))
+        seen = set(ordered)
+        ordered += [u for u in units_by_year[year] if u not in seen]
+        if ordered:
+            out[str(year)] = ordered
+    return out
+
+
+def normalize_curriculum_units(raw: Any) -> list[dict[str, str]]:
+    if not isinstance(raw, list):
+        return []
+    out = []
+    seen = set()
+    for entry in raw:
+        if not isinstance(entry, dict):
+            continue
+        curriculum_id = entry.get("curriculumId")
+        unit = entry.get("unit")
+        # Stored values are almost always strings already
+        curriculum_id = (curriculum_id if isinstance(curriculum_id, str) else _js_string(curriculum_id)).strip()
+        unit = (unit if isinstance(unit, str) else _js_string(unit)).strip()
+        if not curriculum_id or not unit or (curriculum_id, unit) in seen:
+            continue
+        seen.add((curriculum_id, unit))
+        out.append({"curriculumId": curriculum_id, "unit": unit})
+    return out
+
+
+def normalize_plan_data(data: Any) -> dict:
+    """PlanData for a stored payload (normalizePlanData in planStorage.ts)."""
+    data = _object(data)
+    assignments = normalize_assignments(data.get("assignments"))
+    option_choices = _coalesce(data.get("optionChoices"), {})
+    included = _coalesce(data.get("includedOptionalItems"), {})
+    group_hours = _coalesce(data.get("optionGroupHoursOverride"), {})
+    item_hours = _coalesce(data.get("optionalItemHoursOverride"), {})
+    curriculum_units = normalize_curriculum_units(data.get("curriculumUnits"))
+    if not curriculum_units:
+        inferred = dict.fromkeys(
+            unit
+            for source in (assignments, option_choices, included, group_hours, item_hours)
+            for unit in _object(source)
+        )
+        curriculum_units = [{"curriculumId": LEGACY_CURRICULUM_ID, "unit": unit} for unit in inferred]
+    config = _object(data.get("config"))
+    return {
+        "assignments": assignments,
+        "optionChoices": option_choices,
+        "includedOptionalItems": included,
+        "optionGroupHoursOverride": group_hours,
+        "optionalItemHoursOverride": item_hours,
+        "curriculumUnits": curriculum_units,
+        "lockedYears": normalize_locked_years(data.get("lockedYears")),
+        "unitOrderByYear": normalize_unit_order_by_year(data.get("unitOrderByYear"), assignments),
+        "config": {
+            "hoursPerCredit": _number_or(config.get("hoursPerCredit"), DEFAULT_HOURS_PER_CREDIT),
+            "minCreditsForGraduation": _number_or(config.get("minCreditsForGraduation"), DEFAULT_MIN_CREDITS),
+        },
+    }
@@ -0,0 +1,49 @@
+"""Typed records emitted by the ingest engine."""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class HoursRow:
+    """One (unit, category, subcategory) hours cell from a sheet."""
+
+    provider: str
+    year: int
+    column: int
+    unit: str
+    category: str | None
+    subcategory: str
+    hours: float
+
+    def as_csv_row(self) -> list:
+        """Row in unit_subcategory_hours.csv column order."""
+        return [self.year, self.unit, self.category, self.subcategory, self.hours]
+
+
+@dataclass(frozen=True)
+class OptionalEntry:
+    """A type label (Required Reading, Optional Labs, ...) and its body cell."""
+
+    provider: str
+    year: int
+    column: int
+    unit: str
+    type: str
+    body: str
+
+    def as_dict(self) -> dict:
+        """Shape used by gatherround-optional-entries.json."""
+        return {"year": self.year, "unit": self.unit, "type": self.type, "body": self.body}
+
+
+@dataclass(frozen=True)
+class UnitYear:
+    """First sheet (year) a unit has hours in."""
+
+    provider: str
+    year: int
+    column: int
+    unit: str
+
+
+Record = HoursRow | OptionalEntry | UnitYear
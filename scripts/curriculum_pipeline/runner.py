@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Parallel ingest of every provider under data/.
+
+A provider is any directory under data/ containing "* year N *.csv" sheets
+(the directory name is the curriculum_sets id), read with its layout.json
+when it has one (curriculum_pipeline.layout). Sheets are fanned out over a
+process pool and merged in a fixed (provider, year, sheet name) order, so the
+output does not depend on which worker finishes first; records within a sheet
+keep their stream (row, column) order.
+
+Usage (from scripts/):
+    python -m curriculum_pipeline.runner [--data-dir ../data] [--jobs N] [--write]
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from .ingest import IngestResult, find_year_sheets, iter_sheet, write_hours_csv
+from .layout import DEFAULT_LAYOUT, SheetLayout, load_layout
+from .paths import DATA_DIR
+
+
+@dataclass(frozen=True)
+class SheetJob:
+    provider: str
+    year: int
+    path: Path
+    layout: SheetLayout = DEFAULT_LAYOUT
+
+    @property
+    def sort_key(self) -> tuple:
+        return (self.provider, self.year, self.path.name)
+
+
+@dataclass(frozen=True)
+class SheetTiming:
+    job: SheetJob
+    seconds: float
+    records: int
+
+
+def discover_providers(data_dir: Path = DATA_DIR) -> dict[str, tuple[SheetLayout, list[tuple[int, Path]]]]:
+    """
+    provider id -> (layout, [(year, sheet path)]) for every directory under
+    data_dir with year sheets. Raises ValueError for an invalid layout.json.
+    """
+    providers = {}
+    for child in sorted(data_dir.iterdir()):
+        if not child.is_dir():
+            continue
+        layout = load_layout(child)
+        sheets = find_year_sheets(child, layout)
+        if sheets:
+            providers[child.name] = (layout, sheets)
+    return providers
+
+
+def discover_jobs(data_dir: Path = DATA_DIR) -> list[SheetJob]:
+    jobs = [
+        SheetJob(provider, year, path, layout)
+        for provider, (layout, sheets) in discover_providers(data_dir).items()
+        for year, path in sheets
+    ]
+    return sorted(jobs, key=lambda j: j.sort_key)
+
+
+def ingest_job(job: SheetJob) -> tuple[IngestResult, float]:
+    """Worker: stream one sheet. Top-level so it can be pickled into the pool."""
+    start = time.perf_counter()
+    result = IngestResult()
+    for record in iter_sheet(job.path, job.year, job.provider, job.layout):
+        result.add(record)
+    return result, time.perf_counter() - start
+
+
+def run_ingest(
+    jobs: list[SheetJob], max_workers: int | None = None
+) -> tuple[dict[str, IngestResult], list[SheetTiming]]:
+    """
+    Ingest all sheets and merge per provider.
+
+    max_workers=1 runs in-process (no pool start-up cost, useful for tiny
+    catalogs and debugging).
+    """
+    jobs = sorted(jobs, key=lambda j: j.sort_key)
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        outputs = [ingest_job(job) for job in jobs]
+    else:
+        # Batch small sheets so per-task IPC does not dominate on large catalogs
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map() yields in submission order regardless of completion order
+            outputs = list(pool.map(ingest_job, jobs, chunksize=chunksize))
+
+    merged: dict[str, IngestResult] = {}
+    timings = []
+    for job, (result, seconds) in zip(jobs, outputs):
+        merged.setdefault(job.provider, IngestResult()).extend(result)
+        count = len(result.hours) + len(result.entries) + len(result.unit_years)
+        timings.append(SheetTiming(job, seconds, count))
+    return merged, timings
+
+
+def print_timings(timings: list[SheetTiming], wall: float) -> None:
+    print(f"{'provider':<20} {'year':>4} {'records':>8} {'ms':>9}  sheet")
+    for t in timings:
+        print(f"{t.job.provider:<20} {t.job.year:>4} {t.records:>8} {t.seconds * 1000:>9.1f}  {t.job.path.name}")
+    busy = sum(t.seconds for t in timings)
+    print(f"\n{len(timings)} sheets, {busy * 1000:.1f} ms in workers, {wall * 1000:.1f} ms wall")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Ingest every provider under data/ in parallel.")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument(
+        "--write", action="store_true",
+        help="write <provider>/unit_subcategory_hours.csv for each provider",
+    )
+    args = parser.parse_args()
+
+    try:
+        jobs = discover_jobs(args.data_dir.resolve())
+    except ValueError as e:
+        raise SystemExit(str(e))
+    if not jobs:
+        raise SystemExit(f"No provider year sheets found under {args.data_dir}")
+
+    start = time.perf_counter()
+    merged, timings = run_ingest(jobs, args.jobs)
+    wall = time.perf_counter() - start
+    print_timings(timings, wall)
+
+    for provider, result in merged.items():
+        print(f"{provider}: {len(result.hours)} hours rows, {len(result.entries)} optional entries, "
+              f"{len(result.unit_year_map())} units")
+        if args.write:
+            out = args.data_dir.resolve() / provider / "unit_subcategory_hours.csv"
+            write_hours_csv(result.hours, out)
+            print(f"  wrote {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,197 @@
+"""
+Bulk seed SQL output.
+
+Generators build rows of *stored* values (what should land in the column)
+and pick a format:
+
+  insert  one statement per row / small batch (the historical output)
+  bulk    one multi-row INSERT per table
+  copy    one COPY ... FROM stdin block per table (psql / pg_dump style;
+          load with `psql -f`, not through PostgREST)
+
+Values: None -> NULL, int/float -> numeric, everything else -> text. Pass
+casts={"column": "jsonb"} for columns whose text must be cast in INSERT
+form; COPY input is parsed by the column type directly.
+
+With upsert_key the bulk INSERT becomes ON CONFLICT ... DO UPDATE, which
+needs a unique constraint on those columns. render_merge matches rows on a
+natural key without one: it updates the rows that exist and inserts the rest,
+leaving ids to the table's default, so rows already loaded (and the ids saved
+plans refer to) are kept. COPY cannot upsert; load it into an empty table.
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, Sequence
+
+FORMATS = ("insert", "bulk", "copy")
+
+
+def sql_literal(value, cast: str | None = None) -> str:
+    """Value as a SQL literal (standard_conforming_strings: only ' is escaped)."""
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    literal = "'" + str(value).replace("'", "''") + "'"
+    return f"{literal}::{cast}" if cast else literal
+
+
+def copy_field(value) -> str:
+    """Value as a COPY text-format field."""
+    if value is None:
+        return r"\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def render_values(
+    columns: Sequence[str], row: Sequence, casts: dict[str, str] | None = None
+) -> str:
+    casts = casts or {}
+    return "(" + ", ".join(sql_literal(v, casts.get(c)) for c, v in zip(columns, row)) + ")"
+
+
+def render_bulk_insert(
+    table: str,
+    columns: Sequence[str],
+    rows: Iterable[Sequence],
+    casts: dict[str, str] | None = None,
+    upsert_key: Sequence[str] | None = None,
+) -> str:
+    """One multi-row INSERT for all rows (empty string when there are none)."""
+    values = [render_values(columns, row, casts) for row in rows]
+    if not values:
+        return ""
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES\n  " + ",\n  ".join(values)
+    if upsert_key:
+        updates = [f"{c} = excluded.{c}" for c in columns if c not in upsert_key]
+        sql += f"\nON CONFLICT ({', '.join(upsert_key)}) DO "
+        sql += ("UPDATE SET\n  " + ",\n  ".join(updates)) if updates else "NOTHING"
+    return sql + ";"
+
+
+@dataclass(frozen=True)
+class ParentRef:
+    """
+    A foreign key filled in by render_merge: `column` gets the id of the row
+    of `table` whose `key` columns equal the row's parent_<key> values.
+    """
+
+    column: str
+    table: str
+    key: tuple[str, ...]
+
+    @property
+    def value_columns(self) -> tuple[str, ...]:
+        return tuple(f"parent_{k}" for k in self.key)
+
+
+def merge_columns(columns: Sequence[str], parent: ParentRef | None = None) -> tuple[str, ...]:
+    """Value columns render_merge expects: columns with parent.column replaced by the parent's key."""
+    if parent is None:
+        return tuple(columns)
+    out: list[str] = []
+    for c in columns:
+        out.extend(parent.value_columns if c == parent.column else (c,))
+    return tuple(out)
+
+
+def render_merge(
+    table: str,
+    columns: Sequence[str],
+    rows: Iterable[Sequence],
+    key: Sequence[str],
+    types: dict[str, str] | None = None,
+    parent: ParentRef | None = None,
+) -> str:
+    """
+    One statement that updates rows matching on key and inserts the others
+    (empty string when there are none). Rows hold merge_columns(columns,
+    parent) values; types={"column": "numeric"} casts the VALUES text for
+    columns that are not text.
+    """
+    value_columns = merge_columns(columns, parent)
+    values = [render_values(value_columns, row) for row in rows]
+    if not values:
+        return ""
+    types = types or {}
+    source = "s" if parent else "v"
+
+    def typed(column: str) -> str:
+        if column in types and not (parent and column == parent.column):
+            return f"{source}.{column}::{types[column]}"
+        return f"{source}.{column}"
+
+    match = " AND ".join(f"t.{k} = {source}.{k}" for k in key)
+    sql = f"WITH v ({', '.join(value_columns)}) AS (VALUES\n  " + ",\n  ".join(values) + "\n)"
+    if parent:
+        joined = " AND ".join(f"p.{k} = v.parent_{k}" for k in parent.key)
+        sql += f",\ns AS (\n  SELECT p.id AS {parent.column}, v.* FROM v JOIN {parent.table} p ON {joined}\n)"
+    updates = [f"{c} = {typed(c)}" for c in columns if c not in key]
+    if updates:
+        sql += (
+            f",\nupdated AS (\n  UPDATE {table} t SET\n    " + ",\n    ".join(updates)
+            + f"\n  FROM {source}\n  WHERE {match}\n)"
+        )
+    sql += (
+        f"\nINSERT INTO {table} ({', '.join(columns)})\n"
+        f"SELECT {', '.join(typed(c) for c in columns)} FROM {source}\n"
+        f"WHERE NOT EXISTS (SELECT 1 FROM {table} t WHERE {match});"
+    )
+    return sql
+
+
+def render_delete(
+    table: str, key: Sequence[str], rows: Iterable[Sequence], parent: ParentRef | None = None
+) -> str:
+    """
+    One DELETE for the rows whose key equals one of rows (merge_columns(key,
+    parent) values); empty string when there are none.
+    """
+    value_columns = merge_columns(key, parent)
+    values = [render_values(value_columns, row) for row in rows]
+    if not values:
+        return ""
+    sql = f"DELETE FROM {table} t\nUSING (VALUES\n  " + ",\n  ".join(values) + f"\n) AS v({', '.join(value_columns)})"
+    match = []
+    if parent:
+        joined = " AND ".join(f"p.{k} = v.parent_{k}" for k in parent.key)
+        sql += f"\nJOIN {parent.table} p ON {joined}"
+    for k in key:
+        match.append(f"t.{k} = p.id" if parent and k == parent.column else f"t.{k} = v.{k}")
+    return sql + f"\nWHERE {' AND '.join(match)};"
+
+
+def render_copy(table: str, columns: Sequence[str], rows: Iterable[Sequence]) -> str:
+    """One COPY ... FROM stdin block terminated by \\."""
+    lines = [f"COPY {table} ({', '.join(columns)}) FROM stdin;"]
+    lines.extend("\t".join(copy_field(v) for v in row) for row in rows)
+    lines.append("\\.")
+    return "\n".join(lines)
+
+
+def render_table(
+    fmt: str,
+    table: str,
+    columns: Sequence[str],
+    rows: Iterable[Sequence],
+    casts: dict[str, str] | None = None,
+    upsert_key: Sequence[str] | None = None,
+) -> str:
+    """Bulk output for one table in the given format ("bulk" or "copy")."""
+    if fmt == "copy":
+        return render_copy(table, columns, rows)
+    if fmt == "bulk":
+        return render_bulk_insert(table, columns, rows, casts, upsert_key)
+    raise ValueError(f"Unsupported bulk format: {fmt!r}")
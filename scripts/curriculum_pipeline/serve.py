@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Local PostgREST stand-in that serves the pipeline's curriculum data.
+
+Answers GET /rest/v1/<table> for the tables the planner reads:
+
+  unit_subcategory_hours, unit_option_groups,   catalog rows (curriculum_pipeline.catalog)
+  unit_option_choices, unit_optional_items
+  unit_hours_summary                            curriculum_pipeline.summary rows
+  curriculum_sets                               one row per curriculum
+
+and GET /curriculum/<id>.json with the columnar bundle (curriculum_pipeline.bundle),
+from data/<curriculum_id> (--curriculum, repeatable) or a --synthetic catalog.
+
+Only the query syntax the app sends is understood:
+
+  select=a,b          columns to return (* for all)
+  <column>=eq.<v>     equality
+  <column>=in.(a,b)   membership; values may be "double quoted"
+  order=<column>[.asc|.desc][,...]
+
+Anything else is a 400 with a PostgREST-style error body. The data is read-only,
+so each distinct query is answered once and its body and strong ETag are
+cached; If-None-Match with that ETag gets a 304. Connections are HTTP/1.1
+keep-alive and CORS is open, so the planner can use it as VITE_SUPABASE_URL
+(http://127.0.0.1:54321) for offline runs. Plain asyncio streams, no
+dependencies; curriculum_pipeline.bench_serve is the load generator.
+
+Usage (from scripts/):
+    python -m curriculum_pipeline.serve [--curriculum gatherround ...] [--port 54321]
+    python -m curriculum_pipeline.serve --synthetic 2000
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from .catalog import CASTS, CHOICES_TABLE, GROUPS_TABLE, HOURS_TABLE, ITEMS_TABLE, TABLES
+
+SUMMARY_TABLE = "unit_hours_summary"
+SETS_TABLE = "curriculum_sets"
+REST_PREFIX = "/rest/v1/"
+BUNDLE_PREFIX = "/curriculum/"
+DEFAULT_PORT = 54321  # supabase start's API port
+
+JSON_COLUMNS = {column for column, cast in CASTS.items() if cast == "jsonb"}
+CORS_HEADERS = (
+    ("Access-Control-Allow-Origin", "*"),
+    ("Access-Control-Allow-Methods", "GET, HEAD, OPTIONS"),
+    (
+        "Access-Control-Allow-Headers",
+        "apikey, authorization, x-client-info, accept-profile, content-type, prefer, if-none-match",
+    ),
+    ("Access-Control-Expose-Headers", "Content-Range, ETag"),
+)
+MAX_HEADER_LINES = 100
+# Load tests open hundreds of connections at once; asyncio's default backlog (100) drops SYNs
+LISTEN_BACKLOG = 4096
+
+Dataset = dict[str, list[dict]]
+
+
+class QueryError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Query:
+    table: str
+    columns: tuple[str, ...] | None  # None = all
+    filters: tuple[tuple[str, frozenset[str]], ...]  # (column, accepted values as text); eq is a one-value in
+    order: tuple[tuple[str, bool], ...]  # (column, descending)
+
+
+def _split_list(text: str) -> list[str]:
+    """PostgREST list body: a,"b,c",d with backslash escapes inside quotes."""
+    values = []
+    current: list[str] = []
+    quoted = False
+    escaped = False
+    was_quoted = False
+    for ch in text:
+        if escaped:
+            current.append(ch)
+            escaped = False
+        elif quoted and ch == "\\":
+            escaped = True
+        elif ch == '"':
+            quoted = not quoted
+            was_quoted = True
+        elif ch == "," and not quoted:
+            values.append("".join(current) if was_quoted else "".join(current).strip())
+            current, was_quoted = [], False
+        else:
+            current.append(ch)
+    if quoted:
+        raise QueryError(f"unterminated quote in ({text})")
+    values.append("".join(current) if was_quoted else "".join(current).strip())
+    return values
+
+
+def parse_query(table: str, query_string: str, known_columns: set[str]) -> Query:
+    columns = None
+    filters = []
+    order = []
+    for key, value in parse_qsl(query_string, keep_blank_values=True):
+        if key == "select":
+            names = [c.strip() for c in value.split(",") if c.strip()]
+            if "*" not in names:
+                unknown = [c for c in names if c not in known_columns]
+                if unknown:
+                    raise QueryError(f"column {unknown[0]!r} does not exist in {table}")
+                columns = tuple(names)
+        elif key == "order":
+            for term in value.split(","):
+                column, _, direction = term.strip().partition(".")
+                direction = direction.replace(".nullslast", "").replace(".nullsfirst", "")
+                if column not in known_columns or direction not in ("", "asc", "desc", "nullslast", "nullsfirst"):
+                    raise QueryError(f"unsupported order term {term!r}")
+                order.append((column, direction == "desc"))
+        elif key in known_columns:
+            op, _, operand = value.partition(".")
+            if op == "eq":
+                filters.append((key, frozenset([operand])))
+            elif op == "in" and operand.startswith("(") and operand.endswith(")"):
+                filters.append((key, frozenset(_split_list(operand[1:-1]))))
+            else:
+                raise QueryError(f"unsupported filter {key}={value!r} (only eq. and in.(...))")
+        else:
+            raise QueryError(f"column {key!r} does not exist in {table}")
+    return Query(table, columns, tuple(filters), tuple(order))
+
+
+def _text(value) -> str | None:
+    """How Postgres would print a value for comparison with a query literal."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _sort_key(value):
+    # Postgres puts nulls last in ascending order
+    return (value is None, value if value is not None else 0)
+
+
+def run_query(rows: list[dict], query: Query) -> list[dict]:
+    for column, accepted in query.filters:
+        rows = [row for row in rows if _text(row.get(column)) in accepted]
+    for column, descending in reversed(query.order):
+        rows = sorted(rows, key=lambda row: _sort_key(row.get(column)), reverse=descending)
+    if query.columns is not None:
+        rows = [{column: row.get(column) for column in query.columns} for row in rows]
+    return rows
+
+
+def _json_columns(row: dict) -> dict:
+    """jsonb columns come back from PostgREST as JSON, not the seed's text."""
+    return {k: json.loads(v) if k in JSON_COLUMNS and isinstance(v, str) else v for k, v in row.items()}
+
+
+def catalog_dataset(curriculum_ids: list[str]) -> tuple[Dataset, dict[str, list[dict]]]:
+    """Tables for data/<curriculum_id> providers, plus each curriculum's summary rows (for bundles)."""
+    from .catalog import build_catalog
+    from .paths import DATA_DIR
+    from .summary import build_summary
+
+    dataset: Dataset = {table: [] for table in (*TABLES, SUMMARY_TABLE, SETS_TABLE)}
+    summaries = {}
+    for curriculum_id in curriculum_ids:
+        provider_dir = DATA_DIR / curriculum_id
+        if not provider_dir.is_dir():
+            raise SystemExit(f"No curriculum data for {curriculum_id!r} ({provider_dir})")
+        catalog, _ = build_catalog(provider_dir, curriculum_id)
+        for table in TABLES:
+            dataset[table] += [_json_columns(row) for row in catalog[table]]
+        summaries[curriculum_id] = build_summary(catalog)
+        dataset[SUMMARY_TABLE] += summaries[curriculum_id]
+        dataset[SETS_TABLE].append(_curriculum_set(curriculum_id, summaries[curriculum_id]))
+    return dataset, summaries
+
+
+def synthetic_dataset(units: int, seed: int = 0) -> tuple[Dataset, dict[str, list[dict]]]:
+    """Tables for a synthetic curriculum of `units` units (synthetic.unit_summaries), derived from its summary."""
+    from .synthetic import unit_summaries
+
+    curriculum_id = "synthetic"
+    summary = unit_summaries(units, curriculum_id, seed)
+    dataset: Dataset = {table: [] for table in (*TABLES, SUMMARY_TABLE, SETS_TABLE)}
+    for row in summary:
+        unit = row["unit"]
+        for i, base in enumerate(row["base_rows"]):
+            dataset[HOURS_TABLE].append({
+                "id": f"{unit}-hours-{i}", "unit": unit, **base, "curriculum_id": curriculum_id,
+            })
+        for group in row["option_groups"]:
+            dataset[GROUPS_TABLE].append({
+                "id": group["id"], "unit": unit, "category": group["category"], "label": group["label"],
+                "note": group["note"], "curriculum_id": curriculum_id,
+            })
+            for choice in group["choices"]:
+                dataset[CHOICES_TABLE].append({
+                    **choice, "option_group_id": group["id"], "curriculum_id": curriculum_id,
+                })
+        for item in row["optional_items"]:
+            dataset[ITEMS_TABLE].append({**item, "unit": unit, "curriculum_id": curriculum_id})
+    dataset[SUMMARY_TABLE] = summary
+    dataset[SETS_TABLE].append(_curriculum_set(curriculum_id, summary))
+    return dataset, {curriculum_id: summary}
+
+
+def _curriculum_set(curriculum_id: str, summary: list[dict]) -> dict:
+    from .summary import catalog_version
+
+    return {
+        "id": curriculum_id, "name": curriculum_id, "provider": curriculum_id, "logo_url": None, "description": None,
+        "catalog_version": catalog_version(summary),
+    }
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+@dataclass(frozen=True)
+class Response:
+    status: int
+    body: bytes = b""
+    etag: str | None = None
+    headers: tuple[tuple[str, str], ...] = ()
+
+
+REASONS = {
+    200: "OK", 204: "No Content", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+}
+
+
+def _error(status: int, code: str, message: str) -> Response:
+    body = json.dumps({"code": code, "details": None, "hint": None, "message": message}).encode()
+    return Response(status, body)
+
+
+class CurriculumServer:
+    """Read-only answers for the planner's curriculum queries, cached per distinct query."""
+
+    def __init__(self, dataset: Dataset, summaries: dict[str, list[dict]]) -> None:
+        self.dataset = dataset
+        self.summaries = summaries
+        self.columns = {
+            table: {column for row in rows for column in row} for table, rows in dataset.items()
+        }
+        self._cache: dict[tuple[str, str], Response] = {}
+        self.requests = 0
+        self.not_modified = 0
+
+    def _answer(self, path: str, query_string: str) -> Response:
+        """Full response for a GET, without If-None-Match handling."""
+        key = (path, query_string)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        if path.startswith(REST_PREFIX):
+            table = unquote(path[len(REST_PREFIX):])
+            if table not in self.dataset:
+                return _error(404, "PGRST205", f"Could not find the table 'public.{table}' in the schema cache")
+            try:
+                query = parse_query(table, query_string, self.columns[table])
+            except QueryError as e:
+                return _error(400, "PGRST100", str(e))
+            rows = run_query(self.dataset[table], query)
+            body = json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode()
+            content_range = f"0-{len(rows) - 1}/*" if rows else "*/*"
+            response = Response(200, body, _etag(body), (("Content-Range", content_range),))
+        elif path.startswith(BUNDLE_PREFIX) and path.endswith(".json"):
+            from .bundle import encode_bundle
+
+            curriculum_id = unquote(path[len(BUNDLE_PREFIX):-len(".json")])
+            if curriculum_id not in self.summaries:
+                return _error(404, "404", f"no bundle for {curriculum_id!r}")
+            bundle = encode_bundle(self.summaries[curriculum_id], curriculum_id)
+            body = json.dumps(bundle, ensure_ascii=False, separators=(",", ":")).encode()
+            response = Response(200, body, _etag(body))
+        else:
+            return _error(404, "404", f"not found: {path}")
+        self._cache[key] = response
+        return response
+
+    def respond(self, method: str, target: str, headers: dict[str, str]) -> Response:
+        self.requests += 1
+        if method == "OPTIONS":
+            return Response(204)
+        if method not in ("GET", "HEAD"):
+            return _error(405, "405", f"{method} is not supported; this server is read-only")
+        url = urlsplit(target)
+        response = self._answer(url.path, url.query)
+        if response.etag and response.etag in (tag.strip() for tag in headers.get("if-none-match", "").split(",")):
+            self.not_modified += 1
+            return Response(304, b"", response.etag)
+        return response
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    return
+                headers = {}
+                for _ in range(MAX_HEADER_LINES):
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                # Requests the app sends have no body; drain one if present
+                length = int(headers.get("content-length") or 0)
+                if length:
+                    await reader.readexactly(length)
+
+                response = self.respond(method, target, headers)
+                keep_alive = (
+                    headers.get("connection", "").lower() != "close"
+                    if version == "HTTP/1.1"
+                    else headers.get("connection", "").lower() == "keep-alive"
+                )
+                body = b"" if method == "HEAD" or response.status in (204, 304) else response.body
+                lines = [f"HTTP/1.1 {response.status} {REASONS.get(response.status, '')}"]
+                if response.status not in (204, 304):
+                    lines.append("Content-Type: application/json; charset=utf-8")
+                lines.append(f"Content-Length: {len(body)}")
+                if response.etag:
+                    lines.append(f"ETag: {response.etag}")
+                lines += [f"{name}: {value}" for name, value in (*response.headers, *CORS_HEADERS)]
+                lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+                writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> asyncio.Server:
+        return await asyncio.start_server(self.handle, host, port, backlog=LISTEN_BACKLOG)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve curriculum tables over a local PostgREST-style API.")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--curriculum", action="append", help="curriculum ids under data/ (default: gatherround)")
+    source.add_argument("--synthetic", type=int, metavar="UNITS", help="serve a synthetic curriculum of UNITS units")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for --synthetic")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="0 picks a free port")
+    args = parser.parse_args()
+
+    if args.synthetic is not None:
+        dataset, summaries = synthetic_dataset(args.synthetic, args.seed)
+    else:
+        dataset, summaries = catalog_dataset(args.curriculum or ["gatherround"])
+    server = CurriculumServer(dataset, summaries)
+
+    async def serve() -> None:
+        listener = await server.start(args.host, args.port)
+        port = listener.sockets[0].getsockname()[1]  # --port 0 picks a free one
+        counts = ", ".join(f"{table} {len(rows)}" for table, rows in dataset.items())
+        # bench_serve reads the URL from this line
+        print(f"Serving http://{args.host}:{port}{REST_PREFIX} ({counts})", flush=True)
+        async with listener:
+            await listener.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
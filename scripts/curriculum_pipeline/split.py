@@ -0,0 +1,90 @@
+"""
+Split an optional-entries JSONC file into the by-type bucket files
+(required-reading.json, la-additions.json, labs.json, other.json).
+
+Entries are streamed with curriculum_pipeline.jsonc and each bucket file is
+written as entries arrive; only commented-out entries (appended to the end of
+other.json) are held until the end.
+"""
+
+import json
+import os
+from pathlib import Path
+
+from . import jsonc
+
+BUCKET_NAMES = ["required-reading", "la-additions", "labs", "other"]
+
+
+def bucket_entry(e: dict, commented: bool) -> str:
+    """Return 'required-reading' | 'la-additions' | 'labs' | 'other'."""
+    if commented:
+        return "other"
+    t = (e.get("type") or "").strip()
+    if t == "Required Reading":
+        return "required-reading"
+    if t == "Optional LA Addition":
+        return "la-additions"
+    if "lab" in t.lower():
+        return "labs"
+    return "other"
+
+
+class BucketWriter:
+    """
+    Writes a JSON array one entry at a time, formatted like
+    json.dumps(entries, indent=2), into a temp file that replaces path on close().
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.tmp = path.with_name(path.name + ".tmp")
+        self.f = open(self.tmp, "w", encoding="utf-8")
+        self.count = 0
+
+    def write(self, entry: dict) -> None:
+        text = json.dumps(entry, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+        self.f.write(("[\n  " if self.count == 0 else ",\n  ") + text)
+        self.count += 1
+
+    def close(self) -> None:
+        self.f.write("\n]" if self.count else "[]")
+        self.f.close()
+        os.replace(self.tmp, self.path)
+
+    def discard(self) -> None:
+        self.f.close()
+        self.tmp.unlink(missing_ok=True)
+
+
+def bucket_paths(out_dir: Path) -> list[Path]:
+    return [out_dir / f"{name}.json" for name in BUCKET_NAMES]
+
+
+def split_entries(in_path: Path, out_dir: Path) -> dict[str, int]:
+    """
+    Write the bucket files for in_path into out_dir; returns entries per
+    bucket. Raises ValueError (leaving existing files untouched) if the
+    source does not parse.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    writers = {name: BucketWriter(out_dir / f"{name}.json") for name in BUCKET_NAMES}
+    commented_entries: list[dict] = []
+    try:
+        with open(in_path, encoding="utf-8") as f:
+            for entry in jsonc.iter_entries(f):
+                if not isinstance(entry.value, dict):
+                    continue
+                if entry.commented:
+                    commented_entries.append(entry.value)
+                else:
+                    writers[bucket_entry(entry.value, False)].write(entry.value)
+        for e in commented_entries:
+            writers[bucket_entry(e, True)].write(e)
+    except BaseException:
+        for writer in writers.values():
+            writer.discard()
+        raise
+    for writer in writers.values():
+        writer.close()
+    return {name: writers[name].count for name in BUCKET_NAMES}
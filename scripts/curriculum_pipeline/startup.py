@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Start-up budget check for the curriculum-pipeline commands.
+
+Runs `python -X importtime -m curriculum_pipeline <command> --help` for each
+command in a fresh interpreter, sums the import time it reports, and fails
+when a command goes over its budget or imports a heavy optional client
+(HEAVY_MODULES) just to print its help. Commands get DEFAULT_BUDGET_MS unless
+BUDGETS_MS gives them more; --budget-ms applies one budget to every command.
+The bare CLI (no command) must stay under --cli-budget-ms, since every
+command pays for it.
+
+Import times vary by tens of milliseconds between runs, so each probe is run
+--repeat times and the median run counts; budgets leave about 50% headroom
+over the measured medians, so only a real regression goes over.
+
+Usage (from scripts/):
+    python -m curriculum_pipeline startup-check [--budget-ms MS] [--repeat 5] [--command run ...]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+
+from .cli import COMMANDS
+from .paths import SCRIPTS_DIR
+
+# Must never load for --help; they belong behind the command that needs them
+HEAVY_MODULES = ("supabase", "postgrest", "httpx", "psycopg", "numpy")
+
+DEFAULT_BUDGET_MS = 150.0
+# Commands that load the scheduler, HTTP server or benchmark harness up front
+# (median import ms when set: run 157, serve 140, bench 149, bench-optimize
+# 123, bench-serve 114, ingest-all 112)
+BUDGETS_MS = {
+    "run": 240.0,
+    "serve": 210.0,
+    "bench": 220.0,
+    "bench-optimize": 190.0,
+    "bench-serve": 180.0,
+    "ingest-all": 170.0,
+}
+
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+@dataclass(frozen=True)
+class Probe:
+    command: str | None  # None = the bare CLI
+    import_ms: float
+    modules: tuple[str, ...]
+    heaviest: tuple[tuple[str, float], ...]  # top-level imports by cumulative ms
+
+    @property
+    def heavy(self) -> list[str]:
+        return [m for m in self.modules if m.split(".")[0] in HEAVY_MODULES]
+
+
+def parse_importtime(stderr: str) -> tuple[float, list[str], list[tuple[str, float]]]:
+    """(total self ms, imported modules, [(top-level module, cumulative ms)]) from -X importtime output."""
+    total_us = 0
+    modules = []
+    top = []
+    for line in stderr.splitlines():
+        m = _IMPORTTIME_RE.match(line)
+        if not m:
+            continue
+        self_us, cumulative_us, indent, name = int(m[1]), int(m[2]), len(m[3]), m[4]
+        total_us += self_us
+        modules.append(name)
+        if indent == 1:
+            top.append((name, cumulative_us / 1000))
+    top.sort(key=lambda t: -t[1])
+    return total_us / 1000, modules, top
+
+
+def probe(command: str | None, repeat: int = 5) -> Probe:
+    """Import time of the median run (the upper one for an even repeat)."""
+    argv = [sys.executable, "-X", "importtime", "-m", "curriculum_pipeline"]
+    argv += [command, "--help"] if command else ["--help"]
+    # Never let a probe reach a real database
+    env = {k: v for k, v in os.environ.items() if not k.startswith(("SUPABASE_", "DATABASE_URL"))}
+    runs = []
+    for _ in range(repeat):
+        proc = subprocess.run(argv, cwd=SCRIPTS_DIR, env=env, capture_output=True, text=True)
+        total, modules, top = parse_importtime(proc.stderr)
+        runs.append(Probe(command, total, tuple(modules), tuple(top[:3])))
+    median = statistics.median_high([p.import_ms for p in runs])
+    return next(p for p in runs if p.import_ms == median)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check command start-up import time against a budget.")
+    parser.add_argument("--budget-ms", type=float, help="import budget for every command (default: per command)")
+    parser.add_argument("--cli-budget-ms", type=float, default=40.0, help="import budget for the bare CLI")
+    parser.add_argument("--command", action="append", choices=list(COMMANDS), help="check only these commands")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per command; the median counts")
+    args = parser.parse_args()
+
+    names = args.command or [name for name, cmd in COMMANDS.items() if cmd.probe]
+    skipped = [name for name in names if not COMMANDS[name].probe]
+    if skipped:
+        raise SystemExit(f"{', '.join(skipped)} do not take --help and cannot be probed")
+
+    failures = 0
+    repeat = max(1, args.repeat)
+    budgets = [(name, args.budget_ms or BUDGETS_MS.get(name, DEFAULT_BUDGET_MS)) for name in names]
+    for command, budget in [(None, args.cli_budget_ms)] + budgets:
+        p = probe(command, repeat)
+        problems = []
+        if p.import_ms > budget:
+            problems.append(f"over budget ({budget:.0f} ms)")
+        if p.heavy:
+            problems.append(f"imports {', '.join(sorted(set(m.split('.')[0] for m in p.heavy)))}")
+        failures += bool(problems)
+        heaviest = ", ".join(f"{name} {ms:.1f}" for name, ms in p.heaviest)
+        status = "FAIL " + "; ".join(problems) if problems else "ok"
+        print(f"{command or '(cli)':<22} {p.import_ms:7.1f} ms  {len(p.modules):4} modules  {status}")
+        if heaviest:
+            print(f"{'':<22} heaviest: {heaviest}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Per-unit effective-hours summary (unit_hours_summary).
+
+Same shape as the public.unit_hours_summary materialized view
+(supabase/migrations/20261018100000_add_unit_hours_summary.sql), computed
+from a catalog so the pipeline can validate and bundle it offline:
+
+  {curriculum_id, unit,
+   base_rows:      [{category, subcategory, hours}]  (minus option-group subcategories),
+   option_groups:  [{id, category, label, note, default_subcategory, choices: [...]}],
+   optional_items: [{id, category, subcategory, hours, description, type}],
+   default_hours}  (base rows + default max-hours choice per group)
+
+catalog_version() is a checksum of those rows. It versions what serve.py
+and bundle.py build from data/; the database versions its own rows
+(curriculum_sets.catalog_version, bumped by every summary refresh).
+
+Usage (from scripts/):
+    python -m curriculum_pipeline.summary gatherround [--out PATH]
+"""
+
+import argparse
+import hashlib
+import json
+from pathlib import Path
+
+from .catalog import CHOICES_TABLE, GROUPS_TABLE, HOURS_TABLE, ITEMS_TABLE, Catalog, build_catalog
+from .paths import DATA_DIR
+
+
+def _default_choice(choices: list[dict]) -> dict | None:
+    """Max-hours choice; ties go to the first in (subcategory, id) order."""
+    best = None
+    for c in choices:
+        if best is None or (c["hours"] or 0) > (best["hours"] or 0):
+            best = c
+    return best
+
+
+def build_summary(catalog: Catalog) -> list[dict]:
+    """One summary row per (curriculum_id, unit), sorted by that key."""
+    choices_by_group: dict[str, list[dict]] = {}
+    for c in catalog[CHOICES_TABLE]:
+        choices_by_group.setdefault(c["option_group_id"], []).append({
+            "id": c["id"],
+            "subcategory": c["subcategory"],
+            "hours": c["hours"],
+            "recommended_books": json.loads(c["recommended_books"]) if c["recommended_books"] else [],
+        })
+
+    units: dict[tuple[str, str], dict] = {}
+
+    def unit_row(curriculum_id: str, unit: str) -> dict:
+        key = (curriculum_id, unit)
+        if key not in units:
+            units[key] = {
+                "curriculum_id": curriculum_id,
+                "unit": unit,
+                "base_rows": [],
+                "option_groups": [],
+                "optional_items": [],
+                "default_hours": 0.0,
+            }
+        return units[key]
+
+    # Subcategories covered by an option group are replaced by the chosen option
+    excluded: set[tuple[str, str, str, str]] = set()
+    for g in sorted(catalog[GROUPS_TABLE], key=lambda g: (g["label"], g["id"])):
+        choices = sorted(choices_by_group.get(g["id"], []), key=lambda c: (c["subcategory"], c["id"]))
+        default = _default_choice(choices)
+        row = unit_row(g["curriculum_id"], g["unit"])
+        row["option_groups"].append({
+            "id": g["id"],
+            "category": g["category"],
+            "label": g["label"],
+            "note": g["note"],
+            "default_subcategory": default["subcategory"] if default else None,
+            "choices": choices,
+        })
+        if default:
+            row["default_hours"] += default["hours"] or 0
+        for c in choices:
+            excluded.add((g["curriculum_id"], g["unit"], g["category"], c["subcategory"]))
+
+    for h in sorted(catalog[HOURS_TABLE], key=lambda h: (h["category"], h["subcategory"])):
+        row = unit_row(h["curriculum_id"], h["unit"])
+        if (h["curriculum_id"], h["unit"], h["category"], h["subcategory"]) in excluded:
+            continue
+        row["base_rows"].append({"category": h["category"], "subcategory": h["subcategory"], "hours": h["hours"]})
+        row["default_hours"] += h["hours"]
+
+    for item in sorted(catalog[ITEMS_TABLE], key=lambda i: (i["category"], i["subcategory"], i["id"])):
+        unit_row(item["curriculum_id"], item["unit"])["optional_items"].append({
+            "id": item["id"],
+            "category": item["category"],
+            "subcategory": item["subcategory"],
+            "hours": item["hours"],
+            "description": item["description"],
+            "type": item["type"],
+        })
+
+    return [units[key] for key in sorted(units)]
+
+
+def catalog_version(summary: list[dict]) -> str:
+    """Content checksum of summary rows: 16 hex digits of SHA-256 over their canonical JSON."""
+    text = json.dumps(summary, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the per-unit hours summary for a provider.")
+    parser.add_argument("curriculum_id", help="provider directory under data/, e.g. gatherround")
+    parser.add_argument("--out", type=Path, help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    catalog, _ = build_catalog(DATA_DIR / args.curriculum_id, args.curriculum_id)
+    summary = build_summary(catalog)
+    text = json.dumps(summary, indent=2, ensure_ascii=False)
+    if args.out:
+        args.out.write_text(text + "\n", encoding="utf-8")
+        print(f"Wrote summary for {len(summary)} units to {args.out}")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,276 @@
+"""
+Synthetic provider sheets in the "<provider> year N" layout iter_sheet reads.
+
+Each sheet has a UNIT header row (unit names, sometimes with the sheet's
+embedded newlines), category header rows followed by subcategory hour rows,
+TOTALS rows, and an optional section where a type-label cell sits above its
+body cell. Output is deterministic for a given seed.
+
+write_entries then produces the hand-annotated optional-entries JSONC the
+split step reads (options/hours filled in, some entries commented out), so
+every stage downstream of the sheets can run on the synthetic provider.
+unit_summaries makes catalogs of any size in the unit_hours_summary shape,
+and plan_payloads makes planner_plans rows over a curriculum, for the credits
+solver and the year optimizer (legacy_plan_payloads ages them into older
+shapes for the plan migrator).
+"""
+
+import csv
+import json
+import random
+from pathlib import Path
+
+from .ingest import CATEGORIES, CATEGORIES_WITH_HOURS, TYPE_PATTERNS, IngestResult
+
+WORDS = (
+    "study observe build compare record journal sketch measure model map research "
+    "present discuss explore collect design test analyze label describe summarize"
+).split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def sheet_rows(
+    year: int,
+    rng: random.Random,
+    units: int = 10,
+    subcategories: int = 5,
+    optional_rate: float = 0.3,
+    categories: int | None = None,
+) -> list[list[str]]:
+    """Rows of one synthetic year sheet (the first `categories` known categories, default all)."""
+    names = [f"Unit {year}-{u}" if u % 3 else f"Unit\n{year}-{u}" for u in range(1, units + 1)]
+    width = units + 1
+    rows = [["UNIT", *names, "TOTALS"]]
+    totals = [0.0] * units
+
+    for category in sorted(CATEGORIES)[:categories]:
+        if category in CATEGORIES_WITH_HOURS:
+            subs = [category]
+        else:
+            rows.append([category.replace(" ", "\n", 1) if rng.random() < 0.2 else category] + ["Hours"] * width)
+            subs = [f"{category} Topic {k}" for k in range(1, subcategories + 1)]
+        for sub in subs:
+            cells = []
+            for u in range(units):
+                if rng.random() < 0.4:
+                    hours = rng.randint(1, 80) / 2
+                    totals[u] += hours
+                    cells.append(f"{hours:g}")
+                else:
+                    cells.append("")
+            rows.append([sub, *cells, ""])
+        rows.append([""] * (width + 1))
+
+    rows.append(["TOTALS", *(f"{t:g}" for t in totals), ""])
+    rows.append(["TOTALS WITH EXTRAS", *(f"{t + 10:g}" for t in totals), ""])
+
+    # Optional section: label row, body row, then padding
+    for _ in range(max(1, int(units * optional_rate))):
+        labels = [""] * units
+        bodies = [""] * units
+        for u in range(units):
+            if rng.random() < optional_rate:
+                labels[u] = rng.choice(TYPE_PATTERNS)
+                bodies[u] = "\n".join(_sentence(rng, rng.randint(6, 20)) for _ in range(rng.randint(1, 3)))
+        rows.append(["", *labels, ""])
+        rows.append(["", *bodies, ""])
+        rows.extend([[""] * (width + 1)] * rng.randint(0, 3))
+    return rows
+
+
+def write_provider(
+    out_dir: Path,
+    sheets: int = 4,
+    units: int = 10,
+    subcategories: int = 5,
+    optional_rate: float = 0.3,
+    categories: int | None = None,
+    provider: str = "synthetic",
+    seed: int = 0,
+) -> list[Path]:
+    """Write sheets year 1..N into out_dir; returns the paths."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    paths = []
+    for year in range(1, sheets + 1):
+        path = out_dir / f"{provider} year {year} - Sheet1.csv"
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(sheet_rows(year, rng, units, subcategories, optional_rate, categories))
+        paths.append(path)
+    return paths
+
+
+def annotate_entry(entry: dict, unit_subcategories: list[str], rng: random.Random) -> dict:
+    """Add the options/hours a curator would: reading lists, or lab subcategories from the unit's hours rows."""
+    out = dict(entry)
+    if entry["type"] == "Required Reading":
+        picks = rng.sample(unit_subcategories, min(2, len(unit_subcategories)))
+        out["options"] = [[sub, f"- {_sentence(rng, 3)}\n- {_sentence(rng, 4)}"] for sub in picks]
+        out["hours"] = 20
+    elif "lab" in entry["type"].lower() and unit_subcategories:
+        out["options"] = [[_sentence(rng, 2).rstrip("."), rng.choice(unit_subcategories)]]
+        out["hours"] = rng.randint(2, 20)
+    return out
+
+
+def write_entries(
+    result: IngestResult, path: Path, commented_rate: float = 0.05, seed: int = 0
+) -> int:
+    """
+    Write the optional entries from an ingest as annotated JSONC: `// ?`
+    notes on some entries and `// { ... // },` blocks for commented-out ones.
+    Returns the number of entries written.
+    """
+    rng = random.Random(seed)
+    subs: dict[str, list[str]] = {}
+    for row in result.hours:
+        unit_subs = subs.setdefault(row.unit, [])
+        if row.subcategory not in unit_subs:
+            unit_subs.append(row.subcategory)
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for i, e in enumerate(result.entries):
+            entry = annotate_entry(e.as_dict(), subs.get(e.unit, []), rng)
+            lines = json.dumps(entry, indent=2, ensure_ascii=False).splitlines()
+            sep = "," if i < len(result.entries) - 1 else ""
+            roll = rng.random()
+            if roll < commented_rate:
+                # Commented out; a trailing comma left before "]" is tolerated by jsonc
+                lines[-1] += ","
+                f.write("".join(f"  // {line}\n" for line in lines))
+                continue
+            if roll < commented_rate * 3:
+                lines[0] += " // ?"
+            f.write("".join(f"  {line}\n" for line in lines[:-1]) + f"  {lines[-1]}{sep}\n")
+        f.write("]\n")
+    return len(result.entries)
+
+
+def unit_summaries(units: int, curriculum_id: str = "synthetic", seed: int = 0) -> list[dict]:
+    """
+    unit_hours_summary rows (curriculum_pipeline.summary shape) for `units`
+    units: a few categories each, an occasional required-reading group and
+    optional lab.
+    """
+    rng = random.Random(seed)
+    categories = sorted(CATEGORIES)
+    rows = []
+    for u in range(1, units + 1):
+        unit = f"{curriculum_id} unit {u}"
+        picks = rng.sample(categories, rng.randint(2, 5))
+        base = [
+            {"category": c, "subcategory": f"{c} Topic {rng.randint(1, 5)}", "hours": rng.randint(1, 80) / 2}
+            for c in picks
+        ]
+        groups = []
+        if rng.random() < 0.3:
+            gid = f"{curriculum_id}-group-{u}"
+            choices = [
+                {"id": f"{gid}-{k}", "subcategory": sub, "hours": 20.0, "recommended_books": []}
+                for k, sub in enumerate(("American Literature", "British Literature"))
+            ]
+            groups.append({
+                "id": gid, "category": "Language Arts", "label": "Required Reading", "note": "",
+                "default_subcategory": choices[0]["subcategory"], "choices": choices,
+            })
+        items = []
+        if rng.random() < 0.3:
+            items.append({
+                "id": f"{curriculum_id}-item-{u}", "category": picks[0], "subcategory": base[0]["subcategory"],
+                "hours": float(rng.randint(2, 20)), "description": _sentence(rng, 4), "type": "Optional Lab",
+            })
+        rows.append({
+            "curriculum_id": curriculum_id,
+            "unit": unit,
+            "base_rows": base,
+            "option_groups": groups,
+            "optional_items": items,
+            "default_hours": sum(r["hours"] for r in base) + sum(20.0 for _ in groups),
+        })
+    return rows
+
+
+def plan_payloads(model, count: int, seed: int = 0) -> list[dict]:
+    """
+    planner_plans rows ({"id", "name", "data"}) over a credits.CurriculumModel:
+    random units assigned to years 1-4, some option choices and hour
+    overrides, some included optional items, and a few non-default configs.
+    """
+    rng = random.Random(seed)
+    units = list(model.rows)
+    groups: dict[int, list] = {}
+    for gid, g in model.groups.items():
+        groups.setdefault(g.row, []).append((gid, list(g.choices)))
+    items: dict[int, list[str]] = {}
+    for iid, item in model.items.items():
+        items.setdefault(item.row, []).append(iid)
+
+    plans = []
+    for n in range(count):
+        picked = rng.sample(units, min(len(units), rng.randint(8, 40)))
+        data = {
+            "assignments": {},
+            "optionChoices": {},
+            "includedOptionalItems": {},
+            "optionGroupHoursOverride": {},
+            "optionalItemHoursOverride": {},
+            "curriculumUnits": [{"curriculumId": c, "unit": u} for c, u in picked],
+            "lockedYears": [],
+            "unitOrderByYear": {},
+            "config": {
+                "hoursPerCredit": rng.choice((120, 120, 120, 150)),
+                "minCreditsForGraduation": rng.choice((20, 25, 25, 30)),
+            },
+        }
+        for key in picked:
+            unit = key[1]
+            data["assignments"][unit] = rng.randint(1, 4)
+            for gid, subcategories in groups.get(model.rows[key], []):
+                if rng.random() < 0.5:
+                    data["optionChoices"].setdefault(unit, {})[gid] = rng.choice(subcategories)
+                if rng.random() < 0.1:
+                    data["optionGroupHoursOverride"].setdefault(unit, {})[gid] = rng.randint(5, 30)
+            for iid in items.get(model.rows[key], []):
+                if rng.random() < 0.3:
+                    data["includedOptionalItems"].setdefault(unit, {})[iid] = True
+                    if rng.random() < 0.2:
+                        data["optionalItemHoursOverride"].setdefault(unit, {})[iid] = rng.randint(1, 10)
+        plans.append({"id": f"00000000-0000-4000-8000-{n:012d}", "name": f"Synthetic plan {n}", "data": data})
+    return plans
+
+
+def legacy_plan_payloads(model, count: int, seed: int = 0) -> list[dict]:
+    """
+    plan_payloads aged into older shapes normalizePlanData still accepts: some
+    plans have no curriculumUnits (saved before it existed), string or
+    out-of-range lockedYears and config values, unitOrderByYear lists with
+    units no longer in that year, and unit names respelled the way earlier
+    sheets had them (case, doubled spaces).
+    """
+    rng = random.Random(seed + 1)
+    plans = plan_payloads(model, count, seed)
+    for plan in plans:
+        data = plan["data"]
+        units = list(data["assignments"])
+        if units and rng.random() < 0.1:
+            old = units[0]
+            new = old.lower() if rng.random() < 0.5 else old.replace(" ", "  ", 1)
+            for key in ("assignments", "optionChoices", "includedOptionalItems"):
+                if old in data[key]:
+                    data[key][new] = data[key].pop(old)
+            for ref in data["curriculumUnits"]:
+                if ref["unit"] == old:
+                    ref["unit"] = new
+        if rng.random() < 0.2:
+            del data["curriculumUnits"]
+        if rng.random() < 0.2:
+            data["lockedYears"] = [rng.randint(1, 4), 5, "2"]
+        if rng.random() < 0.2:
+            data["config"] = {"hoursPerCredit": "120", "minCreditsForGraduation": 0}
+        if units and rng.random() < 0.3:
+            data["unitOrderByYear"] = {str(year): rng.sample(units, min(3, len(units))) for year in (1, 2, 3, 4)}
+    return plans
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Validation gate for a provider's curriculum data.
+
+Runs on the hours matrices (curriculum_pipeline.matrix), so the sheets are
+read once and every check is an array operation or a set lookup:
+
+  row-totals            subcategory row cells vs the sheet's TOTALS column  (warning)
+  unit-totals           unit column cells vs the sheet's TOTALS row          (warning)
+  duplicate-keys        (unit, category, subcategory) with more than one cell; the
+                        seed generators keep only the first                  (error)
+  choice-subcategories  required-reading choices whose subcategory is not a row
+                        under the group's category in any sheet             (error)
+  catalog-warnings      lab entries the catalog skips (unit or subcategory not
+                        found, invalid hours, ...)                          (warning)
+
+TOTALS disagreements are warnings because the hours come from the cells, not
+the sheet's own sums; --strict makes every warning an error. The exit status
+is 1 when there are errors, so the pipeline stops before seeding or bundling.
+
+Usage (from scripts/):
+    python -m curriculum_pipeline.validate gatherround [--out REPORT.json] [--json] [--strict]
+"""
+
+import argparse
+import json
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from .catalog import lab_item_rows, required_reading_rows
+from .layout import load_layout
+from .matrix import DEFAULT_TOLERANCE, HoursMatrix, load_provider
+from .names import NameIndex
+from .paths import DATA_DIR
+
+ROW_TOTALS = "row-totals"
+UNIT_TOTALS = "unit-totals"
+DUPLICATE_KEYS = "duplicate-keys"
+CHOICE_SUBCATEGORIES = "choice-subcategories"
+CATALOG_WARNINGS = "catalog-warnings"
+CHECKS = (ROW_TOTALS, UNIT_TOTALS, DUPLICATE_KEYS, CHOICE_SUBCATEGORIES, CATALOG_WARNINGS)
+
+REPORT_FORMAT = "curriculum-validation"
+REPORT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Issue:
+    check: str
+    level: str  # "error" | "warning"
+    message: str
+    year: int | None = None
+    unit: str | None = None
+    category: str | None = None
+    subcategory: str | None = None
+    expected: float | None = None  # the sheet's own total
+    actual: float | None = None  # sum of the cells
+
+    def as_dict(self) -> dict:
+        return {k: v for k, v in asdict(self).items() if v is not None}
+
+
+def check_totals(matrices: list[HoursMatrix], tolerance: float = DEFAULT_TOLERANCE) -> list[Issue]:
+    issues = []
+    for m in matrices:
+        for i, actual, expected in m.row_total_mismatches(tolerance):
+            issues.append(Issue(
+                ROW_TOTALS, "warning",
+                f"year {m.year} row {m.subcategories[i]!r}: cells sum to {actual:g}, TOTALS column says {expected:g}",
+                year=m.year, category=m.categories[i], subcategory=m.subcategories[i],
+                expected=expected, actual=actual,
+            ))
+        for j, actual, expected in m.unit_total_mismatches(tolerance=tolerance):
+            issues.append(Issue(
+                UNIT_TOTALS, "warning",
+                f"year {m.year} unit {m.units[j]!r}: cells sum to {actual:g}, TOTALS row says {expected:g}",
+                year=m.year, unit=m.units[j], expected=expected, actual=actual,
+            ))
+    return issues
+
+
+def check_duplicates(matrices: list[HoursMatrix]) -> list[Issue]:
+    counts = Counter(
+        (r.unit, r.category, r.subcategory) for m in matrices for r in m.hours_rows()
+    )
+    return [
+        Issue(
+            DUPLICATE_KEYS, "error",
+            f"{unit!r} / {category} / {subcategory!r} has {n} cells; only the first is seeded",
+            unit=unit, category=category, subcategory=subcategory,
+        )
+        for (unit, category, subcategory), n in counts.items()
+        if n > 1
+    ]
+
+
+def _hours_dicts(matrices: list[HoursMatrix]) -> list[dict]:
+    """Hours rows as catalog.read_hours_csv returns them (first occurrence per key)."""
+    seen = set()
+    rows = []
+    for m in matrices:
+        for r in m.hours_rows():
+            key = (r.unit, r.category or "", r.subcategory)
+            if key not in seen:
+                seen.add(key)
+                rows.append({"unit": r.unit, "category": r.category or "", "subcategory": r.subcategory})
+    return rows
+
+
+def check_catalog(matrices: list[HoursMatrix], provider_dir: Path, curriculum_id: str) -> list[Issue]:
+    """Option choices and lab items as the catalog builds them, against the matrices' rows."""
+    by_type = provider_dir / "optional-entries-by-type"
+    hours = _hours_dicts(matrices)
+    units = NameIndex(row["unit"] for row in hours)
+    issues = []
+
+    reading_path = by_type / "required-reading.json"
+    if reading_path.exists():
+        entries = json.loads(reading_path.read_text(encoding="utf-8"))
+        groups, choices = required_reading_rows(entries, curriculum_id, units)
+        rows = {(c, s) for m in matrices for c, s in zip(m.categories, m.subcategories)}
+        groups_by_id = {g["id"]: g for g in groups}
+        for c in choices:
+            g = groups_by_id[c["option_group_id"]]
+            if (g["category"], c["subcategory"]) not in rows:
+                issues.append(Issue(
+                    CHOICE_SUBCATEGORIES, "error",
+                    f"{g['unit']!r} {g['label']}: choice {c['subcategory']!r} is not a {g['category']} subcategory",
+                    unit=g["unit"], category=g["category"], subcategory=c["subcategory"],
+                ))
+
+    labs_path = by_type / "labs.json"
+    if labs_path.exists():
+        entries = json.loads(labs_path.read_text(encoding="utf-8"))
+        _, warnings = lab_item_rows(entries, hours, curriculum_id, units)
+        issues += [Issue(CATALOG_WARNINGS, "warning", msg) for msg in warnings]
+    return issues
+
+
+def validate(
+    provider_dir: Path, curriculum_id: str | None = None, tolerance: float = DEFAULT_TOLERANCE
+) -> list[Issue]:
+    """Every check for one provider directory; raises ValueError on an invalid layout.json."""
+    matrices = load_provider(provider_dir, load_layout(provider_dir))
+    return (
+        check_totals(matrices, tolerance)
+        + check_duplicates(matrices)
+        + check_catalog(matrices, provider_dir, curriculum_id or provider_dir.name)
+    )
+
+
+def build_report(curriculum_id: str, issues: list[Issue], strict: bool = False) -> dict:
+    if strict:
+        issues = [Issue(**{**asdict(i), "level": "error"}) for i in issues]
+    levels = Counter(i.level for i in issues)
+    checks = Counter(i.check for i in issues)
+    return {
+        "format": REPORT_FORMAT,
+        "version": REPORT_VERSION,
+        "curriculum_id": curriculum_id,
+        "ok": not levels["error"],
+        "errors": levels["error"],
+        "warnings": levels["warning"],
+        "checks": {check: checks[check] for check in CHECKS},
+        "issues": [i.as_dict() for i in issues],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Validate a provider's hours and option data.")
+    parser.add_argument("curriculum_id", help="provider directory under data/, e.g. gatherround")
+    parser.add_argument("--out", type=Path, help="write the JSON report here")
+    parser.add_argument("--json", action="store_true", help="print the JSON report instead of a summary")
+    parser.add_argument("--strict", action="store_true", help="treat warnings as errors")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed |sum - TOTALS|")
+    args = parser.parse_args()
+
+    provider_dir = DATA_DIR / args.curriculum_id
+    try:
+        issues = validate(provider_dir, args.curriculum_id, args.tolerance)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    report = build_report(args.curriculum_id, issues, args.strict)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(text + "\n", encoding="utf-8")
+    if args.json:
+        print(text)
+    else:
+        for issue in report["issues"]:
+            print(f"{issue['level']}: [{issue['check']}] {issue['message']}")
+        print(f"{args.curriculum_id}: {report['errors']} errors, {report['warnings']} warnings")
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
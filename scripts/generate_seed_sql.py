@@ -1,37 +1,58 @@
 #!/usr/bin/env python3
 """Generate seed migration SQL from unit_subcategory_hours.csv.
 Uses first occurrence per (unit, category, subcategory); no aggregation.
+--format bulk / --format copy emit a single statement for the whole table
+(curriculum_pipeline.catalog.render_seed); bulk updates or inserts by
+(unit, category, subcategory), so existing rows keep their ids.
 """
-import csv
+import argparse
 import sys
 from pathlib import Path
 
+from curriculum_pipeline.cache import BuildCache, code_version, package_sources
+from curriculum_pipeline import catalog, instrument
+from curriculum_pipeline.paths import DATA_DIR
+from curriculum_pipeline.seed_writer import FORMATS
+
 def escape_sql(s: str) -> str:
     return s.replace("'", "''")
 
-def main():
-    repo = Path(__file__).resolve().parent.parent
-    csv_path = repo / "unit_subcategory_hours.csv"
-    seen = set()
-    rows = []
-    with open(csv_path, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            key = (row["unit"], row["category"], row["subcategory"])
-            if key in seen:
-                continue
-            seen.add(key)
-            rows.append(
-                (escape_sql(row["unit"]), escape_sql(row["category"]), escape_sql(row["subcategory"]), row["hours"])
-            )
+def generate_sql(csv_path: Path, fmt: str = "insert") -> str:
+    csv_rows = catalog.read_hours_csv(csv_path)
+    if fmt != "insert":
+        return catalog.render_seed(fmt, catalog.HOURS_TABLE, catalog.hours_rows(csv_rows, "gatherround"))
+    rows = [(r["unit"], r["category"], r["subcategory"], r["hours"]) for r in csv_rows]
     # Output SQL: batch INSERTs (e.g. 50 per INSERT for readability)
     batch_size = 50
+    statements = []
     for i in range(0, len(rows), batch_size):
         batch = rows[i : i + batch_size]
         values = ", ".join(
-            f"('{u}', '{c}', '{s}', {h})" for u, c, s, h in batch
+            f"('{escape_sql(u)}', '{escape_sql(c)}', '{escape_sql(s)}', {h})" for u, c, s, h in batch
         )
-        print(f"INSERT INTO unit_subcategory_hours (unit, category, subcategory, hours) VALUES {values};")
+        statements.append(f"INSERT INTO unit_subcategory_hours (unit, category, subcategory, hours) VALUES {values};")
+    return "\n".join(statements)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate unit_subcategory_hours seed SQL.")
+    parser.add_argument("--format", choices=FORMATS, default="insert")
+    instrument.add_arguments(parser)
+    args = parser.parse_args()
+
+    csv_path = DATA_DIR / "gatherround" / "unit_subcategory_hours.csv"
+    with instrument.session("generate_seed_sql", args, format=args.format) as run:
+        # Regenerate only when the CSV this script or the pipeline package changed
+        cache = BuildCache("generate_seed_sql", code_version(Path(__file__), *package_sources()))
+        key = f"seed.{args.format}.sql"
+        sql = cache.get(key, [csv_path])
+        run.set(cached=sql is not None)
+        if sql is None:
+            with instrument.span("generate") as span:
+                sql = generate_sql(csv_path, args.format)
+                span.set(output_bytes=len(sql))
+            cache.put(key, [csv_path], sql)
+            cache.save()
+        print(sql)
     return 0
 
 if __name__ == "__main__":
@@ -1,34 +1,32 @@
 #!/usr/bin/env python3
 """
-Generate app/src/data/gatherround-plan.json from data/gatherround/unit_subcategory_hours.csv.
-Uses first occurrence of each unit to get its year. Run from repo root when CSV changes.
+Generate app/src/data/gatherround-plan.json from the data/gatherround year sheets.
+Uses first occurrence of each unit to get its year and sheet column order for
+unitOrderByYear. Run from repo root when the sheets change.
 """
-import csv
 import json
+import sys
 from pathlib import Path
 
-def main():
-    # script lives at scripts/archive/gatherround/ -> repo is parent.parent.parent.parent
-    repo = Path(__file__).resolve().parent.parent.parent.parent
-    csv_path = repo / "data" / "gatherround" / "unit_subcategory_hours.csv"
-    out_path = repo / "app" / "src" / "data" / "gatherround-plan.json"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from curriculum_pipeline.ingest import find_year_sheets, ingest_sheets
+from curriculum_pipeline.paths import APP_DIR, DATA_DIR
 
+
+def main():
+    out_path = APP_DIR / "src" / "data" / "gatherround-plan.json"
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    seen = {}
-    with open(csv_path, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            unit = row["unit"]
-            if unit not in seen:
-                year = int(row["year"])
-                if 1 <= year <= 4:
-                    seen[unit] = year
+    result = ingest_sheets(find_year_sheets(DATA_DIR / "gatherround"), "gatherround")
+    assignments = result.unit_year_map()
+    order_by_year = result.unit_order_by_year()
 
     with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(seen, f, indent=2)
+        json.dump({"assignments": assignments, "unitOrderByYear": order_by_year}, f, indent=2)
+        f.write("\n")
 
-    print(f"Wrote {len(seen)} unit->year entries to {out_path}")
+    print(f"Wrote {len(assignments)} unit->year entries to {out_path}")
     return 0
 
 if __name__ == "__main__":
@@ -1,134 +1,77 @@
-import csv
-import os
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from curriculum_pipeline import instrument
+from curriculum_pipeline.cache import BuildCache, code_version, package_sources
+from curriculum_pipeline.ingest import find_year_sheets, write_hours_csv
+from curriculum_pipeline.matrix import load_sheet
+from curriculum_pipeline.records import HoursRow
+
 
 def parse_curriculum_csv(filepath, year):
     """Parse a curriculum CSV file and extract unit, subcategory, hours relationships."""
-    results = []
-    
-    with open(filepath, 'r', encoding='utf-8') as f:
-        reader = csv.reader(f)
-        rows = list(reader)
-    
-    # Row 0 has unit names in columns 1+
-    # Row 1 has category name (e.g. "Physical Science") with "Hours" labels
-    # Subsequent rows have subcategories with hours
-    
-    unit_names = rows[0][1:]  # Skip first column (UNIT label)
-    
-    # Known category names that appear as row headers
-    categories = [
-        'Physical Science', 'Earth Science', 'Life Science', 'Language Arts',
-        'History', 'Bible', 'Physical Education', 'Fine Arts', 'Electives',
-        'Social Science Electives', 'Language Arts Electives', 'Science Electives',
-        'Math Electives'
+    return [
+        {
+            'year': r.year,
+            'unit': r.unit,
+            'category': r.category,
+            'subcategory': r.subcategory,
+            'hours': r.hours,
+        }
+        for r in load_sheet(Path(filepath), year).hours_rows()
     ]
-    
-    # Categories that also have hours directly (no subcategories)
-    categories_with_hours = ['Bible', 'Physical Education']
-    
-    current_category = None
-    
-    for row_idx, row in enumerate(rows[1:], start=1):  # Start from row 1 (Physical Science)
-        if not row or not row[0].strip():
-            continue
-            
-        name = row[0].strip().replace('\n', ' ')
-        
-        # Skip rows that are clearly not data (TOTALS, Required Reading, etc.)
-        if name.upper().startswith('TOTALS') or name.startswith('Required') or name.startswith('('):
-            continue
-        
-        # Check if this is a category header
-        is_category = name in categories
-        
-        if is_category:
-            current_category = name
-            # For Bible and Physical Education, they ARE the subcategory too
-            if name not in categories_with_hours:
-                continue
-        
-        # Check if this row has any numeric hour values (not just "Hours" labels)
-        hour_values = row[1:]
-        has_numeric_hours = any(
-            val.strip() and val.strip() != 'Hours' and is_numeric(val.strip())
-            for val in hour_values if val
-        )
-        
-        if not has_numeric_hours:
-            continue  # Skip rows with no numeric data
-        
-        # This is a subcategory with hours
-        # For categories like Bible/Physical Education, use category name as subcategory
-        subcategory = name
-        
-        for col_idx, hours_str in enumerate(hour_values):
-            if col_idx >= len(unit_names):
-                break
-                
-            unit_name = unit_names[col_idx].strip().replace('\n', ' ')
-            
-            # Skip TOTALS column
-            if unit_name.upper() == 'TOTALS':
-                continue
-            
-            hours_str = hours_str.strip() if hours_str else ''
-            
-            if hours_str and hours_str != 'Hours':
-                try:
-                    hours = float(hours_str)
-                    if hours > 0:
-                        results.append({
-                            'year': year,
-                            'unit': unit_name,
-                            'category': current_category,
-                            'subcategory': subcategory,
-                            'hours': hours
-                        })
-                except ValueError:
-                    pass  # Skip non-numeric values
-    
-    return results
 
-def is_numeric(s):
-    """Check if a string represents a number."""
-    try:
-        float(s)
-        return True
-    except ValueError:
-        return False
 
 def main():
-    all_data = []
-    
-    # Process all 4 year files
-    for year in range(1, 5):
-        filepath = f'gather round year {year} - Sheet1.csv'
-        if os.path.exists(filepath):
-            data = parse_curriculum_csv(filepath, year)
-            all_data.extend(data)
-            print(f"Year {year}: {len(data)} records")
-    
-    # Write output CSV
+    with instrument.session('parse_curriculum') as run:
+        _main(run)
+
+
+def _main(run):
+    # Sheets live next to this script's output; run from inside data/gatherround
+    sheets = find_year_sheets(Path('.'))
     output_file = 'unit_subcategory_hours.csv'
-    with open(output_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(['year', 'unit', 'category', 'subcategory', 'hours'])
-        for record in all_data:
-            writer.writerow([
-                record['year'],
-                record['unit'],
-                record['category'],
-                record['subcategory'],
-                record['hours']
-            ])
-    
+    cache = BuildCache('parse_curriculum', code_version(Path(__file__), *package_sources()))
+
+    sheet_paths = [path for _, path in sheets]
+    if cache.get(output_file, sheet_paths, outputs=[Path(output_file)]) is not None:
+        run.set(up_to_date=True)
+        print(f"{output_file} is up to date ({len(sheets)} sheets unchanged)")
+        return
+
+    # Only sheets whose content changed are re-parsed; the rest come from the cache
+    all_data = []
+    for year, filepath in sheets:
+        with instrument.span('sheet', sheet=filepath.name, year=year) as span:
+            cached = cache.get(filepath.name, [filepath])
+            span.set(cached=cached is not None)
+            if cached is None:
+                data = list(load_sheet(filepath, year).hours_rows())
+                cache.put(filepath.name, [filepath], [asdict(r) for r in data])
+                print(f"Year {year}: {len(data)} records")
+            else:
+                data = [HoursRow(**r) for r in cached]
+                print(f"Year {year}: {len(data)} records (cached)")
+            span.rows = len(data)
+        all_data.extend(data)
+
+    with instrument.span('write_csv', path=output_file) as span:
+        write_hours_csv(all_data, Path(output_file))
+        span.rows = len(all_data)
+    cache.put(output_file, sheet_paths, len(all_data))
+    cache.save()
+    run.rows = len(all_data)
+
     print(f"\nTotal records: {len(all_data)}")
     print(f"Output written to: {output_file}")
-    
+
     # Also print a summary
     print("\n--- Sample data (first 20 records) ---")
     for record in all_data[:20]:
-        print(f"Year {record['year']} | {record['unit'][:25]:<25} | {record['subcategory']:<25} | {record['hours']} hrs")
+        print(f"Year {record.year} | {record.unit[:25]:<25} | {record.subcategory:<25} | {record.hours} hrs")
 
 if __name__ == '__main__':
     main()
@@ -3,134 +3,32 @@
 Generate SQL seed for unit_optional_items from
 data/gatherround/optional-entries-by-type/labs.json.
 
-Outputs SQL to stdout for use in a migration.
+Outputs SQL to stdout for use in a migration. --format bulk emits one
+statement that updates or inserts items by natural key (existing rows keep
+their ids), --format copy a COPY ... FROM stdin block with deterministic ids
+for an empty table (see curriculum_pipeline.catalog.render_seed).
+
+Rows are built by curriculum_pipeline.catalog.lab_item_rows.
 """
 
-import csv
+import argparse
 import json
-import re
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-def sql_escape(value: str) -> str:
-    """Escape for SQL single-quoted string: backslash and '."""
-    if value is None:
-        return ""
-    return str(value).replace("\\", "\\\\").replace("'", "''")
-
-
-def normalize(value: str) -> str:
-    return re.sub(r"\s+", " ", value.strip()).lower()
-
-def split_blocks(body: str) -> list[str]:
-    if not body:
-        return []
-    normalized = body.strip().replace("\r\n", "\n")
-    blocks = re.split(r"\n\s*\n", normalized)
-    return [block.strip() for block in blocks if block.strip()]
-
+from curriculum_pipeline import catalog, instrument
+from curriculum_pipeline.cache import BuildCache, code_version, package_sources
+from curriculum_pipeline.paths import DATA_DIR
+from curriculum_pipeline.seed_writer import FORMATS, render_values
 
-def pick_block(blocks: list[str], option_label: str, index: int) -> str:
-    if not blocks:
-        return option_label
-    option_norm = normalize(option_label)
-    for block in blocks:
-        if option_norm in normalize(block):
-            return block
-    if len(blocks) == 1:
-        return blocks[0]
-    if index < len(blocks):
-        return blocks[index]
-    return option_label
+TABLE = catalog.ITEMS_TABLE
 
 
-def main() -> None:
-    repo = Path(__file__).resolve().parent.parent.parent
-    data_dir = repo / "data" / "gatherround"
-    labs_path = data_dir / "optional-entries-by-type" / "labs.json"
-    csv_path = data_dir / "unit_subcategory_hours.csv"
-
+def generate_sql(labs_path: Path, csv_path: Path, fmt: str = "insert") -> str:
     entries = json.loads(labs_path.read_text(encoding="utf-8"))
-
-    unit_map: dict[str, dict[str, object]] = {}
-    with csv_path.open(encoding="utf-8") as handle:
-        reader = csv.DictReader(handle)
-        for row in reader:
-            unit_key = normalize(row["unit"])
-            sub_key = normalize(row["subcategory"])
-            category_key = normalize(row["category"])
-            entry = unit_map.setdefault(
-                unit_key, {"canonical": row["unit"], "subs": {}, "categories": {}}
-            )
-            entry["subs"][sub_key] = {
-                "category": row["category"],
-                "subcategory": row["subcategory"],
-            }
-            entry["categories"][category_key] = row["category"]
-
-    lines: list[str] = []
-    warnings: list[str] = []
-    type_label = "Optional Lab"
-
-    for entry in entries:
-        options = entry.get("options")
-        if not options:
-            warnings.append(f"Skip {entry.get('unit')} ({entry.get('type')}): no options")
-            continue
-
-        unit_key = normalize(entry["unit"])
-        unit_entry = unit_map.get(unit_key)
-        if not unit_entry:
-            warnings.append(f"Skip {entry.get('unit')} ({entry.get('type')}): unit not found")
-            continue
-
-        canonical_unit = unit_entry["canonical"]
-        subs = unit_entry["subs"]
-        categories = unit_entry["categories"]
-
-        blocks = split_blocks(entry.get("body") or "")
-
-        for index, option in enumerate(options):
-            if not isinstance(option, list) or len(option) < 2:
-                warnings.append(f"Skip {entry.get('unit')} ({entry.get('type')}): invalid option")
-                continue
-            sub_key = normalize(option[1])
-            sub_entry = subs.get(sub_key)
-            if sub_entry:
-                category = sub_entry["category"]
-                subcategory = sub_entry["subcategory"]
-            else:
-                category_match = categories.get(sub_key)
-                if not category_match:
-                    warnings.append(
-                        f"Skip {entry.get('unit')} ({entry.get('type')}): subcategory {option[1]!r} not found"
-                    )
-                    continue
-                category = category_match
-                subcategory = category_match
-
-            hours = entry.get("hours")
-            try:
-                hours_val = float(hours)
-            except (TypeError, ValueError):
-                warnings.append(
-                    f"Skip {entry.get('unit')} ({entry.get('type')}): invalid hours"
-                )
-                continue
-
-            option_label = option[0] if option else ""
-            block = pick_block(blocks, str(option_label), index)
-            if option_label and normalize(option_label) not in normalize(block):
-                description = f"{option_label}: {block}"
-            else:
-                description = block
-            description = sql_escape(description.replace("\n", "\\n"))
-
-            lines.append(
-                "INSERT INTO unit_optional_items (unit, category, subcategory, hours, description, curriculum_id, type)\n"
-                f"VALUES ('{sql_escape(canonical_unit)}', '{sql_escape(category)}', "
-                f"'{sql_escape(subcategory)}', {hours_val}, '{description}', 'gatherround', '{type_label}');"
-            )
+    items, warnings = catalog.lab_item_rows(entries, catalog.read_hours_csv(csv_path), "gatherround")
 
     header = [
         "-- Generated from data/gatherround/optional-entries-by-type/labs.json",
@@ -141,7 +39,42 @@ def main() -> None:
         header.extend([f"-- - {msg}" for msg in warnings])
     header.append("")
 
-    print("\n".join(header + lines).strip())
+    if fmt == "insert":
+        columns = catalog.COLUMNS[TABLE][1:]  # historical output lets the table assign ids
+        lines = [
+            f"INSERT INTO {TABLE} ({', '.join(columns)})\n"
+            f"VALUES {render_values(columns, [item[c] for c in columns])};"
+            for item in items
+        ]
+    else:
+        lines = [catalog.render_seed(fmt, TABLE, items)]
+    return "\n".join(header + lines).strip()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--format", choices=FORMATS, default="insert")
+    instrument.add_arguments(parser)
+    args = parser.parse_args()
+
+    data_dir = DATA_DIR / "gatherround"
+    labs_path = data_dir / "optional-entries-by-type" / "labs.json"
+    csv_path = data_dir / "unit_subcategory_hours.csv"
+
+    with instrument.session("generate_optional_labs_seed", args, format=args.format) as run:
+        # Regenerate only when labs.json, the hours CSV this script or the pipeline package changed
+        cache = BuildCache("generate_optional_labs_seed", code_version(Path(__file__), *package_sources()))
+        inputs = [labs_path, csv_path]
+        key = f"seed.{args.format}.sql"
+        sql = cache.get(key, inputs)
+        run.set(cached=sql is not None)
+        if sql is None:
+            with instrument.span("generate") as span:
+                sql = generate_sql(labs_path, csv_path, args.format)
+                span.set(output_bytes=len(sql))
+            cache.put(key, inputs, sql)
+            cache.save()
+        print(sql)
 
 
 if __name__ == "__main__":
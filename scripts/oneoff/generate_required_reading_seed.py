@@ -1,64 +1,117 @@
-#!/usr/bin/env python3
-"""
-Generate SQL seed for unit_option_groups and unit_option_choices
-from data/gatherround/optional-entries-by-type/required-reading.json.
-Output is written to stdout for use in 20260204160001_seed_option_tables.sql.
-"""
-
-import json
-from pathlib import Path
-
-
-def sql_escape(s: str) -> str:
-    """Escape for SQL single-quoted string: ' -> ''."""
-    if s is None:
-        return ""
-    return str(s).replace("\\", "\\\\").replace("'", "''")
-
-
-def recommended_books_jsonb(books_text: str) -> str:
-    """Format books text as JSONB literal for recommended_books column."""
-    obj = [{"description": (books_text or "")}]
-    json_str = json.dumps(obj, ensure_ascii=False)
-    return f"'{sql_escape(json_str)}'::jsonb"
-
-
-def main():
-    data_dir = Path(__file__).resolve().parent.parent / "data" / "gatherround" / "optional-entries-by-type"
-    path = data_dir / "required-reading.json"
-    entries = json.loads(path.read_text(encoding="utf-8"))
-
-    lines = []
-    for e in entries:
-        unit = sql_escape(e["unit"])
-        body = (e.get("body") or "").replace("\n", "\\n")
-        note = sql_escape(body)
-        hours_val = e.get("hours")  # None or number
-        options = e.get("options")  # None or [[subcat, books_text], ...]
-
-        # One group per entry (unit + label Required Reading)
-        lines.append(
-            f"INSERT INTO unit_option_groups (unit, category, label, note)\n"
-            f"VALUES ('{unit}', 'Language Arts', 'Required Reading', '{note}');"
-        )
-
-        if options:
-            for subcat, books_text in options:
-                subcat_esc = sql_escape(subcat)
-                rb = recommended_books_jsonb(books_text)
-                if hours_val is not None:
-                    hours_sql = f"{float(hours_val)}"
-                else:
-                    hours_sql = "NULL"
-                lines.append(
-                    f"INSERT INTO unit_option_choices (option_group_id, subcategory, hours, recommended_books)\n"
-                    f"SELECT id, '{subcat_esc}', {hours_sql}, {rb}\n"
-                    f"FROM unit_option_groups WHERE unit = '{unit}' AND label = 'Required Reading';"
-                )
-        lines.append("")
-
-    print("\n".join(lines).strip())
-
-
-if __name__ == "__main__":
-    main()
+#!/usr/bin/env python3
+"""
+Generate SQL seed for unit_option_groups and unit_option_choices
+from data/gatherround/optional-entries-by-type/required-reading.json.
+Output is written to stdout for use in 20260204160001_seed_option_tables.sql.
+
+--format bulk / --format copy emit one statement per table
+(curriculum_pipeline.catalog.render_seed). bulk updates or inserts groups by
+(curriculum, unit, category, label) and choices by (group, subcategory), so
+reseeding keeps the ids saved plans refer to; copy loads deterministic ids
+into empty tables.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from curriculum_pipeline import catalog, instrument
+from curriculum_pipeline.names import NameIndex
+from curriculum_pipeline.paths import DATA_DIR
+from curriculum_pipeline.seed_writer import FORMATS
+
+
+def sql_escape(s: str) -> str:
+    """Escape for SQL single-quoted string: ' -> ''."""
+    if s is None:
+        return ""
+    return str(s).replace("\\", "\\\\").replace("'", "''")
+
+
+def recommended_books_jsonb(books_text: str) -> str:
+    """
+    Format books text as JSONB literal for recommended_books column, in the
+    original [{"description": ...}] shape that migration 20260204170000
+    rewrites (bulk output uses catalog.recommended_books_json's string arrays).
+    """
+    obj = [{"description": (books_text or "")}]
+    return f"'{sql_escape(json.dumps(obj, ensure_ascii=False))}'::jsonb"
+
+
+def generate_insert_sql(entries: list[dict]) -> str:
+    """One INSERT per group and one INSERT ... SELECT per choice."""
+    lines = []
+    for e in entries:
+        unit = sql_escape(e["unit"])
+        body = (e.get("body") or "").replace("\n", "\\n")
+        note = sql_escape(body)
+        hours_val = e.get("hours")  # None or number
+        options = e.get("options")  # None or [[subcat, books_text], ...]
+
+        # One group per entry (unit + label Required Reading)
+        lines.append(
+            f"INSERT INTO unit_option_groups (unit, category, label, note)\n"
+            f"VALUES ('{unit}', 'Language Arts', 'Required Reading', '{note}');"
+        )
+
+        if options:
+            for subcat, books_text in options:
+                subcat_esc = sql_escape(subcat)
+                rb = recommended_books_jsonb(books_text)
+                if hours_val is not None:
+                    hours_sql = f"{float(hours_val)}"
+                else:
+                    hours_sql = "NULL"
+                lines.append(
+                    f"INSERT INTO unit_option_choices (option_group_id, subcategory, hours, recommended_books)\n"
+                    f"SELECT id, '{subcat_esc}', {hours_sql}, {rb}\n"
+                    f"FROM unit_option_groups WHERE unit = '{unit}' AND label = 'Required Reading';"
+                )
+        lines.append("")
+
+    return "\n".join(lines).strip()
+
+
+def generate_bulk_sql(
+    entries: list[dict], fmt: str, units: NameIndex, curriculum_id: str = "gatherround"
+) -> str:
+    """
+    One bulk statement per table, groups first. Unit names resolve through the
+    hours CSV's index, as in build_catalog.
+    """
+    groups, choices = catalog.required_reading_rows(entries, curriculum_id, units)
+    return "\n\n".join(
+        catalog.render_seed(fmt, table, rows, groups)
+        for table, rows in ((catalog.GROUPS_TABLE, groups), (catalog.CHOICES_TABLE, choices))
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate required-reading option seed SQL.")
+    parser.add_argument("--format", choices=FORMATS, default="insert")
+    instrument.add_arguments(parser)
+    args = parser.parse_args()
+
+    data_dir = DATA_DIR / "gatherround" / "optional-entries-by-type"
+    path = data_dir / "required-reading.json"
+    csv_path = DATA_DIR / "gatherround" / "unit_subcategory_hours.csv"
+    with instrument.session("generate_required_reading_seed", args, format=args.format) as run:
+        entries = json.loads(path.read_text(encoding="utf-8"))
+        run.rows = len(entries)
+
+        with instrument.span("generate") as span:
+            if args.format == "insert":
+                sql = generate_insert_sql(entries)
+            else:
+                units = catalog.unit_index(catalog.read_hours_csv(csv_path))
+                sql = generate_bulk_sql(entries, args.format, units)
+            span.rows = len(entries)
+            span.set(output_bytes=len(sql))
+        print(sql)
+
+
+if __name__ == "__main__":
+    main()
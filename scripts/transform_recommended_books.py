@@ -6,16 +6,32 @@ so the column is an array of strings (one per line). Handles literal \\n in text
 
 Run after setting SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY (or use the migration
 20260204170000_transform_recommended_books_to_strings.sql instead).
+
+Rows are read in id order, --page-size at a time, and changed rows are written
+back in batches: through the API as --batch-size row upserts, --concurrency at
+a time over the client's pooled connection, or with --database-url as one
+UPDATE ... FROM unnest(...) per batch in a single transaction (needs
+`pip install psycopg`).
+
+  --dry-run         print each change (- old / + new) and write nothing
+  --sql             print UPDATE ... FROM (VALUES ...) statements instead of applying
+  --from-json PATH  read rows ({"id", "recommended_books"}) from an export instead
+
+Usage (from scripts/):
+    python transform_recommended_books.py [--dry-run | --sql] [--batch-size 500] [--concurrency 4]
 """
 
+import argparse
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
+from typing import Iterable, Iterator
+
+from curriculum_pipeline.seed_writer import render_values
 
-try:
-  from supabase import create_client
-except ImportError:
-  create_client = None
+TABLE = "unit_option_choices"
 
 
 def transform_value(rb: list) -> list[str]:
@@ -33,29 +49,164 @@ def transform_value(rb: list) -> list[str]:
   return []
 
 
-def main():
-  url = os.environ.get("SUPABASE_URL")
-  key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY") or os.environ.get("SUPABASE_ANON_KEY")
-  if not url or not key:
-    print("Set SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY (or SUPABASE_ANON_KEY) to run against the API.")
-    print("Alternatively, apply the migration: supabase/migrations/20260204170000_transform_recommended_books_to_strings.sql")
-    return 1
-  if create_client is None:
-    print("Install supabase: pip install supabase")
-    return 1
-
-  client = create_client(url, key)
-  res = client.table("unit_option_choices").select("id, recommended_books").execute()
-  rows = res.data or []
-  updated = 0
+def changes(rows: Iterable[dict]) -> Iterator[tuple[dict, list[str]]]:
+  """(row, new recommended_books) for every row the transform changes."""
   for row in rows:
-    rid = row.get("id")
-    rb = row.get("recommended_books")
-    new_rb = transform_value(rb)
-    if new_rb != rb:
-      client.table("unit_option_choices").update({"recommended_books": new_rb}).eq("id", rid).execute()
-      updated += 1
-  print(f"Updated {updated} of {len(rows)} rows.")
+    new_rb = transform_value(row.get("recommended_books"))
+    if new_rb != row.get("recommended_books"):
+      yield row, new_rb
+
+
+def batches(items: Iterable, size: int) -> Iterator[list]:
+  it = iter(items)
+  while batch := list(islice(it, size)):
+    yield batch
+
+
+def render_update_sql(batch: list[tuple[str, list[str]]]) -> str:
+  """One UPDATE joined against a VALUES list of (id, new recommended_books)."""
+  casts = {"id": "uuid", "recommended_books": "jsonb"}
+  values = ",\n  ".join(
+    render_values(("id", "recommended_books"), (rid, json.dumps(rb, ensure_ascii=False)), casts)
+    for rid, rb in batch
+  )
+  return (
+    f"UPDATE {TABLE} AS c\n"
+    f"SET recommended_books = v.recommended_books\n"
+    f"FROM (VALUES\n  {values}\n) AS v(id, recommended_books)\n"
+    f"WHERE c.id = v.id;"
+  )
+
+
+def fetch_api(client, page_size: int) -> Iterator[dict]:
+  """Full rows in id order (keyset pages, so PostgREST's max-rows never truncates)."""
+  last = None
+  while True:
+    query = client.table(TABLE).select("*").order("id").limit(page_size)
+    if last is not None:
+      query = query.gt("id", last)
+    page = query.execute().data or []
+    yield from page
+    if len(page) < page_size:
+      return
+    last = page[-1]["id"]
+
+
+def apply_api(client, updates: list[tuple[dict, list[str]]], batch_size: int, concurrency: int) -> None:
+  # Upserts carry the full row: a partial row would fail NOT NULL checks before ON CONFLICT applies
+  def upsert(batch):
+    rows = [{**row, "recommended_books": new_rb} for row, new_rb in batch]
+    client.table(TABLE).upsert(rows, on_conflict="id").execute()
+
+  with ThreadPoolExecutor(max_workers=concurrency) as pool:
+    # list() re-raises the first failed batch
+    list(pool.map(upsert, batches(updates, batch_size)))
+
+
+def fetch_db(conn, page_size: int) -> Iterator[dict]:
+  last = None
+  while True:
+    if last is None:
+      cur = conn.execute(f"SELECT id::text, recommended_books FROM {TABLE} ORDER BY id LIMIT %s", [page_size])
+    else:
+      cur = conn.execute(
+        f"SELECT id::text, recommended_books FROM {TABLE} WHERE id > %s ORDER BY id LIMIT %s", [last, page_size]
+      )
+    page = [{"id": rid, "recommended_books": rb} for rid, rb in cur.fetchall()]
+    yield from page
+    if len(page) < page_size:
+      return
+    last = page[-1]["id"]
+
+
+def apply_db(conn, updates: list[tuple[dict, list[str]]], batch_size: int) -> None:
+  sql = (
+    f"UPDATE {TABLE} AS c SET recommended_books = v.recommended_books::jsonb "
+    f"FROM unnest(%s::uuid[], %s::text[]) AS v(id, recommended_books) WHERE c.id = v.id"
+  )
+  with conn.transaction():
+    for batch in batches(updates, batch_size):
+      ids = [row["id"] for row, _ in batch]
+      books = [json.dumps(new_rb, ensure_ascii=False) for _, new_rb in batch]
+      conn.execute(sql, [ids, books])
+
+
+def print_diff(updates: list[tuple[dict, list[str]]]) -> None:
+  for row, new_rb in updates:
+    print(f"~ {row['id']}")
+    print(f"  - {json.dumps(row.get('recommended_books'), ensure_ascii=False)}")
+    print(f"  + {json.dumps(new_rb, ensure_ascii=False)}")
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Rewrite recommended_books as arrays of strings.")
+  mode = parser.add_mutually_exclusive_group()
+  mode.add_argument("--dry-run", action="store_true", help="print the changes without writing")
+  mode.add_argument("--sql", action="store_true", help="print batched UPDATE statements instead of applying")
+  parser.add_argument("--batch-size", type=int, default=500, help="rows per upsert / UPDATE")
+  parser.add_argument("--concurrency", type=int, default=4, help="API upserts in flight at once")
+  parser.add_argument("--page-size", type=int, default=1000, help="rows per read (keep <= PostgREST max-rows)")
+  source = parser.add_mutually_exclusive_group()
+  source.add_argument("--database-url", help="read and write Postgres directly instead of the API")
+  source.add_argument("--from-json", type=Path, help="read rows from a JSON export (with --dry-run or --sql)")
+  args = parser.parse_args()
+  batch_size = max(1, args.batch_size)
+
+  conn = client = None
+  if args.from_json:
+    if not (args.dry_run or args.sql):
+      parser.error("--from-json needs --dry-run or --sql (there is nothing to write to)")
+    rows = json.loads(args.from_json.read_text(encoding="utf-8"))
+  elif args.database_url:
+    try:
+      import psycopg
+    except ImportError:
+      print("Install psycopg: pip install psycopg")
+      return 1
+    conn = psycopg.connect(args.database_url)
+    rows = fetch_db(conn, args.page_size)
+  else:
+    url = os.environ.get("SUPABASE_URL")
+    key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY") or os.environ.get("SUPABASE_ANON_KEY")
+    if not url or not key:
+      print("Set SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY (or SUPABASE_ANON_KEY) to run against the API.")
+      print("Alternatively, apply the migration: supabase/migrations/20260204170000_transform_recommended_books_to_strings.sql")
+      return 1
+    # Imported here so usage/--help and transform_value() do not load the client
+    try:
+      from supabase import create_client
+    except ImportError:
+      print("Install supabase: pip install supabase")
+      return 1
+    client = create_client(url, key)
+    rows = fetch_api(client, args.page_size)
+
+  try:
+    total = 0
+
+    def counted(rows):
+      nonlocal total
+      for row in rows:
+        total += 1
+        yield row
+
+    updates = list(changes(counted(rows)))
+    if args.dry_run:
+      print_diff(updates)
+      print(f"Would update {len(updates)} of {total} rows.")
+    elif args.sql:
+      for batch in batches(updates, batch_size):
+        print(render_update_sql([(row["id"], new_rb) for row, new_rb in batch]) + "\n")
+      print(f"-- {len(updates)} of {total} rows change")
+    elif conn is not None:
+      apply_db(conn, updates, batch_size)
+      print(f"Updated {len(updates)} of {total} rows.")
+    else:
+      apply_api(client, updates, batch_size, max(1, args.concurrency))
+      print(f"Updated {len(updates)} of {total} rows.")
+  finally:
+    if conn is not None:
+      conn.close()
   return 0
 
 
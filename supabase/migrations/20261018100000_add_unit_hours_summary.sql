@@ -0,0 +1,187 @@
+-- One pre-joined row per (curriculum_id, unit) so the planner loads curriculum
+-- in a single query instead of four tables:
+--   base_rows        unit_subcategory_hours minus subcategories covered by option groups
+--   option_groups    groups with their choices and the default (max-hours) choice
+--   optional_items   optional items for the unit
+--   default_hours    base rows + default choice per group (no optional items)
+-- Mirrors scripts/curriculum_pipeline/summary.py.
+create materialized view if not exists public.unit_hours_summary as
+with units as (
+  select curriculum_id, unit from public.unit_subcategory_hours
+  union
+  select curriculum_id, unit from public.unit_option_groups
+  union
+  select curriculum_id, unit from public.unit_optional_items
+),
+groups as (
+  select
+    g.curriculum_id,
+    g.unit,
+    g.id,
+    g.category,
+    g.label,
+    g.note,
+    coalesce(
+      (
+        select jsonb_agg(
+          jsonb_build_object(
+            'id', c.id,
+            'subcategory', c.subcategory,
+            'hours', c.hours,
+            'recommended_books', c.recommended_books
+          )
+          order by c.subcategory, c.id
+        )
+        from public.unit_option_choices c
+        where c.option_group_id = g.id
+      ),
+      '[]'::jsonb
+    ) as choices,
+    (
+      select c.subcategory
+      from public.unit_option_choices c
+      where c.option_group_id = g.id
+      order by coalesce(c.hours, 0) desc, c.subcategory, c.id
+      limit 1
+    ) as default_subcategory,
+    (
+      select max(coalesce(c.hours, 0))
+      from public.unit_option_choices c
+      where c.option_group_id = g.id
+    ) as default_hours
+  from public.unit_option_groups g
+),
+base as (
+  select
+    h.curriculum_id,
+    h.unit,
+    jsonb_agg(
+      jsonb_build_object('category', h.category, 'subcategory', h.subcategory, 'hours', h.hours)
+      order by h.category, h.subcategory
+    ) as rows,
+    sum(h.hours) as hours
+  from public.unit_subcategory_hours h
+  where not exists (
+    select 1
+    from public.unit_option_groups g
+    join public.unit_option_choices c on c.option_group_id = g.id
+    where g.curriculum_id = h.curriculum_id
+      and g.unit = h.unit
+      and g.category = h.category
+      and c.subcategory = h.subcategory
+  )
+  group by h.curriculum_id, h.unit
+),
+group_summary as (
+  select
+    curriculum_id,
+    unit,
+    jsonb_agg(
+      jsonb_build_object(
+        'id', id,
+        'category', category,
+        'label', label,
+        'note', note,
+        'default_subcategory', default_subcategory,
+        'choices', choices
+      )
+      order by label, id
+    ) as groups,
+    sum(coalesce(default_hours, 0)) as hours
+  from groups
+  group by curriculum_id, unit
+),
+items as (
+  select
+    curriculum_id,
+    unit,
+    jsonb_agg(
+      jsonb_build_object(
+        'id', id,
+        'category', category,
+        'subcategory', subcategory,
+        'hours', hours,
+        'description', description,
+        'type', type
+      )
+      order by category, subcategory, id
+    ) as items
+  from public.unit_optional_items
+  group by curriculum_id, unit
+)
+select
+  u.curriculum_id,
+  u.unit,
+  coalesce(b.rows, '[]'::jsonb) as base_rows,
+  coalesce(gs.groups, '[]'::jsonb) as option_groups,
+  coalesce(i.items, '[]'::jsonb) as optional_items,
+  coalesce(b.hours, 0) + coalesce(gs.hours, 0) as default_hours
+from units u
+left join base b on b.curriculum_id = u.curriculum_id and b.unit = u.unit
+left join group_summary gs on gs.curriculum_id = u.curriculum_id and gs.unit = u.unit
+left join items i on i.curriculum_id = u.curriculum_id and i.unit = u.unit;
+
+create unique index if not exists unit_hours_summary_pkey
+  on public.unit_hours_summary (curriculum_id, unit);
+
+grant select on public.unit_hours_summary to anon, authenticated;
+
+-- Keep the summary current when seeds or the admin page change curriculum rows.
+-- Row changes fire deferred constraint triggers, so the refresh runs once at
+-- commit however many statements the transaction ran (a seed is hundreds); the
+-- transaction-local flag skips every firing after the first. CONCURRENTLY
+-- (needs the unique index above) lets planners keep reading the old rows while
+-- it runs. Constraint triggers cannot fire on truncate, which refreshes at once.
+create or replace function public.refresh_unit_hours_summary()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  if tg_op <> 'TRUNCATE' then
+    if current_setting('curriculum.unit_hours_summary_refreshed', true) = txid_current()::text then
+      return null;
+    end if;
+    perform set_config('curriculum.unit_hours_summary_refreshed', txid_current()::text, true);
+  end if;
+  refresh materialized view concurrently public.unit_hours_summary;
+  return null;
+end;
+$$;
+
+create constraint trigger refresh_unit_hours_summary
+after insert or update or delete on public.unit_subcategory_hours
+deferrable initially deferred
+for each row execute function public.refresh_unit_hours_summary();
+
+create trigger refresh_unit_hours_summary_truncate
+after truncate on public.unit_subcategory_hours
+for each statement execute function public.refresh_unit_hours_summary();
+
+create constraint trigger refresh_unit_hours_summary
+after insert or update or delete on public.unit_option_groups
+deferrable initially deferred
+for each row execute function public.refresh_unit_hours_summary();
+
+create trigger refresh_unit_hours_summary_truncate
+after truncate on public.unit_option_groups
+for each statement execute function public.refresh_unit_hours_summary();
+
+create constraint trigger refresh_unit_hours_summary
+after insert or update or delete on public.unit_option_choices
+deferrable initially deferred
+for each row execute function public.refresh_unit_hours_summary();
+
+create trigger refresh_unit_hours_summary_truncate
+after truncate on public.unit_option_choices
+for each statement execute function public.refresh_unit_hours_summary();
+
+create constraint trigger refresh_unit_hours_summary
+after insert or update or delete on public.unit_optional_items
+deferrable initially deferred
+for each row execute function public.refresh_unit_hours_summary();
+
+create trigger refresh_unit_hours_summary_truncate
+after truncate on public.unit_optional_items
+for each statement execute function public.refresh_unit_hours_summary();
@@ -0,0 +1,91 @@
+-- Delta sync for planner_plans.
+--
+-- Every update bumps planner_plans.version. The app keeps the last version it
+-- synced for each plan and sends only what changed since then, as a JSON merge
+-- patch (RFC 7396), through apply_plan_patch. The patch is applied only if the
+-- row is still at that version; otherwise the caller gets the current version
+-- back and re-reads the plan. Pulls use updated_at as a cursor, so a client
+-- fetches only plans changed since its last pull. updated_at is the time of
+-- the write (clock_timestamp), not of the transaction start (now()), and
+-- clients re-read a short window before their cursor (usePlanSync.ts), since
+-- a write can still commit after a pull that saw later timestamps.
+alter table public.planner_plans
+  add column if not exists version bigint not null default 1;
+
+create index if not exists planner_plans_user_id_updated_at_idx
+  on public.planner_plans (user_id, updated_at);
+
+create or replace function public.set_planner_plans_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+  new.updated_at = clock_timestamp();
+  new.version = old.version + 1;
+  return new;
+end;
+$$;
+
+-- RFC 7396: objects merge key by key, null removes a key, anything else replaces
+create or replace function public.jsonb_merge_patch(target jsonb, patch jsonb)
+returns jsonb
+language plpgsql
+immutable
+as $$
+declare
+  result jsonb;
+  entry record;
+begin
+  if jsonb_typeof(patch) is distinct from 'object' then
+    return patch;
+  end if;
+  result := case when jsonb_typeof(target) = 'object' then target else '{}'::jsonb end;
+  for entry in select key, value from jsonb_each(patch) loop
+    if jsonb_typeof(entry.value) = 'null' then
+      result := result - entry.key;
+    else
+      result := jsonb_set(result, array[entry.key], public.jsonb_merge_patch(result -> entry.key, entry.value));
+    end if;
+  end loop;
+  return result;
+end;
+$$;
+
+-- Runs as the caller, so the planner_plans policies decide which rows it sees.
+-- No row: the plan is not on the server (the app upserts it instead).
+-- applied = false: the plan moved past base_version; nothing was written.
+create or replace function public.apply_plan_patch(
+  plan_id uuid,
+  base_version bigint,
+  patch jsonb,
+  plan_name text default null
+)
+returns table (applied boolean, plan_version bigint, plan_updated_at timestamptz)
+language plpgsql
+set search_path = public
+as $$
+begin
+  update public.planner_plans as p
+  set
+    data = public.jsonb_merge_patch(p.data, patch),
+    name = coalesce(plan_name, p.name)
+  where p.id = plan_id
+    and p.version = base_version
+  returning p.version, p.updated_at into plan_version, plan_updated_at;
+  if found then
+    applied := true;
+    return next;
+    return;
+  end if;
+
+  select p.version, p.updated_at into plan_version, plan_updated_at
+  from public.planner_plans as p
+  where p.id = plan_id;
+  if found then
+    applied := false;
+    return next;
+  end if;
+end;
+$$;
+
+grant execute on function public.apply_plan_patch(uuid, bigint, jsonb, text) to authenticated;
@@ -0,0 +1,19 @@
+-- Bulk plan normalization (curriculum_pipeline.migrate_plans) must not look
+-- like an edit. It still bumps version, so a client's next patch is based on
+-- the normalized copy, but it keeps updated_at: a client with unsynced edits
+-- gets a version conflict, re-reads the plan, and mergeRemotePlans keeps its
+-- local copy because that is newer; the edits are then patched onto the
+-- normalized version. The job sets planner_plans.keep_updated_at for its own
+-- transactions only.
+create or replace function public.set_planner_plans_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+  if current_setting('planner_plans.keep_updated_at', true) is distinct from 'on' then
+    new.updated_at = clock_timestamp();
+  end if;
+  new.version = old.version + 1;
+  return new;
+end;
+$$;
@@ -0,0 +1,37 @@
+-- Content version per curriculum set, so the planner can keep curriculum in
+-- IndexedDB and only refetch it when the version changes.
+--   catalog_version  'db-' || the id of the transaction that last refreshed
+--                    unit_hours_summary. Any curriculum write (seed, diff
+--                    migration, admin page) gives it a new value.
+--                    curriculum_pipeline.bundle --database-url copies it into
+--                    the static bundle it exports, so a bundle is only used
+--                    while no write has happened since its export.
+alter table public.curriculum_sets
+  add column if not exists catalog_version text;
+
+-- The summary refreshes once per transaction for whatever sets changed, so
+-- every set gets a new version; curriculum writes are rare.
+create or replace function public.refresh_unit_hours_summary()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  if tg_op <> 'TRUNCATE' then
+    if current_setting('curriculum.unit_hours_summary_refreshed', true) = txid_current()::text then
+      return null;
+    end if;
+    perform set_config('curriculum.unit_hours_summary_refreshed', txid_current()::text, true);
+  end if;
+  refresh materialized view concurrently public.unit_hours_summary;
+  update public.curriculum_sets
+    set catalog_version = 'db-' || txid_current()::text
+    where catalog_version is distinct from 'db-' || txid_current()::text;
+  return null;
+end;
+$$;
+
+update public.curriculum_sets
+  set catalog_version = 'db-' || txid_current()::text
+  where catalog_version is null;